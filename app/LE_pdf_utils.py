@@ -1,12 +1,15 @@
+import gc
 import io
 import os
 import base64
+import hashlib
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.graphics.barcode import qr, code128
+from reportlab.graphics.barcode import qr
+from reportlab.graphics.barcode.widgets import BarcodeCode128
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics import renderPDF
 from reportlab.pdfbase.pdfmetrics import stringWidth
@@ -18,6 +21,10 @@ from reportlab.platypus import Paragraph
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from app.models import LabelTemplate, LabelStock, LabelElement
+from app.services.pdf_stream import concat_pdf_stream
+
+# Sheets per shard for streamed and parallel jobs; bounds the pages ReportLab holds in memory at once.
+LABEL_SHARD_SHEETS = int(os.environ.get("LABEL_SHARD_SHEETS", 10))
 
 # Register Fonts
 def register_fonts():
@@ -122,180 +129,333 @@ def resolve_color(static_color: str, variable_field: str, row_data: Dict[str, An
             
     return colors.black
 
-def draw_element(c: canvas.Canvas, element: LabelElement, row_data: Dict[str, Any], stock: LabelStock):
-    x = element.x * inch
-    y = (stock.page_height - element.y - element.height) * inch 
-    width = element.width * inch
-    height = element.height * inch
+class JobImages:
+    """
+    Images for one print job, keyed like the row placeholders ('__SHOW_LOGO__', ...).
 
-    if element.type == 'text':
-        content = element.text_content or ""
-        
-        # Inline Substitution
-        if row_data:
-            placeholders = re.findall(r'\{([^}]+)\}', content)
-            for placeholder in placeholders:
-                val = str(row_data.get(placeholder, ""))
-                content = content.replace(f"{{{placeholder}}}", val)
-
-        # Handle Newlines for Paragraph
-        content = content.replace('\n', '<br/>')
-
-        font_name = get_reportlab_font_name(
-            element.font_family, 
-            element.font_weight, 
-            "italic" if element.font_style == 'italic' else "normal"
-        )
-        font_size = element.font_size or 10
-        
-        # Map Alignment
-        align_map = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT}
-        alignment = align_map.get(element.text_align, TA_LEFT)
-
-        # Resolve Text Color
-        text_color = resolve_color(element.text_color, element.text_color_variable, row_data)
-
-        # Define Style
-        style = ParagraphStyle(
-            name='LabelTextStyle',
-            fontName=font_name,
-            fontSize=font_size,
-            leading=font_size * 1.2, # Line spacing
-            textColor=text_color,
-            alignment=alignment,
-            wordWrap='CJK' # Allow splitting long words if necessary
-        )
-
-        # Create Paragraph
-        p = Paragraph(content, style)
-        
-        # Wrap to calculate actual dimensions
-        # We pass 'width' as the constraint. 'height' argument is soft constraint.
-        actual_w, actual_h = p.wrap(width, height)  
-
-        # Vertical Alignment Calculation
-        if element.vertical_align == 'middle':
-            text_y = y + (height - actual_h) / 2
-        elif element.vertical_align == 'bottom':
-            text_y = y # Draw at bottom of box
-        else:
-            # Top (Default)
-            text_y = y + height - actual_h
+    Each distinct image is decoded once and embedded once as a form XObject;
+    every label then only references that form. Per-job images win over
+    base64 strings carried in individual rows, which are still honoured.
+    """
 
-        # Draw
-        p.drawOn(c, x, text_y)
+    def __init__(self, c: canvas.Canvas, images: Optional[Dict[str, bytes]] = None):
+        self.c = c
+        self.images = {k: v for k, v in (images or {}).items() if v}
+        self._forms: Dict[Any, Optional[tuple]] = {}
 
-    elif element.type == 'line':
-        c.saveState()
-        stroke_c = resolve_color(element.stroke_color, element.stroke_color_variable, row_data)
-        c.setStrokeColor(stroke_c)
-        c.setLineWidth(element.stroke_width or 2.0)
-        
-        # Snap to center if dimension is small
-        is_horizontal = element.height < 0.1
-        is_vertical = element.width < 0.1
-
-        if is_horizontal:
-             mid_y = y + height / 2
-             c.line(x, mid_y, x + width, mid_y)
-        elif is_vertical:
-             mid_x = x + width / 2
-             c.line(mid_x, y, mid_x, y + height)
-        elif element.lineDirection == 'up':
-            c.line(x, y, x + width, y + height)
-        else: 
-            c.line(x, y + height, x + width, y)
-        c.restoreState()
-
-    elif element.type == 'shape':
-        c.saveState()
-        
-        fill_c = None
-        if element.fill_color and element.fill_color.lower() != 'transparent':
-             fill_c = resolve_color(element.fill_color, element.fill_color_variable, row_data)
-        
-        if fill_c: c.setFillColor(fill_c)
-        
-        stroke_c = resolve_color(element.stroke_color, element.stroke_color_variable, row_data)
-        c.setStrokeColor(stroke_c)
-        c.setLineWidth(element.stroke_width or 1.0)
-        
-        if element.shape == 'circle':
-            c.ellipse(x, y, x + width, y + height, fill=1 if fill_c else 0, stroke=1)
-        else:
-            c.rect(x, y, width, height, fill=1 if fill_c else 0, stroke=1)
-        c.restoreState()
-
-    elif element.type == 'barcode':
-        content = element.text_content or "123456"
-        if row_data:
-             placeholders = re.findall(r'\{([^}]+)\}', content)
-             for placeholder in placeholders:
-                val = str(row_data.get(placeholder, ""))
-                content = content.replace(f"{{{placeholder}}}", val)
-        if not content.strip(): content = "123456"
+    def has(self, key: str, row_data: Dict[str, Any]) -> bool:
+        return key in self.images or bool(row_data and row_data.get(key))
+
+    def _form_for(self, key: str, row_data: Dict[str, Any]) -> Optional[tuple]:
+        # Job images are cached by key, row images by their base64 string.
+        source = self.images.get(key)
+        cache_key = key if source is not None else ("row", row_data.get(key))
+        if cache_key in self._forms:
+            return self._forms[cache_key]
 
+        form = None
         try:
-            barcode = code128.Code128(content, barHeight=height, barWidth=1.5)
-            b_bounds = barcode.getBounds()
-            bc_w = b_bounds[2] - b_bounds[0]
-            scale_x = width / bc_w if bc_w > 0 else 1
-            d = Drawing(width, height, transform=[scale_x, 0, 0, 1, x, y])
-            d.add(barcode)
-            renderPDF.draw(d, c, 0, 0)
+            if source is None:
+                b64 = row_data[key]
+                if "," in b64: b64 = b64.split(",")[1]
+                source = base64.b64decode(b64)
+            img = ImageReader(io.BytesIO(source))
+            img_w, img_h = img.getSize()
+            form_name = f"LEImage{hashlib.md5(source).hexdigest()}"
+            if not self.c.hasForm(form_name):
+                self.c.beginForm(form_name, lowerx=0, lowery=0, upperx=img_w, uppery=img_h)
+                self.c.drawImage(img, 0, 0, img_w, img_h, mask='auto')
+                self.c.endForm()
+            form = (form_name, img_w, img_h)
         except Exception as e:
-            print(f"Barcode Error: {e}")
-
-    elif element.type == 'qrcode':
-        content_template = element.qr_content or ""
-        content_to_encode = content_template
-        if content_to_encode and row_data:
-             placeholders = re.findall(r'\{([^}]+)\}', content_to_encode)
-             for placeholder in placeholders:
-                val = str(row_data.get(placeholder, ""))
-                content_to_encode = content_to_encode.replace(f"{{{placeholder}}}", val)
-
-        if content_to_encode:
-            qr_code = qr.QrCodeWidget(content_to_encode)
-            b = qr_code.getBounds()
+            print(f"Image Error ({key}): {e}")
+        self._forms[cache_key] = form
+        return form
+
+    def draw(self, key: str, row_data: Dict[str, Any], x: float, y: float, width: float, height: float):
+        """Draws the image centred in the box with its aspect ratio preserved."""
+        form = self._form_for(key, row_data)
+        if not form:
+            return
+        form_name, img_w, img_h = form
+        scale = min(width / img_w, height / img_h)
+        self.c.saveState()
+        self.c.translate(x + (width - img_w * scale) / 2, y + (height - img_h * scale) / 2)
+        self.c.scale(scale, scale)
+        self.c.doForm(form_name)
+        self.c.restoreState()
+
+PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+TEXT_ALIGN_MAP = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT}
+
+class JobCodes:
+    """
+    Barcodes and QR codes for one print job, keyed by kind, content and size.
+
+    A code is drawn inline the first time it appears. When the same code comes
+    up again it is drawn once into a form XObject and every later label only
+    stamps that form, so show-wide QR codes cost one encode and one draw.
+    """
+
+    def __init__(self, c: canvas.Canvas):
+        self.c = c
+        self._seen: Dict[tuple, Optional[str]] = {}
+
+    @staticmethod
+    def _drawing(kind: str, content: str, width: float, height: float) -> Drawing:
+        if kind == 'barcode':
+            widget = BarcodeCode128(value=content, barHeight=height, barWidth=1.5)
+            b_bounds = widget.getBounds()
+            bc_w = b_bounds[2] - b_bounds[0]
+            transform = [width / bc_w if bc_w > 0 else 1, 0, 0, 1, 0, 0]
+        else:
+            widget = qr.QrCodeWidget(content)
+            b = widget.getBounds()
             qr_w, qr_h = b[2]-b[0], b[3]-b[1]
-            d = Drawing(width, height, transform=[width/qr_w, 0, 0, height/qr_h, x, y])
-            d.add(qr_code)
-            renderPDF.draw(d, c, 0, 0)
-            
-    elif element.type == 'image':
-        img_key = element.variable_field
-        if not img_key:
-            if element.text_content == 'Show Logo': img_key = '__SHOW_LOGO__'
-            elif element.text_content == 'Company Logo': img_key = '__COMPANY_LOGO__'
+            transform = [width/qr_w, 0, 0, height/qr_h, 0, 0]
+        d = Drawing(width, height, transform=transform)
+        d.add(widget)
+        return d
+
+    def draw(self, kind: str, content: str, x: float, y: float, width: float, height: float):
+        key = (kind, content, round(width, 3), round(height, 3))
+        if key not in self._seen:
+            self._seen[key] = None
+            renderPDF.draw(self._drawing(kind, content, width, height), self.c, x, y)
+            return
+
+        form_name = self._seen[key]
+        if form_name is None:
+            form_name = "LECode" + hashlib.md5(repr(key).encode("utf-8")).hexdigest()
+            if not self.c.hasForm(form_name):
+                self.c.beginForm(form_name, lowerx=0, lowery=0, upperx=width, uppery=height)
+                renderPDF.draw(self._drawing(kind, content, width, height), self.c, 0, 0)
+                self.c.endForm()
+            self._seen[key] = form_name
+
+        self.c.saveState()
+        self.c.translate(x, y)
+        self.c.doForm(form_name)
+        self.c.restoreState()
+
+
+def compile_placeholders(text: str) -> List[str]:
+    """
+    Splits ``text`` into a substitution plan: even indexes are literal text,
+    odd indexes are placeholder names, e.g. 'Case {num}' -> ['Case ', 'num', ''].
+    """
+    return PLACEHOLDER_RE.split(text)
+
+def substitute(plan: List[str], row_data: Dict[str, Any]) -> str:
+    if len(plan) == 1:
+        return plan[0]
+    return "".join(part if i % 2 == 0 else str(row_data.get(part, "")) for i, part in enumerate(plan))
+
+
+class CompiledElement:
+    """
+    A label element with everything that does not depend on the data row
+    worked out up front: placeholder plans, font name, alignment, static
+    colors and the paragraph style. ``draw`` only substitutes and draws.
+    """
+
+    def __init__(self, element: LabelElement, stock: LabelStock):
+        self.element = element
+        self.stock = stock
+        self.width = element.width * inch
+        self.height = element.height * inch
+
+        if element.type == 'text':
+            self.text = element.text_content or ""
+            self.text_plan = compile_placeholders(self.text)
+            self.font_name = get_reportlab_font_name(
+                element.font_family,
+                element.font_weight,
+                "italic" if element.font_style == 'italic' else "normal"
+            )
+            self.font_size = element.font_size or 10
+            self.alignment = TEXT_ALIGN_MAP.get(element.text_align, TA_LEFT)
+            self._styles: Dict[Any, ParagraphStyle] = {}
+            self.static_text_color = None if element.text_color_variable else resolve_color(element.text_color, None, {})
+            # Text without placeholders or color variables lays out the same on every label.
+            self.is_static = len(self.text_plan) == 1 and self.static_text_color is not None
+            self._static_para = None
+        elif element.type == 'barcode':
+            self.text = element.text_content or "123456"
+            self.text_plan = compile_placeholders(self.text)
+        elif element.type == 'qrcode':
+            self.text = element.qr_content or ""
+            self.text_plan = compile_placeholders(self.text)
+        elif element.type in ('line', 'shape'):
+            self.static_stroke_color = None if element.stroke_color_variable else resolve_color(element.stroke_color, None, {})
+            self.has_fill = bool(element.fill_color and element.fill_color.lower() != 'transparent')
+            self.static_fill_color = None
+            if self.has_fill and not element.fill_color_variable:
+                self.static_fill_color = resolve_color(element.fill_color, None, {})
+        elif element.type == 'image':
+            self.img_key = element.variable_field
+            if not self.img_key:
+                if element.text_content == 'Show Logo': self.img_key = '__SHOW_LOGO__'
+                elif element.text_content == 'Company Logo': self.img_key = '__COMPANY_LOGO__'
+
+    def _content(self, row_data: Dict[str, Any]) -> str:
+        # Rows without data keep their placeholders verbatim, as before.
+        return substitute(self.text_plan, row_data) if row_data else self.text
+
+    def _text_style(self, text_color) -> ParagraphStyle:
+        style = self._styles.get(text_color)
+        if style is None:
+            style = ParagraphStyle(
+                name='LabelTextStyle',
+                fontName=self.font_name,
+                fontSize=self.font_size,
+                leading=self.font_size * 1.2, # Line spacing
+                textColor=text_color,
+                alignment=self.alignment,
+                wordWrap='CJK' # Allow splitting long words if necessary
+            )
+            self._styles[text_color] = style
+        return style
+
+    def draw(self, c: canvas.Canvas, row_data: Dict[str, Any], x_off: float = 0, y_off: float = 0,
+             images: Optional["JobImages"] = None, codes: Optional[JobCodes] = None):
+        element = self.element
+        x = (element.x + x_off) * inch
+        y = (self.stock.page_height - (element.y + y_off) - element.height) * inch
+        width = self.width
+        height = self.height
+
+        if element.type == 'text':
+            if self._static_para:
+                p, actual_h = self._static_para
+            else:
+                # Handle Newlines for Paragraph
+                content = self._content(row_data).replace('\n', '<br/>')
+
+                text_color = self.static_text_color if self.static_text_color is not None else resolve_color(element.text_color, element.text_color_variable, row_data)
+                p = Paragraph(content, self._text_style(text_color))
+
+                # Wrap to calculate actual dimensions
+                # We pass 'width' as the constraint. 'height' argument is soft constraint.
+                actual_w, actual_h = p.wrap(width, height)
+                if self.is_static:
+                    self._static_para = (p, actual_h)
+
+            # Vertical Alignment Calculation
+            if element.vertical_align == 'middle':
+                text_y = y + (height - actual_h) / 2
+            elif element.vertical_align == 'bottom':
+                text_y = y # Draw at bottom of box
+            else:
+                # Top (Default)
+                text_y = y + height - actual_h
+
+            p.drawOn(c, x, text_y)
+
+        elif element.type == 'line':
+            c.saveState()
+            stroke_c = self.static_stroke_color if self.static_stroke_color is not None else resolve_color(element.stroke_color, element.stroke_color_variable, row_data)
+            c.setStrokeColor(stroke_c)
+            c.setLineWidth(element.stroke_width or 2.0)
+
+            # Snap to center if dimension is small
+            is_horizontal = element.height < 0.1
+            is_vertical = element.width < 0.1
+
+            if is_horizontal:
+                 mid_y = y + height / 2
+                 c.line(x, mid_y, x + width, mid_y)
+            elif is_vertical:
+                 mid_x = x + width / 2
+                 c.line(mid_x, y, mid_x, y + height)
+            elif element.lineDirection == 'up':
+                c.line(x, y, x + width, y + height)
+            else:
+                c.line(x, y + height, x + width, y)
+            c.restoreState()
+
+        elif element.type == 'shape':
+            c.saveState()
+
+            fill_c = None
+            if self.has_fill:
+                 fill_c = self.static_fill_color if self.static_fill_color is not None else resolve_color(element.fill_color, element.fill_color_variable, row_data)
+
+            if fill_c: c.setFillColor(fill_c)
+
+            stroke_c = self.static_stroke_color if self.static_stroke_color is not None else resolve_color(element.stroke_color, element.stroke_color_variable, row_data)
+            c.setStrokeColor(stroke_c)
+            c.setLineWidth(element.stroke_width or 1.0)
+
+            if element.shape == 'circle':
+                c.ellipse(x, y, x + width, y + height, fill=1 if fill_c else 0, stroke=1)
+            else:
+                c.rect(x, y, width, height, fill=1 if fill_c else 0, stroke=1)
+            c.restoreState()
+
+        elif element.type == 'barcode':
+            content = self._content(row_data)
+            if not content.strip(): content = "123456"
 
-        if img_key in ['__SHOW_LOGO__', '__COMPANY_LOGO__'] and row_data.get(img_key):
             try:
-                b64 = row_data[img_key]
-                if "," in b64: b64 = b64.split(",")[1]
-                
-                img_bytes = base64.b64decode(b64)
-                img = ImageReader(io.BytesIO(img_bytes))
-                
-                c.drawImage(img, x, y, width, height, mask='auto', preserveAspectRatio=True, anchor='c')
+                (codes or JobCodes(c)).draw('barcode', content, x, y, width, height)
             except Exception as e:
-                print(f"Image Error ({img_key}): {e}")
+                print(f"Barcode Error: {e}")
+
+        elif element.type == 'qrcode':
+            content_to_encode = self._content(row_data) if self.text else ""
+
+            if content_to_encode:
+                (codes or JobCodes(c)).draw('qrcode', content_to_encode, x, y, width, height)
+
+        elif element.type == 'image':
+            if images is None:
+                images = JobImages(c)
+            if self.img_key in ['__SHOW_LOGO__', '__COMPANY_LOGO__'] and images.has(self.img_key, row_data):
+                images.draw(self.img_key, row_data, x, y, width, height)
+
+
+class CompiledTemplate:
+    """A label template compiled once per job: elements pre-sorted by z_index and pre-compiled."""
+
+    def __init__(self, template: LabelTemplate, stock: LabelStock):
+        self.elements = [CompiledElement(e, stock) for e in sorted(template.elements, key=lambda e: e.z_index)]
+
+    def draw_label(self, c: canvas.Canvas, row_data: Dict[str, Any], x_off: float, y_off: float,
+                   images: Optional["JobImages"] = None, codes: Optional[JobCodes] = None):
+        for element in self.elements:
+            element.draw(c, row_data, x_off, y_off, images, codes)
 
-def render_template_to_buffer(template: LabelTemplate, stock: LabelStock, data_rows: List[Dict]) -> io.BytesIO:
+
+def draw_element(c: canvas.Canvas, element: LabelElement, row_data: Dict[str, Any], stock: LabelStock, images: Optional[JobImages] = None):
+    """Draws a single element. Render loops should compile the template once instead."""
+    CompiledElement(element, stock).draw(c, row_data, images=images)
+
+def render_template_to_buffer(template: LabelTemplate, stock: LabelStock, data_rows: List[Dict], progress: Optional[Callable[[int, int], None]] = None,
+                              images: Optional[Dict[str, bytes]] = None) -> io.BytesIO:
+    """
+    Renders one label per data row. ``images`` maps image placeholders such as
+    '__SHOW_LOGO__' to raw bytes shared by every label in the job.
+    """
     buf = io.BytesIO()
     p = canvas.Canvas(buf, pagesize=(stock.page_width * inch, stock.page_height * inch))
+    job_images = JobImages(p, images)
+    job_codes = JobCodes(p)
+    compiled = CompiledTemplate(template, stock)
     
     l_w = (stock.page_width - stock.left_margin * 2 - stock.col_spacing * (stock.cols_per_page - 1)) / stock.cols_per_page
     l_h = (stock.page_height - stock.top_margin * 2 - stock.row_spacing * (stock.rows_per_page - 1)) / stock.rows_per_page
 
+    labels_per_page = stock.rows_per_page * stock.cols_per_page
+    total_pages = max(1, -(-len(data_rows) // labels_per_page))
+    pages_done = 0
+
     row_idx, col_idx = 0, 0
     for data_row in data_rows:
         x_off = stock.left_margin + col_idx * (l_w + stock.col_spacing)
         y_off = stock.top_margin + row_idx * (l_h + stock.row_spacing)
         
-        for element in sorted(template.elements, key=lambda e: e.z_index):
-            el_copy = element.model_copy(update={'x': element.x + x_off, 'y': element.y + y_off})
-            draw_element(p, el_copy, data_row, stock)
+        compiled.draw_label(p, data_row, x_off, y_off, job_images, job_codes)
 
         col_idx += 1
         if col_idx >= stock.cols_per_page:
@@ -303,7 +463,66 @@ def render_template_to_buffer(template: LabelTemplate, stock: LabelStock, data_r
         if row_idx >= stock.rows_per_page:
             row_idx = 0
             p.showPage()
+            pages_done += 1
+            if progress:
+                progress(pages_done, total_pages)
 
     p.save()
+    if progress:
+        progress(total_pages, total_pages)
     buf.seek(0)
-    return buf
\ No newline at end of file
+    return buf
+
+
+def label_shards(stock: LabelStock, data_rows: List[Dict], sheets_per_shard: int = LABEL_SHARD_SHEETS) -> List[List[Dict]]:
+    """
+    Splits rows into page-aligned slices. Every shard but the last fills whole sheets,
+    so rendering shards separately places each row in the same cell as one render would.
+    """
+    rows_per_shard = max(1, sheets_per_shard) * stock.rows_per_page * stock.cols_per_page
+    return [data_rows[start:start + rows_per_shard] for start in range(0, max(1, len(data_rows)), rows_per_shard)]
+
+
+def iter_label_pdf(template: LabelTemplate, stock: LabelStock, data_rows: List[Dict], images: Optional[Dict[str, bytes]] = None,
+                   sheets_per_shard: int = LABEL_SHARD_SHEETS, executor=None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Iterator[bytes]:
+    """
+    Streams the same labels as ``render_template_to_buffer`` as PDF bytes.
+
+    ReportLab keeps every page of a canvas in memory until ``save``, so rows are
+    rendered in page-aligned shards and stitched into one document in order as they
+    finish; memory is bounded by the shard, not the job. With ``executor`` (a
+    ``RenderExecutor``) shards render in parallel on its worker processes.
+    """
+    shards = label_shards(stock, data_rows, sheets_per_shard)
+    labels_per_page = stock.rows_per_page * stock.cols_per_page
+    total_pages = max(1, -(-len(data_rows) // labels_per_page))
+
+    def render_in_process() -> Iterator[bytes]:
+        for i, shard in enumerate(shards):
+            if i:
+                # Canvases and parsed shards are reference cycles; collect them so memory stays flat.
+                gc.collect()
+            yield render_template_to_buffer(template, stock, shard, images=images).getvalue()
+
+    if executor is not None:
+        documents = executor.map_ordered(render_template_to_buffer, (((template, stock, shard), {"images": images}) for shard in shards))
+    else:
+        documents = render_in_process()
+
+    def reported(documents: Iterator[bytes]) -> Iterator[bytes]:
+        pages_done = 0
+        for shard, document in zip(shards, documents):
+            yield document
+            pages_done = min(total_pages, pages_done + max(1, -(-len(shard) // labels_per_page)))
+            progress(pages_done, total_pages)
+
+    return concat_pdf_stream(reported(documents) if progress else documents)
+
+
+def render_labels_sharded(template: LabelTemplate, stock: LabelStock, data_rows: List[Dict], images: Optional[Dict[str, bytes]] = None,
+                          sheets_per_shard: int = LABEL_SHARD_SHEETS, executor=None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> bytes:
+    """Renders a whole job as one PDF from page-aligned shards, in parallel when given an executor."""
+    return b"".join(iter_label_pdf(template, stock, data_rows, images=images, sheets_per_shard=sheets_per_shard,
+                                   executor=executor, progress=progress))
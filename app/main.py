@@ -39,7 +39,9 @@ from app.routers.collaboration import router as collaboration_router
 from app.routers.label_engine import router as label_engine_router
 from app.routers.panels import router as panels_router
 from app.routers.network_ips import router as network_ips_router
+from app.routers.export_jobs import router as export_jobs_router
 from .scheduler import scheduler
+from .services.render_executor import render_executor
 
 
 @asynccontextmanager
@@ -49,6 +51,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown the scheduler on application shutdown
     scheduler.shutdown()
+    render_executor.shutdown()
 
 app = FastAPI(
     title="ShowReady API",
@@ -71,6 +74,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-PDF-Original-Bytes", "X-PDF-Bytes-Saved"],
 )
 
 @app.middleware("http")
@@ -132,6 +136,7 @@ app.include_router(hours_router, prefix="/api")
 app.include_router(pdf_router, prefix="/api")
 app.include_router(user_settings_router, prefix="/api")
 app.include_router(show_settings_router, prefix="/api")
+app.include_router(export_jobs_router, prefix="/api")
 
 # Version 1 API for new features
 app.include_router(switch_admin_router, prefix="/api/v1")
@@ -276,12 +276,15 @@ class WeeklyTimesheet(BaseModel):
     ot_weekly_threshold: float
     pay_period_start_day: Optional[int] = 0
     crew_hours: List[CrewMemberHours]
+    # Fingerprint of the week's saved hours when it was loaded; a save carrying a stale one is rejected
+    version: Optional[str] = None
 
 class TimesheetEmailPayload(BaseModel):
     recipient_emails: List[str]
     subject: str
     body: str
     show_branding: bool = True
+    optimize: bool = False
 
 # --- VLAN Models ---
 class VLANBase(BaseModel):
@@ -633,6 +636,17 @@ class HoursPDFPayload(BaseModel):
     crew: List[ShowCrewMember]
     hoursByDate: Dict[str, Dict[str, Dict[str, float]]]
 
+# --- Background Export Jobs ---
+class ExportJobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # 'queued', 'running', 'done' or 'failed'
+    pages_done: int = 0
+    pages_total: int = 0
+    filename: str
+    error: Optional[str] = None
+    bytes_saved: Optional[int] = None
+
 # --- Impersonation Models ---
 class ImpersonateRequest(BaseModel):
     user_id: uuid.UUID
@@ -790,6 +804,22 @@ class BulkEmailRequest(BaseModel):
     subject: str
     body: str
 
+class BulkEmailRecipientResult(BaseModel):
+    recipient_id: Optional[str] = None
+    email: Optional[str] = None
+    status: str  # 'pending', 'sent', 'failed' or 'skipped'
+    error: Optional[str] = None
+
+class BulkEmailJobStatus(BaseModel):
+    job_id: str
+    status: str  # 'queued', 'running', 'done' or 'failed'
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    error: Optional[str] = None
+    results: List[BulkEmailRecipientResult] = []
+
 class EmailTemplateCreate(BaseModel):
     category: str
     name: str
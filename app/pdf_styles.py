@@ -0,0 +1,243 @@
+"""
+Style registry for the ReportLab generators in pdf_utils.
+
+Fonts, paragraph styles, table styles and parsed colors are built once per
+process (per render worker) and shared by every generator call. Nothing in
+here may be mutated after it is built; generators that need a variation
+should add a new cached builder instead.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+# Register Space Mono font
+try:
+    pdfmetrics.registerFont(TTFont('SpaceMono', 'fonts/SpaceMono-Regular.ttf'))
+    pdfmetrics.registerFont(TTFont('SpaceMono-Bold', 'fonts/SpaceMono-Bold.ttf'))
+    pdfmetrics.registerFont(TTFont('SpaceMono-Italic', 'fonts/SpaceMono-Italic.ttf'))
+except Exception as e:
+    print(f"Could not register Space Mono font: {e}")
+
+COLOR_GRAY_BG = colors.Color(0.29, 0.334, 0.408)        # #4A5568 (Standard)
+
+NAMED_COLORS = {
+    'red': '#FF0000', 'orange': '#FFA500', 'yellow': '#FFFF00', 'green': '#008000',
+    'blue': '#0000FF', 'indigo': '#4B0082', 'violet': '#EE82EE', 'black': '#000000',
+    'white': '#FFFFFF', 'gray': '#808000', 'silver': '#C0C0C0', 'maroon': '#800000',
+    'olive': '#808000', 'lime': '#00FF00', 'aqua': '#00FFFF', 'teal': '#008080',
+    'navy': '#000080', 'fuchsia': '#FF00FF', 'purple': '#800080'
+}
+
+
+@lru_cache(maxsize=512)
+def parse_color(color_string: Optional[str]) -> colors.Color:
+    if not color_string:
+        return colors.black
+    color_string = color_string.lower().strip()
+    hex_val = NAMED_COLORS.get(color_string)
+
+    if not hex_val and color_string.startswith('#') and len(color_string) in [4, 7]:
+        hex_val = color_string
+
+    if not hex_val:
+        return colors.black
+
+    hex_val = hex_val.lstrip('#')
+    if len(hex_val) == 3:
+        hex_val = "".join([c*2 for c in hex_val])
+
+    try:
+        r, g, b = (int(hex_val[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+        return colors.Color(r, g, b)
+    except (ValueError, IndexError):
+        return colors.black
+
+
+# ==========================================
+# PARAGRAPH STYLE SHEETS
+# ==========================================
+
+@lru_cache(maxsize=None)
+def timesheet_styles() -> StyleSheet1:
+    """Weekly timesheet (generate_hours_pdf) and its header table."""
+    styles = getSampleStyleSheet()
+    styles['Normal'].fontName = "SpaceMono"
+    styles['Normal'].fontSize = 8
+
+    styles['Title'].fontName = "SpaceMono-Bold"
+    styles['Title'].fontSize = 16
+    styles['Title'].alignment = TA_CENTER
+
+    styles.add(ParagraphStyle(name="HeaderShowName", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name="HeaderUserName", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, alignment=TA_RIGHT))
+    styles.add(ParagraphStyle(name="HeaderCompanyName", parent=styles["Normal"], fontSize=10, alignment=TA_RIGHT, spaceBefore=4))
+    styles.add(ParagraphStyle(name="HeaderDate", parent=styles["Normal"], fontSize=8, alignment=TA_RIGHT, textColor=colors.grey, spaceBefore=4))
+    styles.add(ParagraphStyle(name="DateRange", parent=styles["Normal"], fontSize=12, spaceAfter=12, alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name="CrewName", parent=styles["Normal"], alignment=TA_LEFT, leading=10))
+    styles.add(ParagraphStyle(name="CellCenter", parent=styles["Normal"], alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name="TotalsLabel", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name="TotalsValue", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name="HeaderCenter", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_CENTER, textColor=colors.whitesmoke))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def audit_styles() -> StyleSheet1:
+    """Crew hours audit report."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name="AuditTitle", parent=styles["Title"], fontName="SpaceMono-Bold", fontSize=18))
+    styles.add(ParagraphStyle(name="MemberHeader", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, spaceBefore=12))
+    styles.add(ParagraphStyle(name="TblHeader", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=9, textColor=colors.whitesmoke, alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name="TblCell", parent=styles["Normal"], fontName="SpaceMono", fontSize=8, alignment=TA_CENTER))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def report_styles() -> StyleSheet1:
+    """Equipment list and power report."""
+    styles = getSampleStyleSheet()
+    styles['Normal'].fontName = "SpaceMono"
+    styles['Title'].fontName = "SpaceMono-Bold"
+    styles['Title'].fontSize = 18
+    styles['Title'].spaceAfter = 16
+
+    styles.add(ParagraphStyle(name='ListHeader', parent=styles['Normal'], fontName='SpaceMono-Bold', alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name='ListBody', parent=styles['Normal'], alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name='SectionHeading', parent=styles['Normal'], fontName='SpaceMono-Bold', fontSize=12, spaceAfter=6))
+    return styles
+
+
+@lru_cache(maxsize=None)
+def loom_styles() -> StyleSheet1:
+    """Loom build sheet table cells."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='LoomHeader',
+        parent=styles['Normal'],
+        alignment=TA_CENTER,
+        fontName='SpaceMono-Bold',
+        fontSize=9,
+        textColor=colors.whitesmoke,
+        leading=11
+    ))
+    styles.add(ParagraphStyle(
+        name='LoomCell',
+        parent=styles['Normal'],
+        fontName='SpaceMono',
+        fontSize=8,
+        alignment=TA_CENTER
+    ))
+    # Long cable labels drop a point so they stay on one line.
+    styles.add(ParagraphStyle(name='LoomLabelSmall', parent=styles['LoomCell'], fontSize=7))
+    return styles
+
+
+@lru_cache(maxsize=512)
+def cable_end_style(color_string: Optional[str]) -> ParagraphStyle:
+    """Origin/destination cell filled with the cable end's color and a readable text color."""
+    back_color = parse_color(color_string)
+    return ParagraphStyle(
+        name='CableEndStyle',
+        backColor=back_color,
+        textColor=colors.white if (back_color.red + back_color.green + back_color.blue) < 1.5 else colors.black,
+        alignment=TA_CENTER,
+        fontName='SpaceMono',
+        fontSize=8,
+        borderPadding=(2, 4)
+    )
+
+
+CASE_LABEL_BODY_STYLE = ParagraphStyle(
+    name='BodyText', fontName='SpaceMono-Bold', fontSize=28, leading=34, alignment=TA_CENTER)
+
+
+# ==========================================
+# TABLE STYLES
+# ==========================================
+
+HEADER_TABLE_STYLE = TableStyle([
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+])
+
+TIMESHEET_TABLE_STYLE = TableStyle([
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("BACKGROUND", (0, 0), (-1, 0), COLOR_GRAY_BG),
+    ("LINEBELOW", (0, 0), (-1, -2), 0.5, colors.lightgrey),
+    ("LINEABOVE", (0, -1), (-1, -1), 1.5, colors.black),
+    ('SPAN', (0, -1), (1, -1)),
+])
+
+AUDIT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), COLOR_GRAY_BG),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.darkgrey),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+EQUIPMENT_LIST_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
+    ('LINEBELOW', (0, 1), (-1, -1), 1, colors.lightgrey),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+])
+
+LOOM_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (2, 0), 'SpaceMono-Bold'),
+    ('FONTNAME', (5, 0), (6, 0), 'SpaceMono-Bold'),
+    ('TEXTCOLOR', (0, 0), (2, 0), colors.whitesmoke),
+    ('TEXTCOLOR', (5, 0), (6, 0), colors.whitesmoke),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 0),
+    ('TOPPADDING', (0, 0), (-1, 0), 0),
+    ('FONTNAME', (0, 1), (-1, -1), 'SpaceMono'),
+    ('LINEBELOW', (0, 0), (-1, 0), 1.5, colors.black),
+    ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.lightgrey),
+])
+
+POWER_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, -1), 'SpaceMono-Bold'),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+POWER_BREAKDOWN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.gray),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'SpaceMono-Bold'),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),   # Names Left
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'), # Numbers Right
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LINEBELOW', (0, 0), (-1, 0), 1.5, colors.black),
+    ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.lightgrey),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+PANEL_COMPONENTS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
+    ('FONTNAME', (0,0), (-1,0), 'SpaceMono-Bold'),
+    ('FONTNAME', (0,1), (-1,-1), 'SpaceMono'),
+    ('FONTSIZE', (0,0), (-1,-1), 10)
+])
@@ -1,7 +1,8 @@
 import io
 import os
+import hashlib
 import pprint
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, Callable, Iterator, Tuple
 from datetime import datetime, timedelta, date
 import uuid
 from collections import defaultdict
@@ -11,25 +12,23 @@ from reportlab.lib.units import inch
 from reportlab.lib.pagesizes import letter, landscape, portrait
 from reportlab.lib import colors
 from reportlab.platypus import Paragraph, Table, TableStyle, Image, Spacer, SimpleDocTemplate, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.utils import ImageReader
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from pypdf import PdfWriter, PdfReader
 
 from .models import LoomLabel, CaseLabel, Rack, RackPDFPayload, Loom, LoomBuilderPDFPayload, Cable, LoomWithCables, WeeklyTimesheet
 
+from .services.logo_cache import decoded_image
+from .services.pdf_stream import concat_pdf_stream
+from .services.power_budget import power_summary
+
 # IMPORT OUR DRAWING LOGIC HERE
 from .utils.panel_pdf_draw import draw_panel_visual
 
-# Register Space Mono font
-try:
-    pdfmetrics.registerFont(TTFont('SpaceMono', 'fonts/SpaceMono-Regular.ttf'))
-    pdfmetrics.registerFont(TTFont('SpaceMono-Bold', 'fonts/SpaceMono-Bold.ttf'))
-    pdfmetrics.registerFont(TTFont('SpaceMono-Italic', 'fonts/SpaceMono-Italic.ttf'))
-except Exception as e:
-    print(f"Could not register Space Mono font: {e}")
+# Fonts, paragraph/table styles and parsed colors are built once per process
+from .pdf_styles import (
+    parse_color, timesheet_styles, audit_styles, report_styles, loom_styles, cable_end_style,
+    CASE_LABEL_BODY_STYLE, HEADER_TABLE_STYLE, TIMESHEET_TABLE_STYLE, AUDIT_TABLE_STYLE,
+    EQUIPMENT_LIST_TABLE_STYLE, LOOM_TABLE_STYLE, POWER_SUMMARY_TABLE_STYLE,
+    POWER_BREAKDOWN_TABLE_STYLE, PANEL_COMPONENTS_TABLE_STYLE, COLOR_GRAY_BG,
+)
 
 # --- Image Checkbox Setup ---
 try:
@@ -54,35 +53,6 @@ PAGE_SIZES = {
 COLOR_BLUE_ACCENT = colors.Color(0.388, 0.702, 0.929)  # #63b3ed (Front)
 COLOR_ORANGE_ACCENT = colors.Color(0.965, 0.678, 0.333) # #f6ad55 (Rear)
 COLOR_PURPLE_BG = colors.Color(0.502, 0.353, 0.835)     # #805AD5 (Shared)
-COLOR_GRAY_BG = colors.Color(0.29, 0.334, 0.408)        # #4A5568 (Standard)
-
-def parse_color(color_string: Optional[str]) -> colors.Color:
-    if not color_string:
-        return colors.black
-    color_string = color_string.lower().strip()
-    hex_val = {
-        'red': '#FF0000', 'orange': '#FFA500', 'yellow': '#FFFF00', 'green': '#008000', 
-        'blue': '#0000FF', 'indigo': '#4B0082', 'violet': '#EE82EE', 'black': '#000000', 
-        'white': '#FFFFFF', 'gray': '#808000', 'silver': '#C0C0C0', 'maroon': '#800000',
-        'olive': '#808000', 'lime': '#00FF00', 'aqua': '#00FFFF', 'teal': '#008080',
-        'navy': '#000080', 'fuchsia': '#FF00FF', 'purple': '#800080'
-    }.get(color_string)
-    
-    if not hex_val and color_string.startswith('#') and len(color_string) in [4, 7]:
-        hex_val = color_string
-    
-    if not hex_val:
-        return colors.black
-
-    hex_val = hex_val.lstrip('#')
-    if len(hex_val) == 3:
-        hex_val = "".join([c*2 for c in hex_val])
-    
-    try:
-        r, g, b = (int(hex_val[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-        return colors.Color(r, g, b)
-    except (ValueError, IndexError):
-        return colors.black
 
 # ==========================================
 # TIMESHEET & CREW AUDIT PDF LOGIC
@@ -165,10 +135,7 @@ def _build_header_table(show, user, generation_date, show_logo_bytes, company_lo
     header_right.append(Paragraph(f"Generated: {generation_date}", styles["HeaderDate"]))
 
     header_table = Table([[header_left, header_right]], colWidths=["60%", "40%"])
-    header_table.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("ALIGN", (1, 0), (1, 0), "RIGHT"),
-    ]))
+    header_table.setStyle(HEADER_TABLE_STYLE)
     return header_table
 
 def generate_hours_pdf(user: dict, show: dict, timesheet_data: dict, show_logo_bytes: Optional[bytes], company_logo_bytes: Optional[bytes], show_branding: bool = True):
@@ -179,24 +146,7 @@ def generate_hours_pdf(user: dict, show: dict, timesheet_data: dict, show_logo_b
         rightMargin=0.25*inch, leftMargin=0.25*inch,
         topMargin=0.5*inch, bottomMargin=0.5*inch,
     )
-    styles = getSampleStyleSheet()
-    styles['Normal'].fontName = "SpaceMono"
-    styles['Normal'].fontSize = 8
-
-    styles['Title'].fontName = "SpaceMono-Bold"
-    styles['Title'].fontSize = 16
-    styles['Title'].alignment = TA_CENTER
-
-    styles.add(ParagraphStyle(name="HeaderShowName", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, alignment=TA_LEFT))
-    styles.add(ParagraphStyle(name="HeaderUserName", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name="HeaderCompanyName", parent=styles["Normal"], fontSize=10, alignment=TA_RIGHT, spaceBefore=4))
-    styles.add(ParagraphStyle(name="HeaderDate", parent=styles["Normal"], fontSize=8, alignment=TA_RIGHT, textColor=colors.grey, spaceBefore=4))
-    styles.add(ParagraphStyle(name="DateRange", parent=styles["Normal"], fontSize=12, spaceAfter=12, alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name="CrewName", parent=styles["Normal"], alignment=TA_LEFT, leading=10))
-    styles.add(ParagraphStyle(name="CellCenter", parent=styles["Normal"], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name="TotalsLabel", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_LEFT))
-    styles.add(ParagraphStyle(name="TotalsValue", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name="HeaderCenter", parent=styles["Normal"], fontName="SpaceMono-Bold", alignment=TA_CENTER, textColor=colors.whitesmoke))
+    styles = timesheet_styles()
 
     story = []
 
@@ -366,13 +316,7 @@ def generate_hours_pdf(user: dict, show: dict, timesheet_data: dict, show_logo_b
 
     col_widths = ['16%', '10%'] + ['6%'] * len(dates) + ['8%', '8%', '10%']
     table = Table(table_data, colWidths=col_widths, hAlign='CENTER')
-    table.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("BACKGROUND", (0, 0), (-1, 0), COLOR_GRAY_BG),
-        ("LINEBELOW", (0, 0), (-1, -2), 0.5, colors.lightgrey),
-        ("LINEABOVE", (0, -1), (-1, -1), 1.5, colors.black),
-        ('SPAN', (0, -1), (1, -1)),
-    ]))
+    table.setStyle(TIMESHEET_TABLE_STYLE)
     
     for i, row_data in enumerate(table_data):
         if i > 0 and i < len(table_data) -1:
@@ -389,15 +333,54 @@ def generate_hours_pdf(user: dict, show: dict, timesheet_data: dict, show_logo_b
     buffer.seek(0)
     return buffer
 
-def generate_crew_audit_pdf(user: dict, show: dict, audit_data: dict, show_logo_bytes: Optional[bytes], show_branding: bool = True):
+def crew_audit_weeks(entries: List[dict], rate_type: str, hourly_rate: float, daily_rate: float,
+                     daily_threshold: float, weekly_threshold: float, start_day: int) -> List[Tuple[date, float, float, float]]:
+    """
+    ``(week_start, regular, ot, cost)`` per pay week for one crew member's entries.
+
+    The entries are sorted once and turned into columns (hours, pay week); the daily
+    split and costs are computed a column at a time and summed over each run of days
+    in the same week, instead of re-walking every entry of the show per member.
+    """
+    if not entries:
+        return []
+    entries = sorted(entries, key=lambda e: e['date'])
+    ordinals = [date.fromisoformat(e['date']).toordinal() for e in entries]
+    # toordinal() is 1 for Monday 0001-01-01, so (ordinal + 6) % 7 is the weekday
+    week_ordinals = [o - (o + 6 - start_day) % 7 for o in ordinals]
+    hours = [float(e['hours']) for e in entries]
+    regular = [min(h, daily_threshold) for h in hours]
+    overtime = [max(0, h - daily_threshold) for h in hours]
+
+    if rate_type == 'daily':
+        implied_ot_rate = daily_rate / daily_threshold * 1.5 if daily_threshold else 0
+        # Each day costs the day rate, plus its OT hours at 1.5x the implied hourly rate
+        costs = [[daily_rate, ot * implied_ot_rate] if ot > 0 else [daily_rate] for ot in overtime]
+    else:
+        costs = [[(reg * hourly_rate) + (ot * hourly_rate * 1.5)] for reg, ot in zip(regular, overtime)]
+
+    weeks = []
+    start = 0
+    for end in range(1, len(entries) + 1):
+        if end < len(entries) and week_ordinals[end] == week_ordinals[start]:
+            continue
+        week_reg = sum(regular[start:end])
+        week_ot = sum(overtime[start:end])
+        week_cost = sum(term for day in costs[start:end] for term in day)
+        if week_reg > weekly_threshold:
+            excess = week_reg - weekly_threshold
+            week_reg -= excess
+            week_ot += excess
+            if rate_type == 'hourly':
+                week_cost += excess * (hourly_rate * 0.5)
+        weeks.append((date.fromordinal(week_ordinals[start]), week_reg, week_ot, week_cost))
+        start = end
+    return weeks
+
+def generate_crew_audit_pdf(user: dict, show: dict, audit_data: dict, show_logo_bytes: Optional[bytes], show_branding: bool = True, progress: Optional[Callable[[int, int], None]] = None):
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=portrait(letter), topMargin=0.5*inch, bottomMargin=0.5*inch)
-    styles = getSampleStyleSheet()
-    
-    styles.add(ParagraphStyle(name="AuditTitle", parent=styles["Title"], fontName="SpaceMono-Bold", fontSize=18))
-    styles.add(ParagraphStyle(name="MemberHeader", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=14, spaceBefore=12))
-    styles.add(ParagraphStyle(name="TblHeader", parent=styles["Normal"], fontName="SpaceMono-Bold", fontSize=9, textColor=colors.whitesmoke, alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name="TblCell", parent=styles["Normal"], fontName="SpaceMono", fontSize=8, alignment=TA_CENTER))
+    styles = audit_styles()
     
     story = []
     
@@ -411,6 +394,10 @@ def generate_crew_audit_pdf(user: dict, show: dict, audit_data: dict, show_logo_
     weekly_threshold = float(ot_rules['weekly_threshold'])
     start_day = int(ot_rules['start_day'])
 
+    entries_by_crew = defaultdict(list)
+    for entry in audit_data['entries']:
+        entries_by_crew[entry['show_crew_id']].append(entry)
+
     for crew_member in audit_data['crew']:
         crew_id = crew_member['id']
         roster = crew_member.get('roster', {})
@@ -422,48 +409,14 @@ def generate_crew_audit_pdf(user: dict, show: dict, audit_data: dict, show_logo_
         story.append(Paragraph(f"Rate: {rate_str}", styles["Normal"]))
         story.append(Spacer(1, 6))
 
-        member_entries = [e for e in audit_data['entries'] if e['show_crew_id'] == crew_id]
-        weeks = defaultdict(list)
-        
-        for entry in member_entries:
-            d = datetime.strptime(entry['date'], '%Y-%m-%d').date()
-            days_to_subtract = (d.weekday() - start_day + 7) % 7
-            week_start = d - timedelta(days=days_to_subtract)
-            weeks[week_start].append(entry)
-
         tbl_data = [[Paragraph("Week of", styles["TblHeader"]), Paragraph("Reg Hours", styles["TblHeader"]), 
                      Paragraph("OT Hours", styles["TblHeader"]), Paragraph("Total Cost", styles["TblHeader"])]]
         
         grand_reg, grand_ot, grand_cost = 0, 0, 0
 
-        for w_start in sorted(weeks.keys()):
-            week_entries = weeks[w_start]
-            week_reg, week_ot, week_cost = 0, 0, 0
-            
-            for e in sorted(week_entries, key=lambda x: x['date']):
-                hrs = float(e['hours'])
-                if crew_member['rate_type'] == 'daily':
-                    week_cost += crew_member['daily_rate']
-                    reg = min(hrs, daily_threshold)
-                    ot = max(0, hrs - daily_threshold)
-                    if ot > 0:
-                        implied_rate = crew_member['daily_rate'] / daily_threshold
-                        week_cost += ot * (implied_rate * 1.5)
-                else:
-                    reg = min(hrs, daily_threshold)
-                    ot = max(0, hrs - daily_threshold)
-                    week_cost += (reg * crew_member['hourly_rate']) + (ot * crew_member['hourly_rate'] * 1.5)
-                
-                week_reg += reg
-                week_ot += ot
-
-            if week_reg > weekly_threshold:
-                excess = week_reg - weekly_threshold
-                week_reg -= excess
-                week_ot += excess
-                if crew_member['rate_type'] == 'hourly':
-                    week_cost += excess * (crew_member['hourly_rate'] * 0.5)
-
+        weeks = crew_audit_weeks(entries_by_crew.get(crew_id, []), crew_member['rate_type'], crew_member['hourly_rate'],
+                                 crew_member['daily_rate'], daily_threshold, weekly_threshold, start_day)
+        for w_start, week_reg, week_ot, week_cost in weeks:
             tbl_data.append([
                 Paragraph(w_start.strftime('%m/%d/%Y'), styles["TblCell"]),
                 Paragraph(f"{week_reg:.2f}", styles["TblCell"]),
@@ -478,17 +431,20 @@ def generate_crew_audit_pdf(user: dict, show: dict, audit_data: dict, show_logo_
                          Paragraph(f"{grand_ot:.2f}", styles["TblHeader"]), Paragraph(f"${grand_cost:,.2f}", styles["TblHeader"])])
 
         t = Table(tbl_data, colWidths=[1.5*inch, 1.2*inch, 1.2*inch, 1.5*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), COLOR_GRAY_BG),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.darkgrey),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        t.setStyle(AUDIT_TABLE_STYLE)
         story.append(t)
         story.append(Spacer(1, 24))
         story.append(PageBreak())
 
-    doc.build(story, onFirstPage=draw_audit_footer, onLaterPages=draw_audit_footer)
+    # Every crew member starts a new page, so that is the best page estimate before the build.
+    expected_pages = max(1, len(audit_data['crew']))
+
+    def audit_footer(canvas, doc):
+        draw_audit_footer(canvas, doc)
+        if progress:
+            progress(doc.page, max(doc.page, expected_pages))
+
+    doc.build(story, onFirstPage=audit_footer, onLaterPages=audit_footer)
     buffer.seek(0)
     return buffer
 
@@ -568,7 +524,7 @@ def draw_single_case_label(c, label_index: int, image_data: Optional[bytes], sen
     
     if image_data:
         try:
-            image_reader = ImageReader(io.BytesIO(image_data))
+            image_reader = decoded_image(image_data)
             img_box_width, img_box_height = v_line_x - box_x, (box_y + box_height) - h_line_y
             img_box_center_x, img_box_center_y = box_x + (img_box_width / 2), h_line_y + (img_box_height / 2)
             max_img_width, max_img_height = 4.0 * inch, 1.6 * inch
@@ -594,9 +550,7 @@ def draw_single_case_label(c, label_index: int, image_data: Optional[bytes], sen
     c.setFont("SpaceMono", 20)
     c.drawString(padding + (0.1 * inch), h_line_y - (0.3 * inch), "CONTENTS:")
     
-    style_body = ParagraphStyle(
-        name='BodyText', fontName='SpaceMono-Bold', fontSize=28, leading=34, alignment=TA_CENTER)
-    p = Paragraph((contents_text or "").replace('\n', '<br/>').upper(), style=style_body)
+    p = Paragraph((contents_text or "").replace('\n', '<br/>').upper(), style=CASE_LABEL_BODY_STYLE)
     p_width, p_height = p.wrapOn(c, LABEL_WIDTH - (2 * padding) - 0.2 * inch, h_line_y - box_y - 0.5 * inch)
     p.drawOn(c, center_x - p_width / 2, h_line_y - 0.5 * inch - p_height)
 
@@ -633,11 +587,7 @@ def generate_equipment_list_pdf(show_name: str, table_data: List[List[str]], sho
         bottomMargin=0.5*inch,
     )
     story = []
-    styles = getSampleStyleSheet()
-    styles['Normal'].fontName = "SpaceMono"
-    styles['Title'].fontName = "SpaceMono-Bold"
-    styles['Title'].fontSize = 18
-    styles['Title'].spaceAfter = 16
+    styles = report_styles()
 
     story.append(Paragraph(f"{show_name} - Equipment List", styles["Title"]))
 
@@ -646,29 +596,22 @@ def generate_equipment_list_pdf(show_name: str, table_data: List[List[str]], sho
         
         if num_cols == 3:
             col_widths = [3*inch, 3.5*inch, 1*inch]
+        elif num_cols == 4:
+            col_widths = [2.5*inch, 2.75*inch, 1.5*inch, 0.75*inch]
         else:
             available_width = 7.5 * inch
             col_widths = [available_width / num_cols] * num_cols
 
         styled_table_data = []
-        header_style = ParagraphStyle(name='Header', parent=styles['Normal'], fontName='SpaceMono-Bold', alignment=TA_LEFT)
-        body_style = ParagraphStyle(name='Body', parent=styles['Normal'], alignment=TA_LEFT)
+        header_style = styles['ListHeader']
+        body_style = styles['ListBody']
 
         styled_table_data.append([Paragraph(cell, header_style) for cell in table_data[0]])
         for row in table_data[1:]:
             styled_table_data.append([Paragraph(cell, body_style) for cell in row])
         
         table = Table(styled_table_data, colWidths=col_widths, hAlign='LEFT')
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
-            ('LINEBELOW', (0, 1), (-1, -1), 1, colors.lightgrey),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        table.setStyle(EQUIPMENT_LIST_TABLE_STYLE)
         story.append(table)
 
     def footer(canvas, doc):
@@ -694,6 +637,8 @@ def generate_loom_builder_pdf(payload: "LoomBuilderPDFPayload", show_branding: b
         buffer.seek(0)
         return buffer
 
+    styles = loom_styles()
+
     for loom in payload.looms:
         y_top = height - 0.25 * inch
         if show_branding:
@@ -711,16 +656,7 @@ def generate_loom_builder_pdf(payload: "LoomBuilderPDFPayload", show_branding: b
         y_pos -= 0.25 * inch
         
         if loom.cables:
-            styles = getSampleStyleSheet()
-            header_style = ParagraphStyle(
-                name='HeaderStyle',
-                parent=styles['Normal'],
-                alignment=TA_CENTER,
-                fontName='SpaceMono-Bold',
-                fontSize=9,
-                textColor=colors.whitesmoke,
-                leading=11
-            )
+            header_style = styles['LoomHeader']
             
             first_cable = loom.cables[0]
             common_origin_location = first_cable.origin.value
@@ -734,52 +670,17 @@ def generate_loom_builder_pdf(payload: "LoomBuilderPDFPayload", show_branding: b
             header_row = ["Label", "Type", "Length", origin_header_para, dest_header_para, "RCVD", "Done"]
             data = [header_row]
 
-            base_data_style = ParagraphStyle(
-                name='BaseDataStyle',
-                parent=styles['Normal'],
-                fontName='SpaceMono',
-                fontSize=8,
-                alignment=TA_CENTER
-            )
+            base_data_style = styles['LoomCell']
             
             for cable in loom.cables:
-                origin_color = parse_color(cable.origin_color)
-                origin_style = ParagraphStyle(
-                    name='OriginStyle', 
-                    backColor=origin_color,
-                    textColor=colors.white if (origin_color.red + origin_color.green + origin_color.blue) < 1.5 else colors.black,
-                    alignment=TA_CENTER,
-                    fontName='SpaceMono',
-                    fontSize=8,
-                    borderPadding=(2, 4)
-                )
-                origin_cell = Paragraph(cable.origin.end, origin_style)
-
-                destination_color = parse_color(cable.destination_color)
-                destination_style = ParagraphStyle(
-                    name='DestinationStyle', 
-                    backColor=destination_color,
-                    textColor=colors.white if (destination_color.red + destination_color.green + destination_color.blue) < 1.5 else colors.black,
-                    alignment=TA_CENTER,
-                    fontName='SpaceMono',
-                    fontSize=8,
-                    borderPadding=(2, 4)
-                )
-                destination_cell = Paragraph(cable.destination.end, destination_style)
+                origin_cell = Paragraph(cable.origin.end, cable_end_style(cable.origin_color))
+                destination_cell = Paragraph(cable.destination.end, cable_end_style(cable.destination_color))
 
                 rcvd_checkbox = (CHECKED_IMG if cable.is_rcvd else UNCHECKED_IMG) if IMAGES_AVAILABLE else "Y" if cable.is_rcvd else "N"
                 complete_checkbox = (CHECKED_IMG if cable.is_complete else UNCHECKED_IMG) if IMAGES_AVAILABLE else "Y" if cable.is_complete else "N"
 
                 label_text = cable.label_content
-                label_font_size = 8
-                if len(label_text or "") > 16:
-                    label_font_size = 7
-                
-                label_style = ParagraphStyle(
-                    name='LabelStyle',
-                    parent=base_data_style,
-                    fontSize=label_font_size
-                )
+                label_style = styles['LoomLabelSmall'] if len(label_text or "") > 16 else base_data_style
                 label_cell = Paragraph(label_text, label_style)
 
                 type_cell = Paragraph(cable.cable_type, base_data_style)
@@ -798,21 +699,7 @@ def generate_loom_builder_pdf(payload: "LoomBuilderPDFPayload", show_branding: b
 
             table = Table(data, colWidths=[1.4*inch, 1.4*inch, 0.7*inch, 1.6*inch, 1.6*inch, 0.4*inch, 0.4*inch])
             
-            style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (2, 0), 'SpaceMono-Bold'),
-                ('FONTNAME', (5, 0), (6, 0), 'SpaceMono-Bold'),
-                ('TEXTCOLOR', (0, 0), (2, 0), colors.whitesmoke),
-                ('TEXTCOLOR', (5, 0), (6, 0), colors.whitesmoke),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 0),
-                ('TOPPADDING', (0, 0), (-1, 0), 0),
-                ('FONTNAME', (0, 1), (-1, -1), 'SpaceMono'),
-                ('LINEBELOW', (0, 0), (-1, 0), 1.5, colors.black),
-                ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.lightgrey),
-            ])
-            table.setStyle(style)
+            table.setStyle(LOOM_TABLE_STYLE)
             
             table_width, table_height = table.wrapOn(c, width - 1 * inch, height)
             table.drawOn(c, 0.25 * inch, y_pos - table_height)
@@ -823,6 +710,65 @@ def generate_loom_builder_pdf(payload: "LoomBuilderPDFPayload", show_branding: b
     buffer.seek(0)
     return buffer
 
+def _stamp_form(c: canvas.Canvas, key: tuple, x: float, y: float, w: float, h: float, draw: Callable, margin: float = 2):
+    """
+    Stamps a w x h drawing at (x, y). It is drawn by ``draw(c, w, h)`` into a form XObject
+    the first time ``key`` is seen in the document and reused after that. ``margin``
+    widens the form's bounding box for strokes and labels outside the w x h box.
+    """
+    name = "Rack" + hashlib.md5(repr(key).encode()).hexdigest()[:12]
+    if not c.hasForm(name):
+        c.beginForm(name, lowerx=-margin, lowery=-margin, upperx=w + margin, uppery=h + margin)
+        draw(c, w, h)
+        c.endForm()
+    c.saveState()
+    c.translate(x, y)
+    c.doForm(name)
+    c.restoreState()
+
+
+def _draw_rack_frame(c: canvas.Canvas, w: float, h: float, ru_count: int, ru_height: float, label_width: float):
+    """Rack outline with RU lines and RU numbers on both sides."""
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.rect(0, 0, w, h)
+
+    c.setFont("SpaceMono", 5)
+    c.setStrokeColor(colors.lightgrey)
+    c.setFillColor(colors.black)
+    for ru in range(1, ru_count + 1):
+        ru_y_top = ru * ru_height
+        c.line(0, ru_y_top, w, ru_y_top)
+        text_y = ru_y_top - (ru_height / 2) - 2
+        c.drawCentredString(-(label_width / 2), text_y, str(ru))
+        c.drawCentredString(w + (label_width / 2), text_y, str(ru))
+
+
+def _draw_front_face(c: canvas.Canvas, w: float, h: float, model_number: str):
+    c.setLineWidth(1)
+    c.setFillColorRGB(0.88, 0.88, 0.88)
+    c.setStrokeColor(colors.black)
+    c.rect(0, 0, w, h, fill=1, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("SpaceMono", 6)
+    c.drawRightString(w - 0.05 * inch, h - 0.1 * inch, model_number)
+
+
+def _draw_side_face(c: canvas.Canvas, w: float, h: float, is_front: bool, is_shared_slot: bool):
+    c.setFillColor(COLOR_PURPLE_BG if is_shared_slot else COLOR_GRAY_BG)
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.rect(0, 0, w, h, fill=1, stroke=1)
+
+    c.setLineWidth(3)
+    if is_front:
+        c.setStrokeColor(COLOR_BLUE_ACCENT)
+        c.line(0, 0, 0, h)
+    else:
+        c.setStrokeColor(COLOR_ORANGE_ACCENT)
+        c.line(w, 0, w, h)
+
+
 def draw_single_rack(c: canvas.Canvas, x_start: float, y_top: float, rack_data: Rack):
     RACK_FRAME_WIDTH = 3.5 * inch
     RACK_LABEL_WIDTH = 0.3 * inch
@@ -835,21 +781,13 @@ def draw_single_rack(c: canvas.Canvas, x_start: float, y_top: float, rack_data:
         view_x_start = x_start + (i * (RACK_FRAME_WIDTH + SIDE_PADDING))
         y_bottom = y_top - rack_content_height
 
-        c.setStrokeColor(colors.black)
-        c.setLineWidth(1)
-        c.rect(view_x_start, y_bottom, RACK_FRAME_WIDTH, rack_content_height)
+        # Racks of the same height share one frame drawing
+        _stamp_form(c, ("frame", rack_data.ru_height), view_x_start, y_bottom, RACK_FRAME_WIDTH, rack_content_height,
+                    lambda fc, w, h: _draw_rack_frame(fc, w, h, rack_data.ru_height, RU_HEIGHT, RACK_LABEL_WIDTH),
+                    margin=RACK_LABEL_WIDTH)
+        c.setFillColor(colors.black)
         c.setFont("SpaceMono-Bold", 12)
         c.drawCentredString(view_x_start + RACK_FRAME_WIDTH / 2, y_top + 0.15 * inch, f"{rack_data.rack_name} - {view.upper()}")
-
-        c.setFont("SpaceMono", 5)
-        c.setStrokeColor(colors.lightgrey)
-        for ru in range(1, rack_data.ru_height + 1):
-            ru_y_top = y_bottom + ru * RU_HEIGHT
-            c.line(view_x_start, ru_y_top, view_x_start + RACK_FRAME_WIDTH, ru_y_top)
-            c.setFillColor(colors.black)
-            text_y = ru_y_top - (RU_HEIGHT / 2) - 2
-            c.drawCentredString(view_x_start - (RACK_LABEL_WIDTH / 2), text_y, str(ru))
-            c.drawCentredString(view_x_start + RACK_FRAME_WIDTH + (RACK_LABEL_WIDTH / 2), text_y, str(ru))
         
         equip_list = [e for e in rack_data.equipment if e.rack_side and e.rack_side.startswith(view)]
         
@@ -878,17 +816,16 @@ def draw_single_rack(c: canvas.Canvas, x_start: float, y_top: float, rack_data:
                 equip_width = RACK_FRAME_WIDTH
                 equip_x_start = view_x_start
 
-            c.setFillColorRGB(0.88, 0.88, 0.88)
-            c.setStrokeColor(colors.black)
-            c.rect(equip_x_start, equip_bottom_y, equip_width, equip_height, fill=1, stroke=1)
+            # The block and model number are the same for every instance of a template; only the name is per instance
+            face_key = ("front", str(equip_template.id), equip_template.model_number, round(equip_width, 3), round(equip_height, 3))
+            _stamp_form(c, face_key, equip_x_start, equip_bottom_y, equip_width, equip_height,
+                                  lambda fc, w, h: _draw_front_face(fc, w, h, equip_template.model_number))
             
             c.setFillColor(colors.black)
             c.setFont("SpaceMono-Bold", 8)
             text_x = equip_x_start + (equip_width / 2)
             text_y = equip_bottom_y + (equip_height / 2) - 4
             c.drawCentredString(text_x, text_y, equip.instance_name or equip_template.model_number)
-            c.setFont("SpaceMono", 6)
-            c.drawRightString(equip_x_start + equip_width - 0.05 * inch, equip_bottom_y + equip_height - 0.1 * inch, equip_template.model_number)
 
 def draw_rack_side_view(c: canvas.Canvas, x_start: float, y_top: float, rack_data: Rack):
     RACK_FRAME_WIDTH = 3.5 * inch
@@ -900,24 +837,14 @@ def draw_rack_side_view(c: canvas.Canvas, x_start: float, y_top: float, rack_dat
     rack_content_height = rack_data.ru_height * RU_HEIGHT
     y_bottom = y_top - rack_content_height
 
-    c.setStrokeColor(colors.black)
-    c.setLineWidth(1)
-    c.rect(x_start, y_bottom, RACK_FRAME_WIDTH, rack_content_height)
+    _stamp_form(c, ("frame", rack_data.ru_height), x_start, y_bottom, RACK_FRAME_WIDTH, rack_content_height,
+                lambda fc, w, h: _draw_rack_frame(fc, w, h, rack_data.ru_height, RU_HEIGHT, RACK_LABEL_WIDTH),
+                margin=RACK_LABEL_WIDTH)
     
     c.setFont("SpaceMono-Bold", 12)
     c.setFillColor(colors.black)
     c.drawCentredString(x_start + RACK_FRAME_WIDTH / 2, y_top + 0.15 * inch, f"{rack_data.rack_name} - SIDE VIEW")
 
-    c.setFont("SpaceMono", 5)
-    c.setStrokeColor(colors.lightgrey)
-    for ru in range(1, rack_data.ru_height + 1):
-        ru_y_top = y_bottom + ru * RU_HEIGHT
-        c.line(x_start, ru_y_top, x_start + RACK_FRAME_WIDTH, ru_y_top)
-        c.setFillColor(colors.black)
-        text_y = ru_y_top - (RU_HEIGHT / 2) - 2
-        c.drawCentredString(x_start - (RACK_LABEL_WIDTH / 2), text_y, str(ru))
-        c.drawCentredString(x_start + RACK_FRAME_WIDTH + (RACK_LABEL_WIDTH / 2), text_y, str(ru))
-
     groups = {}
     for equip in rack_data.equipment:
         side_key = 'front' if equip.rack_side.lower().startswith('front') else 'rear'
@@ -953,22 +880,10 @@ def draw_rack_side_view(c: canvas.Canvas, x_start: float, y_top: float, rack_dat
             else:
                 item_x = (x_start + RACK_FRAME_WIDTH) - item_width_pts
 
-            fill_color = COLOR_PURPLE_BG if is_shared_slot else COLOR_GRAY_BG
-            c.setFillColor(fill_color)
-            
-            c.setStrokeColor(colors.black)
-            c.setLineWidth(1)
-            
             box_height = max(split_height_pts, 1) 
-            c.rect(item_x, item_y_bottom, item_width_pts, box_height, fill=1, stroke=1)
-
-            c.setLineWidth(3)
-            if is_front:
-                c.setStrokeColor(COLOR_BLUE_ACCENT)
-                c.line(item_x, item_y_bottom, item_x, item_y_bottom + box_height)
-            else:
-                c.setStrokeColor(COLOR_ORANGE_ACCENT)
-                c.line(item_x + item_width_pts, item_y_bottom, item_x + item_width_pts, item_y_bottom + box_height)
+            face_key = ("side", round(item_width_pts, 3), round(box_height, 3), is_front, is_shared_slot)
+            _stamp_form(c, face_key, item_x, item_y_bottom, item_width_pts, box_height,
+                                  lambda fc, w, h: _draw_side_face(fc, w, h, is_front, is_shared_slot))
 
             c.setFillColor(colors.white)
             font_size = 6 if is_shared_slot and count >= 3 else 8
@@ -1016,7 +931,10 @@ def draw_rack_side_view(c: canvas.Canvas, x_start: float, y_top: float, rack_dat
     c.drawString(current_x + box_sz + gap, legend_y + 1, "Shared Slot")
 
 
-def generate_racks_pdf(payload: RackPDFPayload, show_branding: bool = True) -> io.BytesIO:
+def rack_drawing_page_count(payload: RackPDFPayload) -> int:
+    return len(payload.racks) * (int(payload.include_front_rear) + int(payload.include_side_view))
+
+def generate_racks_pdf(payload: RackPDFPayload, show_branding: bool = True, progress: Optional[Callable[[int, int], None]] = None) -> io.BytesIO:
     buffer = io.BytesIO()
     page_size_base = PAGE_SIZES.get(payload.page_size.lower(), letter)
     page_size = portrait(page_size_base)
@@ -1026,6 +944,8 @@ def generate_racks_pdf(payload: RackPDFPayload, show_branding: bool = True) -> i
     MARGIN = 0.5 * inch
     RACK_FRAME_WIDTH = 3.5 * inch 
     date_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    total_pages = rack_drawing_page_count(payload)
+    pages_done = 0
     
     for i, rack in enumerate(payload.racks):
         if payload.include_front_rear:
@@ -1049,6 +969,8 @@ def generate_racks_pdf(payload: RackPDFPayload, show_branding: bool = True) -> i
             
             draw_single_rack(c, x_start, y_top, rack)
             c.showPage()
+            pages_done += 1
+            if progress: progress(pages_done, total_pages)
 
         if payload.include_side_view:
             title_y = height - MARGIN
@@ -1068,86 +990,132 @@ def generate_racks_pdf(payload: RackPDFPayload, show_branding: bool = True) -> i
             
             draw_rack_side_view(c, x_start_side, y_top, rack)
             c.showPage()
+            pages_done += 1
+            if progress: progress(pages_done, total_pages)
 
     c.save()
     buffer.seek(0)
     return buffer
 
-def generate_combined_rack_pdf(payload: RackPDFPayload, show_branding: bool = True, panel_export_data: Optional[List[dict]] = None) -> io.BytesIO:
-    merger = PdfWriter()
-    has_pages = False
+def equipment_list_rows(payload: RackPDFPayload) -> List[List[str]]:
+    """Manufacturer/model quantities for the equipment list, counting modules mounted in patch panels."""
+    equipment_counts = {}
+    all_equipment_instances = {str(equip.id): equip for rack in payload.racks for equip in rack.equipment}
+
+    def process_equipment(item, counts):
+        template = item.equipment_templates
+        if not template: return
+        key = (template.manufacturer or 'N/A', template.model_number or 'N/A')
+        counts[key] = counts.get(key, 0) + 1
+
+        if template.is_patch_panel and item.module_assignments:
+            for slot_name, assignment_data in item.module_assignments.items():
+                if not assignment_data: continue
+                target_id = None
+                if isinstance(assignment_data, dict):
+                    target_id = assignment_data.get('id')
+                elif hasattr(assignment_data, 'id'):
+                    target_id = assignment_data.id
+                else:
+                    target_id = assignment_data
 
-    if payload.include_front_rear or payload.include_side_view:
-        drawings_buffer = generate_racks_pdf(payload, show_branding)
-        drawings_buffer.seek(0, os.SEEK_END)
-        if drawings_buffer.tell() > 0:
-            drawings_buffer.seek(0)
-            merger.append(drawings_buffer)
-            has_pages = True
+                if target_id:
+                    child_item = all_equipment_instances.get(str(target_id))
+                    if child_item:
+                        process_equipment(child_item, counts)
 
+    for rack in payload.racks:
+        for item in rack.equipment:
+            if not item.parent_equipment_instance_id:
+                process_equipment(item, equipment_counts)
+
+    header = ["Manufacturer", "Model Name", "Qty"]
+    data = [header]
+    for (manufacturer, model), qty in sorted(equipment_counts.items()):
+        data.append([manufacturer, model, str(qty)])
+    return data
+
+
+def combined_rack_sections(payload: RackPDFPayload, show_branding: bool = True, panel_export_data: Optional[List[dict]] = None,
+                           power: Optional[dict] = None, equipment_list: Optional[List[List[str]]] = None) -> List[Tuple[Callable, tuple]]:
+    """
+    The independent sections of a full show export as ``(fn, args)`` render calls, in document order.
+    ``equipment_list`` replaces the table counted from the payload, e.g. with the show's cached BOM.
+    """
+    sections = []
+    if payload.include_front_rear or payload.include_side_view:
+        sections.append((generate_racks_pdf, (payload, show_branding)))
     if payload.include_equipment_list:
-        equipment_counts = {}
-        all_equipment_instances = {str(equip.id): equip for rack in payload.racks for equip in rack.equipment}
-        
-        def process_equipment(item, counts):
-            template = item.equipment_templates
-            if not template: return
-            key = (template.manufacturer or 'N/A', template.model_number or 'N/A')
-            counts[key] = counts.get(key, 0) + 1
-            
-            if template.is_patch_panel and item.module_assignments:
-                for slot_name, assignment_data in item.module_assignments.items():
-                    if not assignment_data: continue
-                    target_id = None
-                    if isinstance(assignment_data, dict):
-                        target_id = assignment_data.get('id')
-                    elif hasattr(assignment_data, 'id'):
-                        target_id = assignment_data.id
-                    else:
-                        target_id = assignment_data
+        data = equipment_list if equipment_list is not None else equipment_list_rows(payload)
+        if len(data) > 1:
+            sections.append((generate_equipment_list_pdf, (payload.show_name, data, show_branding)))
+    if payload.include_power_report:
+        sections.append((generate_power_report_pdf, (payload, show_branding, power)))
+    if payload.include_panels and panel_export_data:
+        sections.append((generate_panel_export_pdf, (payload.show_name, panel_export_data, show_branding)))
+    return sections
 
-                    if target_id:
-                        child_item = all_equipment_instances.get(str(target_id))
-                        if child_item:
-                            process_equipment(child_item, counts)
 
-        for rack in payload.racks:
-            for item in rack.equipment:
-                if not item.parent_equipment_instance_id:
-                    process_equipment(item, equipment_counts)
-        
-        header = ["Manufacturer", "Model Name", "Qty"]
-        data = [header]
-        for (manufacturer, model), qty in sorted(equipment_counts.items()):
-            data.append([manufacturer, model, str(qty)])
-        
-        if len(data) > 1:
-            list_buffer = generate_equipment_list_pdf(payload.show_name, data, show_branding)
-            merger.append(list_buffer)
-            has_pages = True
+def generate_combined_rack_pdf(payload: RackPDFPayload, show_branding: bool = True, panel_export_data: Optional[List[dict]] = None,
+                               progress: Optional[Callable[[int, int], None]] = None, executor=None, power: Optional[dict] = None,
+                               equipment_list: Optional[List[List[str]]] = None) -> io.BytesIO:
+    """
+    Renders the selected sections and joins them in a fixed order in one pass.
 
-    if payload.include_power_report:
-        power_buffer = generate_power_report_pdf(payload, show_branding)
-        merger.append(power_buffer)
-        has_pages = True
+    With ``executor`` (a ``RenderExecutor``) the sections render concurrently on its
+    worker processes, so the export takes about as long as its slowest section.
+    ``power`` and ``equipment_list`` are passed through to :func:`combined_rack_sections`.
+    """
+    sections = combined_rack_sections(payload, show_branding, panel_export_data, power, equipment_list)
 
-    if payload.include_panels and panel_export_data:
-        panel_pdf_buffer = generate_panel_export_pdf(payload.show_name, panel_export_data, show_branding)
-        merger.append(panel_pdf_buffer)
-        has_pages = True
+    # Progress counts each rack drawing page plus one step per extra section.
+    drawing_pages = rack_drawing_page_count(payload)
+    extra_sections = int(payload.include_equipment_list) + int(payload.include_power_report) + int(bool(payload.include_panels and panel_export_data))
+    total_steps = max(1, drawing_pages + extra_sections)
 
-    output_buffer = io.BytesIO()
-    if has_pages:
-        merger.write(output_buffer)
+    if executor is not None:
+        documents = executor.map_ordered(_render_section, ((section, {}) for section in sections))
     else:
+        drawings_progress = (lambda done, _total: progress(done, total_steps)) if progress else None
+        documents = (_render_section(fn, args, drawings_progress if fn is generate_racks_pdf else None) for fn, args in sections)
+
+    has_pages = False
+
+    def rendered() -> Iterator[bytes]:
+        nonlocal has_pages
+        steps_done = 0
+        for (fn, _args), document in zip(sections, documents):
+            steps_done += drawing_pages if fn is generate_racks_pdf else 1
+            if progress: progress(min(steps_done, total_steps), total_steps)
+            if document:
+                has_pages = True
+                yield document
+
+    output_buffer = io.BytesIO()
+    for chunk in concat_pdf_stream(rendered()):
+        output_buffer.write(chunk)
+    if not has_pages:
+        output_buffer = io.BytesIO()
         c = canvas.Canvas(output_buffer, pagesize=letter)
         c.drawString(100, 750, "No data selected for export.")
         c.save()
-        
+    if progress: progress(total_steps, total_steps)
+
     output_buffer.seek(0)
     return output_buffer
 
-def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = True) -> io.BytesIO:
+
+def _render_section(fn: Callable, args: tuple, progress: Optional[Callable[[int, int], None]] = None) -> bytes:
+    """Renders one export section to bytes. Module level so worker processes can unpickle it."""
+    if progress:
+        return fn(*args, progress=progress).getvalue()
+    return fn(*args).getvalue()
+
+def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = True, power: Optional[dict] = None) -> io.BytesIO:
+    """
+    Renders the power report. ``power`` is a :func:`power_summary` result, normally the
+    show's server-side power budget; without it the totals come from the payload's racks.
+    """
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -1156,42 +1124,23 @@ def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = Tru
         topMargin=0.5*inch, bottomMargin=0.5*inch,
     )
     story = []
-    styles = getSampleStyleSheet()
-    styles['Normal'].fontName = "SpaceMono"
-    styles['Title'].fontName = "SpaceMono-Bold"
-    styles['Title'].fontSize = 18
-    styles['Title'].spaceAfter = 16
-    
-    # Constants
-    VOLTAGE = payload.power_report_voltage
-    POWER_FACTOR = 0.7
-    UPS_CAPACITY_VA = 1500
-
-    # Calculations
-    total_watts = 0
-    rack_stats = []
-
-    for rack in payload.racks:
-        rack_watts = 0
-        for item in rack.equipment:
-            template = item.equipment_templates
-            if template and template.power_consumption_watts:
-                rack_watts += template.power_consumption_watts
-        
-        rack_amps = rack_watts / VOLTAGE
-        rack_va = rack_watts / POWER_FACTOR
-        
-        rack_stats.append({
-            "name": rack.rack_name,
-            "watts": rack_watts,
-            "amps": rack_amps,
-            "va": rack_va
-        })
-        total_watts += rack_watts
-
-    total_amps = total_watts / VOLTAGE
-    total_va = total_watts / POWER_FACTOR
-    suggested_ups = int(total_va / UPS_CAPACITY_VA) + (1 if total_va % UPS_CAPACITY_VA > 0 else 0)
+    styles = report_styles()
+
+    if power is None:
+        power = power_summary(
+            ((str(rack.id), rack.rack_name,
+              sum(item.equipment_templates.power_consumption_watts for item in rack.equipment
+                  if item.equipment_templates and item.equipment_templates.power_consumption_watts))
+             for rack in payload.racks),
+            payload.power_report_voltage,
+        )
+    VOLTAGE = power["voltage"]
+    POWER_FACTOR = power["power_factor"]
+    total_watts = power["total_watts"]
+    total_amps = power["total_amps"]
+    total_va = power["total_va"]
+    suggested_ups = power["suggested_ups"]
+    rack_stats = [{"name": r["rack_name"], "watts": r["watts"], "amps": r["amps"], "va": r["va"]} for r in power["racks"]]
 
     # --- Title ---
     story.append(Paragraph(f"{payload.show_name} - Power Report", styles["Title"]))
@@ -1200,7 +1149,7 @@ def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = Tru
 
     # --- Summary Box (Styled as a Table) ---
     summary_data = [
-        ["Total Power", "Total Current", "Est. Load (VA)", "Suggested UPS\n(1500VA)"],
+        ["Total Power", "Total Current", "Est. Load (VA)", f"Suggested UPS\n({power['ups_capacity_va']}VA)"],
         [
             f"{total_watts:,} W", 
             f"{total_amps:.1f} A", 
@@ -1210,29 +1159,12 @@ def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = Tru
     ]
     
     summary_table = Table(summary_data, colWidths=[1.6*inch, 1.6*inch, 1.6*inch, 2.4*inch], hAlign='CENTER')
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, -1), 'SpaceMono-Bold'),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    summary_table.setStyle(POWER_SUMMARY_TABLE_STYLE)
     story.append(summary_table)
     story.append(Spacer(1, 24))
 
     # --- Breakdown Table ---
-    heading_style = ParagraphStyle(
-        'Heading3', 
-        parent=styles['Normal'], 
-        fontName='SpaceMono-Bold', 
-        fontSize=12, 
-        spaceAfter=6
-    )
-    story.append(Paragraph("Breakdown by Rack", heading_style))
+    story.append(Paragraph("Breakdown by Rack", styles['SectionHeading']))
     story.append(Spacer(1, 6))
 
     table_header = ["Rack Name", "Watts", "Amps", "VA"]
@@ -1247,18 +1179,7 @@ def generate_power_report_pdf(payload: RackPDFPayload, show_branding: bool = Tru
         ])
 
     breakdown_table = Table(table_data, colWidths=[3.5*inch, 1.2*inch, 1.2*inch, 1.2*inch], hAlign='LEFT')
-    breakdown_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.gray),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'SpaceMono-Bold'),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),   # Names Left
-        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'), # Numbers Right
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LINEBELOW', (0, 0), (-1, 0), 1.5, colors.black),
-        ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.lightgrey),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    breakdown_table.setStyle(POWER_BREAKDOWN_TABLE_STYLE)
     story.append(breakdown_table)
 
     def footer(canvas, doc):
@@ -1320,15 +1241,7 @@ def generate_panel_export_pdf(show_name, export_data, show_branding=True):
             
         if len(tbl_data) > 1:
             t = Table(tbl_data, colWidths=[3.0*inch, 4.0*inch, 1*inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.grey),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-                ('GRID', (0,0), (-1,-1), 0.5, colors.lightgrey),
-                ('FONTNAME', (0,0), (-1,0), 'SpaceMono-Bold'),
-                ('FONTNAME', (0,1), (-1,-1), 'SpaceMono'),
-                ('FONTSIZE', (0,0), (-1,-1), 10)
-            ]))
+            t.setStyle(PANEL_COMPONENTS_TABLE_STYLE)
             
             t_w, t_h = t.wrapOn(c, width, height)
             t_y = y_start - 0.5*inch - t_h
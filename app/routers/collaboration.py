@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from app.api import get_supabase_client, get_user, get_service_client
 from app.models import Collaborator, CollaboratorInvite, CollaboratorUpdate
+from app.services.show_info import show_info_cache
 import uuid
 from typing import List
 
@@ -188,6 +189,8 @@ async def remove_collaborator(show_id: int, user_id: uuid.UUID, user = Depends(g
 
     admin_client = get_service_client()
     admin_client.table('show_collaborators').delete().eq('show_id', show_id).eq('user_id', str(user_id)).execute()
+    # The removed user may still be recorded as a reader of the cached show info
+    show_info_cache.invalidate(show_id)
     
     return {"message": "Collaborator removed."}
 
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from app.api import get_supabase_client, get_user, feature_check
-from app.models import EmailTemplate, EmailTemplateCreate, BulkEmailRequest
-from app.user_email import send_email_with_user_smtp, SMTPSettings
+from app.models import EmailTemplate, EmailTemplateCreate, BulkEmailRequest, BulkEmailJobStatus, BulkEmailRecipientResult
+from app.user_email import build_user_email, open_user_smtp, SMTPSettings
+from app.services.bulk_email import bulk_emails, BulkEmailQueueFull
+from functools import partial
 import uuid
 from typing import List, Optional
 
@@ -299,9 +301,86 @@ async def restore_default_email_templates(user=Depends(get_user), supabase: Clie
         
     return {"message": "Default templates restored.", "count": len(response.data)}
 
-@router.post("/send", tags=["Communications"])
+def _render_recipient_email(request: BulkEmailRequest, recipient: dict, smtp_settings: SMTPSettings):
+    """Fills the request's template in for one recipient. Returns (email, subject, html), or None without an address."""
+    subject = request.subject
+    body = request.body
+    
+    target_email = ""
+    data_source = {}
+    
+    if request.category == 'ROSTER':
+        data_source = recipient
+        target_email = recipient.get('email')
+    elif request.category == 'CREW':
+        data_source = recipient.get('roster', {})
+        data_source['showName'] = recipient.get('shows', {}).get('name', '')
+        data_source['position'] = recipient.get('position', '')
+        target_email = data_source.get('email')
+
+    if not target_email:
+        return None
+    
+    # Prepare rosteredEmail (the recipient's email)
+    data_source['rosteredEmail'] = target_email
+
+    # --- TAG FILTERING LOGIC ---
+    # Handle 'tags' specially if it exists (it's a list, so standard string loop won't catch it)
+    raw_tags = data_source.get('tags', [])
+    if isinstance(raw_tags, list):
+        # Filter out internal tags (starting with "internal:", "private:", or "_")
+        public_tags = [
+            t for t in raw_tags 
+            if isinstance(t, str) and not (
+                t.lower().startswith("internal:") or 
+                t.lower().startswith("private:") or 
+                t.startswith("_")
+            )
+        ]
+        # Add to data_source as a joined string for substitution
+        data_source['tags'] = ", ".join(public_tags)
+
+    # Basic Variable Substitution
+    for key, value in data_source.items():
+        if isinstance(value, str):
+            placeholder = "{{" + key + "}}"
+            if key == 'first_name':
+                body = body.replace("{{firstName}}", value)
+                subject = subject.replace("{{firstName}}", value)
+            elif key == 'last_name':
+                body = body.replace("{{lastName}}", value)
+                subject = subject.replace("{{lastName}}", value)
+            else:
+                body = body.replace(placeholder, value)
+                subject = subject.replace(placeholder, value)
+    
+    # Replace {{replyToEmail}} with the user's configured SMTP 'from' address
+    if smtp_settings.from_email:
+        body = body.replace("{{replyToEmail}}", smtp_settings.from_email)
+
+    # 4. CRITICAL FIX: Wrap the body if it was stripped by Tiptap (missing <html> tags)
+    # This re-applies the DOCTYPE and body styles needed for centering in Outlook/Gmail
+    final_html_body = body
+    if "<html" not in final_html_body.lower():
+        final_html_body = f"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <style>
+    body {{ margin: 0; padding: 0; width: 100% !important; background-color: #111827; }}
+    table {{ border-collapse: collapse; }}
+  </style>
+</head>
+<body style="margin: 0; padding: 0; width: 100% !important; background-color: #111827;">
+  {body}
+</body>
+</html>"""
+
+    return target_email, subject, final_html_body
+
+@router.post("/send", status_code=202, tags=["Communications"])
 async def send_bulk_email(request: BulkEmailRequest, user=Depends(get_user), supabase: Client = Depends(get_supabase_client)):
-    """Sends a bulk email to a list of recipients."""
+    """Queues a bulk email to a list of recipients. Poll /jobs/{job_id} for progress and per-recipient results."""
     # 1. Fetch User SMTP settings (CONFIRMED: Uses User Settings, not Admin)
     smtp_res = supabase.table('user_smtp_settings').select('*').eq('user_id', str(user.id)).single().execute()
     if not smtp_res.data:
@@ -321,86 +400,38 @@ async def send_bulk_email(request: BulkEmailRequest, user=Depends(get_user), sup
     if not recipients:
         raise HTTPException(status_code=404, detail="No valid recipients found.")
 
-    # 3. Sending Logic
+    # 3. Render each message now; the job only has to send them
+    outgoing = []
     for recipient in recipients:
-        subject = request.subject
-        body = request.body
-        
-        target_email = ""
-        data_source = {}
-        
-        if request.category == 'ROSTER':
-            data_source = recipient
-            target_email = recipient.get('email')
-        elif request.category == 'CREW':
-            data_source = recipient.get('roster', {})
-            data_source['showName'] = recipient.get('shows', {}).get('name', '')
-            data_source['position'] = recipient.get('position', '')
-            target_email = data_source.get('email')
-
-        if not target_email:
-            continue
-        
-        # Prepare rosteredEmail (the recipient's email)
-        data_source['rosteredEmail'] = target_email
+        rendered = _render_recipient_email(request, recipient, smtp_settings)
+        entry = {"recipient_id": str(recipient.get('id')), "email": None, "message": None}
+        if rendered:
+            target_email, subject, html_body = rendered
+            entry["email"] = target_email
+            entry["message"] = build_user_email(smtp_settings, [target_email], subject, html_body)
+        outgoing.append(entry)
 
-        # --- TAG FILTERING LOGIC ---
-        # Handle 'tags' specially if it exists (it's a list, so standard string loop won't catch it)
-        raw_tags = data_source.get('tags', [])
-        if isinstance(raw_tags, list):
-            # Filter out internal tags (starting with "internal:", "private:", or "_")
-            public_tags = [
-                t for t in raw_tags 
-                if isinstance(t, str) and not (
-                    t.lower().startswith("internal:") or 
-                    t.lower().startswith("private:") or 
-                    t.startswith("_")
-                )
-            ]
-            # Add to data_source as a joined string for substitution
-            data_source['tags'] = ", ".join(public_tags)
-
-        # Basic Variable Substitution
-        for key, value in data_source.items():
-            if isinstance(value, str):
-                placeholder = "{{" + key + "}}"
-                if key == 'first_name':
-                    body = body.replace("{{firstName}}", value)
-                    subject = subject.replace("{{firstName}}", value)
-                elif key == 'last_name':
-                    body = body.replace("{{lastName}}", value)
-                    subject = subject.replace("{{lastName}}", value)
-                else:
-                    body = body.replace(placeholder, value)
-                    subject = subject.replace(placeholder, value)
-        
-        # Replace {{replyToEmail}} with the user's configured SMTP 'from' address
-        if smtp_settings.from_email:
-            body = body.replace("{{replyToEmail}}", smtp_settings.from_email)
-
-        # 4. CRITICAL FIX: Wrap the body if it was stripped by Tiptap (missing <html> tags)
-        # This re-applies the DOCTYPE and body styles needed for centering in Outlook/Gmail
-        final_html_body = body
-        if "<html" not in final_html_body.lower():
-            final_html_body = f"""<!DOCTYPE html>
-<html>
-<head>
-  <meta charset="utf-8">
-  <style>
-    body {{ margin: 0; padding: 0; width: 100% !important; background-color: #111827; }}
-    table {{ border-collapse: collapse; }}
-  </style>
-</head>
-<body style="margin: 0; padding: 0; width: 100% !important; background-color: #111827;">
-  {body}
-</body>
-</html>"""
+    # 4. Send in the background, reusing one SMTP login per batch
+    try:
+        job = bulk_emails.submit(user.id, partial(open_user_smtp, smtp_settings), outgoing)
+    except BulkEmailQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Email queue is full, try again shortly. ({e})")
 
-        send_email_with_user_smtp(
-            smtp_settings=smtp_settings,
-            recipient_emails=[target_email],
-            subject=subject,
-            html_body=final_html_body
-        )
+    return {"message": "Emails queued.", "job_id": job.id, "status": job.status, "total": len(job.results)}
 
-    return {"message": "Emails sent successfully."}
\ No newline at end of file
+@router.get("/jobs/{job_id}", response_model=BulkEmailJobStatus, tags=["Communications"])
+async def get_bulk_email_job(job_id: str, user=Depends(get_user)):
+    """Reports the progress of a bulk email and the outcome for each recipient."""
+    job = bulk_emails.get(job_id, user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Email job not found or expired.")
+    return BulkEmailJobStatus(
+        job_id=job.id,
+        status=job.status,
+        total=len(job.results),
+        sent=job.count("sent"),
+        failed=job.count("failed"),
+        skipped=job.count("skipped"),
+        error=job.error,
+        results=[BulkEmailRecipientResult(**vars(r)) for r in job.results],
+    )
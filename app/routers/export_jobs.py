@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from app.api import get_user
+from app.models import ExportJobStatus
+from app.services.export_jobs import export_jobs
+
+router = APIRouter(prefix="/export-jobs", tags=["Export Jobs"])
+
+def _get_job_or_404(job_id: str, user):
+    job = export_jobs.get(job_id, user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found or expired.")
+    return job
+
+@router.get("/{job_id}", response_model=ExportJobStatus)
+async def get_export_job_status(job_id: str, user=Depends(get_user)):
+    """Reports the state of a background export and how many pages are done."""
+    job = _get_job_or_404(job_id, user)
+    return ExportJobStatus(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        pages_done=job.pages_done,
+        pages_total=job.pages_total,
+        filename=job.filename,
+        error=job.error,
+        bytes_saved=job.bytes_saved,
+    )
+
+@router.get("/{job_id}/download")
+async def download_export_job(job_id: str, user=Depends(get_user)):
+    """Returns the finished file of a background export."""
+    job = _get_job_or_404(job_id, user)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Export failed: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail="Export is not finished yet.")
+    return Response(content=job.result, media_type=job.media_type, headers={
+        "Content-Disposition": f"attachment; filename=\"{job.filename}\""
+    })
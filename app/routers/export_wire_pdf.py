@@ -1,10 +1,15 @@
 import io
-import base64
 from collections import defaultdict, deque
+from datetime import date
 from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, JSONResponse
 from app.schemas.wire_export import PdfExportPayload, Edge, PortDef
 from app.services.wire_export_svg import build_pdf_bytes
+from app.services.render_cache import wire_pdf_cache, content_hash
+from app.services.export_jobs import start_export_job
+from app.services.render_executor import render_pdf
+from app.services.pdf_optimize import optimize_export
+from app.services.logo_cache import logo_cache
 from app.api import get_user, get_supabase_client, get_branding_visibility
 from supabase import Client
 
@@ -103,10 +108,22 @@ def apply_smart_layout(nodes, edges, page_width=1000, start_x=50, start_y=50):
         # Add visual separation between clusters
         current_y += PADDING_Y * 2
 
+def _render_wire_pdf(cache_key: str, graph, title_block, progress=None) -> bytes:
+    """Background-job entry point: serves from the render cache or renders and stores the result."""
+    pdf_bytes = wire_pdf_cache.get(cache_key)
+    if not pdf_bytes:
+        pdf_bytes = build_pdf_bytes(graph, graph.page_size, title_block, progress=progress)
+        if not pdf_bytes:
+            raise ValueError("Failed to generate PDF: result was empty.")
+        wire_pdf_cache.put(cache_key, pdf_bytes)
+    return pdf_bytes
+
 @router.post("/export/wire.pdf")
 async def export_wire_pdf(
     payload: PdfExportPayload, 
     show_id: int = Query(...),
+    background: bool = Query(False, description="Render as a background export job and return its id."),
+    optimize: bool = Query(False, description="Shrink the PDF and report the bytes saved."),
     user = Depends(get_user),
     supabase: Client = Depends(get_supabase_client),
     show_branding: bool = Depends(get_branding_visibility)
@@ -300,8 +317,7 @@ async def export_wire_pdf(
                 
             if show_logo_path:
                 try:
-                    show_logo_bytes = supabase.storage.from_('logos').download(show_logo_path)
-                    payload.title_block.show_logo_base64 = base64.b64encode(show_logo_bytes).decode('utf-8')
+                    payload.title_block.show_logo_base64 = logo_cache.fetch(supabase, show_logo_path, user.id).b64
                 except Exception:
                     pass
 
@@ -309,22 +325,39 @@ async def export_wire_pdf(
         if profile_res.data and profile_res.data.get('company_logo_path'):
             company_logo_path = profile_res.data['company_logo_path']
             try:
-                company_logo_bytes = supabase.storage.from_('logos').download(company_logo_path)
-                payload.title_block.company_logo_base64 = base64.b64encode(company_logo_bytes).decode('utf-8')
+                payload.title_block.company_logo_base64 = logo_cache.fetch(supabase, company_logo_path, user.id).b64
             except Exception:
                 pass
         
         payload.title_block.show_branding = show_branding
 
-        # --- Generate PDF ---
-        pdf_bytes = build_pdf_bytes(payload.graph, payload.graph.page_size, payload.title_block)
-        if not pdf_bytes:
-            raise HTTPException(status_code=500, detail="Failed to generate PDF: result was empty.")
-
+        # --- Generate PDF (served from the render cache when the diagram is unchanged) ---
+        # The title block prints today's date, so the date is part of the key.
+        cache_key = content_hash(payload.graph, payload.title_block, payload.graph.page_size, date.today().isoformat())
         filename = f"{show_name.replace(' ', '_')}-wire-export.pdf"
-        return Response(content=pdf_bytes, media_type="application/pdf", headers={
-            "Content-Disposition": f"attachment; filename=\"{filename}\""
-        })
+
+        if background:
+            job = start_export_job("wire", user.id, filename, _render_wire_pdf, cache_key, payload.graph, payload.title_block,
+                                   optimize=optimize)
+            return JSONResponse(status_code=202, content=job)
+
+        pdf_bytes = wire_pdf_cache.get(cache_key)
+        cache_status = "hit" if pdf_bytes else "miss"
+        if not pdf_bytes:
+            pdf_bytes = await render_pdf(build_pdf_bytes, payload.graph, payload.graph.page_size, payload.title_block)
+            if not pdf_bytes:
+                raise HTTPException(status_code=500, detail="Failed to generate PDF: result was empty.")
+            wire_pdf_cache.put(cache_key, pdf_bytes)
+
+        headers = {
+            "Content-Disposition": f"attachment; filename=\"{filename}\"",
+            "X-Render-Cache": cache_status
+        }
+        if optimize:
+            pdf_bytes = await optimize_export(pdf_bytes, headers)
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Critical PDF Export Error: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred during PDF generation: {e}")
\ No newline at end of file
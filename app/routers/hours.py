@@ -3,46 +3,69 @@ from fastapi.concurrency import run_in_threadpool
 from supabase import Client
 from app.api import get_user, get_branding_visibility, get_supabase_client
 from app.models import ( 
-    TimesheetEntryCreate, WeeklyTimesheet,  
+    WeeklyTimesheet,  
     CrewMemberHours, TimesheetEmailPayload 
 ) 
 from app.user_email import send_email_with_user_smtp, SMTPSettings
 # NOTE: Make sure to import generate_crew_audit_pdf once it's created in pdf_utils.py!
 from app.pdf_utils import generate_hours_pdf 
-from fastapi.responses import Response 
+from fastapi.responses import Response, JSONResponse 
+from app.services.export_jobs import start_export_job
+from app.services.render_executor import render_pdf
+from app.services.pdf_optimize import optimize_export, optimize_pdf
+from app.services.logo_cache import logo_cache
+from app.services.show_info import show_info_cache
+from app.utils.timesheet_utils import (
+    diff_timesheet_cells, fetch_audit_entries, fetch_saved_cells, save_timesheet_diff, timesheet_version
+)
+import asyncio
 import uuid 
 from typing import List, Optional 
 from datetime import date, timedelta 
 
 router = APIRouter(prefix="/shows/{show_id}", tags=["Timesheets"]) 
 
+async def _execute(query):
+    """Runs a blocking Supabase query on the threadpool so independent reads can overlap."""
+    return await run_in_threadpool(query.execute)
+
+def _download_logo(supabase: Client, path: Optional[str], user_id) -> Optional[bytes]:
+    if not path:
+        return None
+    try:
+        return logo_cache.download(supabase, path, user_id)
+    except Exception:
+        return None
+
 # This helper function is the core logic 
 async def get_timesheet_data(show_id: int, week_start_date: date, user_id: uuid.UUID, supabase: Client) -> WeeklyTimesheet: 
     week_end_date = week_start_date + timedelta(days=6) 
 
-    # Get current user's roster_id from their roster entry 
-    roster_res = supabase.table('roster').select('id').eq('user_id', str(user_id)).execute() 
+    # 1. Show info (OT rules) comes from the per-show cache, while the crew, their roster
+    # rows and this week's hours are fetched as one embedded query at the same time.
+    crew_query = supabase.table('show_crew') \
+        .select('*, roster(*), timesheet_entries(date, hours)') \
+        .eq('show_id', show_id) \
+        .gte('timesheet_entries.date', str(week_start_date)) \
+        .lte('timesheet_entries.date', str(week_end_date))
+    # The current user's own roster entry, to list them first
+    roster_query = supabase.table('roster').select('id').eq('user_id', str(user_id))
+    show_info, crew_res, roster_res = await asyncio.gather(
+        run_in_threadpool(show_info_cache.get, supabase, show_id, user_id),
+        _execute(crew_query),
+        _execute(roster_query)
+    )
+    if show_info is None: 
+        raise HTTPException(status_code=404, detail="Show not found") 
     # Handle multiple roster entries for a user by taking the first one. 
     user_roster_id = roster_res.data[0].get('id') if roster_res.data else None 
 
-    # 1. Get Show Info (for OT rules) 
-    show_res = supabase.table('shows').select('id, name, data').eq('id', show_id).single().execute() 
-    if not show_res.data: 
-        raise HTTPException(status_code=404, detail="Show not found") 
-     
-    show_info = show_res.data 
-    show_data = show_info.get('data', {}) or {} 
-    info_data = show_data.get('info', {}) or {} 
-
-    logo_path = info_data.get('logo_path') 
+    info_data = show_info.info
     ot_daily_threshold = info_data.get('ot_daily_threshold', 10) 
     ot_weekly_threshold = info_data.get('ot_weekly_threshold', 40) 
     pay_period_start_day = info_data.get('pay_period_start_day', 0) 
 
-    # 2. Get Show Crew and their Roster info 
-    crew_res = supabase.table('show_crew').select('*, roster(*)').eq('show_id', show_id).execute() 
-
-    # Sort crew members: current user first, then alphabetically by first name 
+    # 2. Sort crew members: current user first, then alphabetically by first name 
     sorted_crew_data = sorted( 
         crew_res.data, 
         key=lambda c: ( 
@@ -51,23 +74,8 @@ async def get_timesheet_data(show_id: int, week_start_date: date, user_id: uuid.
             (c.get('roster') or {}).get('last_name', '').lower() 
         ) 
     ) 
-     
-    show_crew_ids = [c['id'] for c in sorted_crew_data] 
-     
-    # 3. Get all hours for this crew for this week 
-    hours_res = supabase.table('timesheet_entries').select('*') \
-        .in_('show_crew_id', show_crew_ids) \
-        .gte('date', str(week_start_date)) \
-        .lte('date', str(week_end_date)) \
-        .execute() 
-
-    # 4. Assemble the data 
-    hours_map = {} # {show_crew_id: {date: hours}} 
-    for h in hours_res.data: 
-        if h['show_crew_id'] not in hours_map: 
-            hours_map[h['show_crew_id']] = {} 
-        hours_map[h['show_crew_id']][h['date']] = h['hours'] 
 
+    # 3. Assemble the data 
     assembled_crew_hours = [] 
     for c in sorted_crew_data: 
         roster_info = c.get('roster') or {}
@@ -81,20 +89,23 @@ async def get_timesheet_data(show_id: int, week_start_date: date, user_id: uuid.
                 rate_type=c['rate_type'], 
                 hourly_rate=c['hourly_rate'], 
                 daily_rate=c['daily_rate'], 
-                hours_by_date=hours_map.get(c['id'], {}) 
+                hours_by_date={h['date']: h['hours'] for h in c.get('timesheet_entries') or []} 
             ) 
         ) 
 
     return WeeklyTimesheet( 
         show_id=show_id, 
-        show_name=show_info['name'], 
-        logo_path=logo_path, 
+        show_name=show_info.name, 
+        logo_path=show_info.logo_path, 
         week_start_date=week_start_date, 
         week_end_date=week_end_date, 
         ot_daily_threshold=ot_daily_threshold, 
         ot_weekly_threshold=ot_weekly_threshold, 
         pay_period_start_day=pay_period_start_day, 
-        crew_hours=assembled_crew_hours 
+        crew_hours=assembled_crew_hours,
+        version=timesheet_version(
+            {"show_crew_id": c['id'], **h} for c in sorted_crew_data for h in c.get('timesheet_entries') or []
+        )
     ) 
 
 @router.get("/timesheet", response_model=WeeklyTimesheet) 
@@ -115,27 +126,57 @@ async def update_weekly_timesheet(
     user=Depends(get_user),  
     supabase: Client = Depends(get_supabase_client) 
 ): 
-    """Saves all hours for a weekly timesheet. This is an atomic bulk upsert.""" 
-    entries_to_upsert = [] 
+    """
+    Saves a weekly timesheet by writing only what changed: new or edited cells are
+    upserted and cells cleared to 0 are deleted, in chunks for very large crews.
+    If ``version`` is sent and the saved week has changed since it was loaded, the
+    save is rejected with 409 instead of overwriting the other edit. The version
+    covers the whole show crew's week, as GET returns it, whichever crew are sent.
+    """ 
+    submitted = {} 
     for crew_member in timesheet.crew_hours: 
         for day, hours in crew_member.hours_by_date.items(): 
-            entry = TimesheetEntryCreate( 
-                show_crew_id=crew_member.show_crew_id, 
-                date=day.isoformat(), 
-                hours=hours 
-            ).model_dump() 
-            entry['show_crew_id'] = str(entry['show_crew_id']) 
-            entries_to_upsert.append(entry) 
-
-    if not entries_to_upsert: 
+            submitted[(str(crew_member.show_crew_id), day.isoformat())] = hours 
+
+    if not submitted: 
         return {"message": "No hours to save."} 
+
+    week_start = str(timesheet.week_start_date) 
+    week_end = str(timesheet.week_end_date) 
+    first_day = min(week_start, min(day for _, day in submitted)) 
+    last_day = max(week_end, max(day for _, day in submitted)) 
+    days = (date.fromisoformat(last_day) - date.fromisoformat(first_day)).days + 1 
+    submitted_crew_ids = [str(c.show_crew_id) for c in timesheet.crew_hours] 
          
     try: 
-        supabase.table('timesheet_entries').upsert( 
-            entries_to_upsert, 
-            on_conflict='show_crew_id,date' 
-        ).execute() 
-        return {"message": "Timesheet saved successfully."} 
+        crew_res = await _execute(supabase.table('show_crew').select('id').eq('show_id', show_id)) 
+        show_crew_ids = {str(c['id']) for c in crew_res.data or []} 
+        crew_ids = sorted(show_crew_ids.union(submitted_crew_ids)) 
+        saved_rows = await run_in_threadpool(fetch_saved_cells, supabase, crew_ids, first_day, last_day, days) 
+        saved_week = [r for r in saved_rows if week_start <= r['date'] <= week_end and str(r['show_crew_id']) in show_crew_ids] 
+        if timesheet.version and timesheet.version != timesheet_version(saved_week): 
+            raise HTTPException(status_code=409, detail="This timesheet was changed by someone else. Reload it and re-apply your edits.") 
+
+        upserts, delete_ids = diff_timesheet_cells(saved_rows, submitted) 
+        if upserts or delete_ids: 
+            await run_in_threadpool(save_timesheet_diff, supabase, upserts, delete_ids) 
+
+        # Version of the week as it is now saved, so the client can keep editing without reloading
+        week = {(str(r['show_crew_id']), r['date']): r for r in saved_week} 
+        deleted = set(delete_ids) 
+        week = {cell: r for cell, r in week.items() if r['id'] not in deleted} 
+        for row in upserts: 
+            if week_start <= row['date'] <= week_end and row['show_crew_id'] in show_crew_ids: 
+                week[(row['show_crew_id'], row['date'])] = row 
+
+        return { 
+            "message": "Timesheet saved successfully.", 
+            "upserted": len(upserts), 
+            "deleted": len(delete_ids), 
+            "version": timesheet_version(week.values()) 
+        } 
+    except HTTPException: 
+        raise 
     except Exception as e: 
         print(f"Error during bulk update: {e}") 
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}") 
@@ -144,13 +185,17 @@ async def update_weekly_timesheet(
 async def get_timesheet_pdf( 
     show_id: int,  
     week_start_date: date = Query(...),  
+    optimize: bool = False,
     user=Depends(get_user),  
     supabase: Client = Depends(get_supabase_client), 
     show_branding: bool = Depends(get_branding_visibility) 
 ): 
-    """Generates and returns a PDF of the weekly timesheet.""" 
-    # 1. Fetch User Profile 
-    profile_res = supabase.table('profiles').select('*').eq('id', user.id).single().execute() 
+    """Generates and returns a PDF of the weekly timesheet. ?optimize=true shrinks it for email and slow links.""" 
+    # 1. Fetch User Profile and Timesheet Data concurrently 
+    profile_res, timesheet_data = await asyncio.gather(
+        _execute(supabase.table('profiles').select('*').eq('id', user.id).single()),
+        get_timesheet_data(show_id, week_start_date, user.id, supabase)
+    )
     if not profile_res.data: 
         raise HTTPException(status_code=404, detail="User profile not found.") 
      
@@ -160,30 +205,18 @@ async def get_timesheet_pdf(
         "company": user_profile.get('company_name'), 
         "position": user_profile.get('production_role') 
     } 
-     
-    company_logo_path = user_profile.get('company_logo_path') 
-    company_logo_bytes = None 
-    if company_logo_path: 
-        try: 
-            company_logo_bytes = supabase.storage.from_('logos').download(company_logo_path) 
-        except Exception: 
-            pass 
-
-    # 2. Fetch Timesheet Data 
-    timesheet_data = await get_timesheet_data(show_id, week_start_date, user.id, supabase) 
-
-    show_logo_bytes = None 
-    if timesheet_data.logo_path: 
-        try: 
-            show_logo_bytes = supabase.storage.from_('logos').download(timesheet_data.logo_path) 
-        except Exception: 
-            pass 
+
+    # 2. Both logos (usually already in the logo cache) 
+    company_logo_bytes, show_logo_bytes = await asyncio.gather(
+        run_in_threadpool(_download_logo, supabase, user_profile.get('company_logo_path'), user.id),
+        run_in_threadpool(_download_logo, supabase, timesheet_data.logo_path, user.id)
+    )
 
     # 3. Structure data for the new PDF generator 
     show_info_dict = { "name": timesheet_data.show_name } 
     
     # 4. Generate PDF 
-    pdf_bytes_io = await run_in_threadpool( 
+    pdf_bytes = await render_pdf( 
         generate_hours_pdf, 
         user=user_info, 
         show=show_info_dict, 
@@ -195,11 +228,14 @@ async def get_timesheet_pdf(
      
     # Filename: {ShowName} Hours {WeekStart}.pdf
     filename = f"{timesheet_data.show_name.strip()} Hours {week_start_date}.pdf" 
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if optimize:
+        pdf_bytes = await optimize_export(pdf_bytes, headers)
 
     return Response( 
-        content=pdf_bytes_io.getvalue(),  
+        content=pdf_bytes,  
         media_type="application/pdf", 
-        headers={"Content-Disposition": f"attachment; filename={filename}"} 
+        headers=headers
     ) 
 
 # --- NEW ENDPOINT FOR CREW AUDIT ---
@@ -209,75 +245,51 @@ async def get_crew_audit_pdf(
     show_crew_ids: List[str] = Query(..., description="List of show_crew_ids to audit"),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    background: bool = False,
+    optimize: bool = False,
     user=Depends(get_user),
     supabase: Client = Depends(get_supabase_client),
     show_branding: bool = Depends(get_branding_visibility)
 ):
     """Generates a comprehensive historical audit PDF for specific crew members."""
     
-    # 1. Fetch Show and OT Rules Info
-    show_res = supabase.table('shows').select('name, data').eq('id', show_id).single().execute()
-    if not show_res.data:
+    # 1. Show and OT rules (cached per show), user profile, crew and entries are independent reads
+    show_info, profile_res, crew_res, entries = await asyncio.gather(
+        run_in_threadpool(show_info_cache.get, supabase, show_id, user.id),
+        _execute(supabase.table('profiles').select('*').eq('id', user.id).single()),
+        _execute(supabase.table('show_crew').select('*, roster(*)').in_('id', show_crew_ids)),
+        run_in_threadpool(fetch_audit_entries, supabase, show_crew_ids, start_date, end_date)
+    )
+    if show_info is None:
         raise HTTPException(status_code=404, detail="Show not found")
-        
-    show_info = show_res.data
-    ot_rules = show_info.get('data', {}).get('info', {})
-    
-    # Extract Branding Assets if needed
-    logo_path = ot_rules.get('logo_path')
-    show_logo_bytes = None 
-    if logo_path: 
-        try: show_logo_bytes = supabase.storage.from_('logos').download(logo_path) 
-        except Exception: pass 
-    
+
     # Fetch User Info for Header/Footer
-    profile_res = supabase.table('profiles').select('*').eq('id', user.id).single().execute() 
     user_profile = profile_res.data 
     user_info = { 
         "full_name": f"{user_profile.get('first_name', '')} {user_profile.get('last_name', '')}".strip(), 
         "company": user_profile.get('company_name')
     } 
     
-    # 2. Fetch Crew Info
-    crew_res = supabase.table('show_crew').select('*, roster(*)').in_('id', show_crew_ids).execute()
+    # 2. Crew Info
     crew_data = crew_res.data
 
     if not crew_data:
         raise HTTPException(status_code=404, detail="Selected crew members not found")
 
-    # 3. Fetch Timesheet Entries
-    query = supabase.table('timesheet_entries').select('*').in_('show_crew_id', show_crew_ids)
-    if start_date:
-        query = query.gte('date', str(start_date))
-    if end_date:
-        query = query.lte('date', str(end_date))
-        
-    entries_res = query.order('date').execute()
+    # Extract Branding Assets if needed
+    show_logo_bytes = await run_in_threadpool(_download_logo, supabase, show_info.logo_path, user.id)
     
     # Prepare data payload for PDF utility
     audit_data = {
         "crew": crew_data,
-        "entries": entries_res.data,
-        "ot_rules": {
-            "daily_threshold": ot_rules.get('ot_daily_threshold', 10),
-            "weekly_threshold": ot_rules.get('ot_weekly_threshold', 40),
-            "start_day": ot_rules.get('pay_period_start_day', 0)
-        }
+        "entries": entries,
+        "ot_rules": show_info.ot_rules
     }
 
     # 4. Generate PDF (Requires `generate_crew_audit_pdf` in pdf_utils.py)
     # Using generate_hours_pdf as fallback if new func isn't created yet in your utils
     from app.pdf_utils import generate_crew_audit_pdf 
     
-    pdf_bytes_io = await run_in_threadpool(
-        generate_crew_audit_pdf, 
-        user=user_info,
-        show={"name": show_info['name']},
-        audit_data=audit_data,
-        show_logo_bytes=show_logo_bytes,
-        show_branding=show_branding
-    )
-    
     # Dynamic Filename
     if len(show_crew_ids) > 1:
         filename_prefix = "Multi_Crew_Audit"
@@ -285,13 +297,37 @@ async def get_crew_audit_pdf(
         last_name = (crew_data[0].get('roster') or {}).get('last_name', 'Crew')
         filename_prefix = f"{last_name}_Audit"
         
-    safe_show_name = show_info['name'].replace(' ', '_')
+    safe_show_name = show_info.name.replace(' ', '_')
     filename = f"{filename_prefix}_{safe_show_name}.pdf"
 
+    if background:
+        job = start_export_job(
+            "crew_audit", user.id, filename, generate_crew_audit_pdf,
+            user=user_info,
+            show={"name": show_info.name},
+            audit_data=audit_data,
+            show_logo_bytes=show_logo_bytes,
+            show_branding=show_branding,
+            optimize=optimize
+        )
+        return JSONResponse(status_code=202, content=job)
+
+    pdf_bytes = await render_pdf(
+        generate_crew_audit_pdf, 
+        user=user_info,
+        show={"name": show_info.name},
+        audit_data=audit_data,
+        show_logo_bytes=show_logo_bytes,
+        show_branding=show_branding
+    )
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if optimize:
+        pdf_bytes = await optimize_export(pdf_bytes, headers)
+
     return Response(
-        content=pdf_bytes_io.getvalue(), 
+        content=pdf_bytes, 
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=headers
     )
 
 @router.post("/timesheet/email") 
@@ -305,49 +341,42 @@ async def email_weekly_timesheet(
     """Emails the weekly timesheet with PDF attachment."""
     user_id = user.id 
     
-    # 1. Fetch SMTP Settings
-    smtp_res = supabase.table('user_smtp_settings').select('*').eq('user_id', user_id).maybe_single().execute() 
+    # 1. Fetch SMTP Settings, Profile Info (for PDF footer and template vars) and Timesheet Data concurrently
+    smtp_res, profile_res, timesheet_data = await asyncio.gather(
+        _execute(supabase.table('user_smtp_settings').select('*').eq('user_id', user_id).maybe_single()),
+        _execute(supabase.table('profiles').select('*').eq('id', user.id).single()),
+        get_timesheet_data(show_id, week_start_date, user.id, supabase)
+    )
     if not smtp_res.data: 
         raise HTTPException(status_code=400, detail="SMTP settings not configured.") 
     smtp_settings = SMTPSettings(**smtp_res.data) 
 
-    # 2. Fetch Profile Info (for PDF footer and template vars)
-    profile_res = supabase.table('profiles').select('*').eq('id', user.id).single().execute() 
     user_profile = profile_res.data 
     user_info = { 
         "full_name": f"{user_profile.get('first_name', '')} {user_profile.get('last_name', '')}".strip(), 
         "company": user_profile.get('company_name') 
     } 
-    company_logo_path = user_profile.get('company_logo_path') 
-    company_logo_bytes = None 
-    if company_logo_path: 
-        try: 
-            company_logo_bytes = supabase.storage.from_('logos').download(company_logo_path) 
-        except Exception: pass 
-
-    # 3. Fetch Timesheet Data
-    timesheet_data = await get_timesheet_data(show_id, week_start_date, user.id, supabase) 
-    
-    # 3b. Fetch Show Info (PM Details)
-    show_res = supabase.table('shows').select('data').eq('id', show_id).single().execute()
-    show_info_data = show_res.data.get('data', {}).get('info', {}) if show_res.data else {}
+
+    # 2. Show Info (PM Details) is already cached by get_timesheet_data
+    show_info = await run_in_threadpool(show_info_cache.get, supabase, show_id, user.id)
+    show_info_data = show_info.info if show_info else {}
     
     pm_first_name = show_info_data.get('show_pm_first_name', '')
     pm_last_name = show_info_data.get('show_pm_last_name', '')
     
     user_first_name = user_profile.get('first_name', '')
     user_last_name = user_profile.get('last_name', '')
-    
-    show_logo_bytes = None 
-    if timesheet_data.logo_path: 
-        try: 
-            show_logo_bytes = supabase.storage.from_('logos').download(timesheet_data.logo_path) 
-        except Exception: pass 
+
+    # 3. Both logos (usually already in the logo cache)
+    company_logo_bytes, show_logo_bytes = await asyncio.gather(
+        run_in_threadpool(_download_logo, supabase, user_profile.get('company_logo_path'), user.id),
+        run_in_threadpool(_download_logo, supabase, timesheet_data.logo_path, user.id)
+    )
 
     show_info_dict = { "name": timesheet_data.show_name } 
     
     # 4. Generate PDF
-    pdf_bytes_io = await run_in_threadpool( 
+    pdf_bytes = await render_pdf( 
         generate_hours_pdf, 
         user=user_info, 
         show=show_info_dict, 
@@ -356,8 +385,9 @@ async def email_weekly_timesheet(
         company_logo_bytes=company_logo_bytes, 
         show_branding=payload.show_branding 
     ) 
-    
-    pdf_bytes = pdf_bytes_io.getvalue() 
+    optimize_report = None
+    if payload.optimize:
+        pdf_bytes, optimize_report = await render_pdf(optimize_pdf, pdf_bytes)
     
     # 5. Dynamic Filename: {ShowName} Hours {WeekStart}.pdf
     filename = f"{timesheet_data.show_name.strip()} Hours {week_start_date}.pdf" 
@@ -413,6 +443,8 @@ async def email_weekly_timesheet(
             attachment_blob=pdf_bytes, 
             attachment_filename=filename 
         ) 
+        if optimize_report:
+            return {"message": "Email sent successfully.", "optimization": optimize_report.as_dict()}
         return {"message": "Email sent successfully."} 
     except Exception as e: 
         import traceback 
@@ -1,17 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse
 from typing import List, Optional
 import uuid
 import io
 import os
-import base64
 import requests
 
 from app.models import (
     User, LabelStock, LabelTemplate, LabelTemplateCreate, DynamicLabelPdfPayload
 )
 from app.api import get_supabase_client, get_user, feature_check
-from app.LE_pdf_utils import render_template_to_buffer
+from app.LE_pdf_utils import render_template_to_buffer, iter_label_pdf, label_shards, render_labels_sharded
+from app.services.export_jobs import start_export_job
+from app.services.render_executor import render_executor, render_errors, render_pdf_sync
+from app.services.pdf_optimize import optimize_pdf
+from app.services.logo_cache import logo_cache
 
 from supabase import Client
 
@@ -19,8 +22,11 @@ router = APIRouter(dependencies=[Depends(feature_check("label_engine"))])
 
 LABEL_ENGINE_FEATURE = Depends(feature_check("label_engine"))
 
+# Jobs with at least this many rows are streamed instead of rendered into one buffer.
+LABEL_STREAM_THRESHOLD_ROWS = int(os.environ.get("LABEL_STREAM_THRESHOLD_ROWS", 2000))
+
 # --- Helper: Load Image from Path/URL (Fallback) ---
-def load_image_b64_fallback(path: str) -> Optional[str]:
+def load_image_bytes_fallback(path: str) -> Optional[bytes]:
     if not path:
         return None
     try:
@@ -45,9 +51,7 @@ def load_image_b64_fallback(path: str) -> Optional[str]:
                          with open(public_path, "rb") as f:
                              image_data = f.read()
 
-        if image_data:
-            return base64.b64encode(image_data).decode('utf-8')
-        return None
+        return image_data or None
     except Exception:
         return None
 
@@ -137,6 +141,9 @@ def get_label_engine_status(show_id: int):
 def print_labels(
     show_id: int,
     payload: DynamicLabelPdfPayload,
+    background: bool = False,
+    stream: bool = False,
+    optimize: bool = False,
     user: User = Depends(get_user), # ADDED: Get authenticated user
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -156,7 +163,7 @@ def print_labels(
     data_rows = [row for row in payload.data_rows]
 
     # --- 3. Fetch Show Logo ---
-    show_logo_b64 = None
+    show_logo_bytes = None
     try:
         show_res = supabase.table("shows").select("*").eq("id", str(show_id)).maybe_single().execute()
         logo_path = None
@@ -169,45 +176,59 @@ def print_labels(
         
         if logo_path:
             try:
-                logo_bytes = supabase.storage.from_('logos').download(logo_path)
-                if logo_bytes:
-                    show_logo_b64 = base64.b64encode(logo_bytes).decode('utf-8')
+                show_logo_bytes = logo_cache.download(supabase, logo_path, user.id)
             except Exception:
-                show_logo_b64 = load_image_b64_fallback(logo_path)
+                show_logo_bytes = load_image_bytes_fallback(logo_path)
     except Exception:
         pass
 
     # --- 4. Fetch Company Logo ---
-    company_logo_b64 = None
+    company_logo_bytes = None
     try:
         profile_res = supabase.table("profiles").select("company_logo_path").eq("id", str(user.id)).maybe_single().execute()
         if profile_res.data and profile_res.data.get("company_logo_path"):
             c_logo_path = profile_res.data["company_logo_path"]
             try:
                 # Try downloading from storage first
-                c_logo_bytes = supabase.storage.from_('logos').download(c_logo_path)
-                if c_logo_bytes:
-                    company_logo_b64 = base64.b64encode(c_logo_bytes).decode('utf-8')
+                company_logo_bytes = logo_cache.download(supabase, c_logo_path, user.id)
             except Exception:
                 # Fallback
-                company_logo_b64 = load_image_b64_fallback(c_logo_path)
+                company_logo_bytes = load_image_bytes_fallback(c_logo_path)
     except Exception:
         pass
 
-    # 5. Inject Logos
-    for row in data_rows:
-        if show_logo_b64:
-            row["__SHOW_LOGO__"] = show_logo_b64
-        if company_logo_b64:
-            row["__COMPANY_LOGO__"] = company_logo_b64
+    # 5. Logos are resolved once for the whole job and referenced by key from each label
+    images = {"__SHOW_LOGO__": show_logo_bytes, "__COMPANY_LOGO__": company_logo_bytes}
+
+    # 6. Generate PDF (or queue it as a background export job)
+    if background:
+        job = start_export_job("labels", user.id, "labels.pdf", render_labels_sharded, template, stock, data_rows,
+                               images=images, executor=render_executor, optimize=optimize)
+        return JSONResponse(status_code=202, content=job)
+
+    # Large jobs are rendered in page-aligned shards across the render pool and streamed in order,
+    # so memory stays flat however many labels are printed. Streamed output is never optimized:
+    # that would mean holding the whole document again.
+    if stream or len(data_rows) >= LABEL_STREAM_THRESHOLD_ROWS:
+        return StreamingResponse(iter_label_pdf(template, stock, data_rows, images=images, executor=render_executor),
+                                 media_type="application/pdf", headers={
+            "Content-Disposition": f"attachment; filename=\"labels.pdf\""
+        })
 
-    # 6. Generate PDF
     try:
-        pdf_buffer = render_template_to_buffer(template, stock, data_rows)
+        if len(label_shards(stock, data_rows)) > 1:
+            with render_errors():
+                pdf_bytes = render_labels_sharded(template, stock, data_rows, images=images, executor=render_executor)
+        else:
+            pdf_bytes = render_pdf_sync(render_template_to_buffer, template, stock, data_rows, images=images)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"PDF Generation Error: {repr(e)}")
         raise HTTPException(status_code=500, detail=f"PDF Error: {str(e)}")
 
-    return StreamingResponse(pdf_buffer, media_type="application/pdf", headers={
-        "Content-Disposition": f"attachment; filename=\"labels.pdf\""
-    })
\ No newline at end of file
+    headers = {"Content-Disposition": f"attachment; filename=\"labels.pdf\""}
+    if optimize:
+        pdf_bytes, report = render_pdf_sync(optimize_pdf, pdf_bytes)
+        headers.update(report.headers())
+    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
\ No newline at end of file
@@ -9,7 +9,9 @@ from ..models import (
     PanelEquipmentInstance, PanelEquipmentInstanceCreate, PanelEquipmentInstanceUpdate
 )
 from ..pdf_utils import generate_panel_export_pdf
-from ..utils.panel_utils import get_panel_children_recursive
+from ..services.bom import bom_cache
+from ..services.pdf_optimize import optimize_export
+from ..utils.panel_utils import build_panel_tree, fetch_panel_trees
 
 router = APIRouter(prefix="/api/panels", tags=["Panel Builder"])
 
@@ -98,6 +100,8 @@ async def update_panel_template(template_id: uuid.UUID, template_data: PanelEqui
     res = supabase.table('panel_equipment_templates').update(update_data).eq('id', str(template_id)).eq('user_id', str(user.id)).execute()
     if not res.data:
         raise HTTPException(status_code=404, detail="Template not found or access denied")
+    if {'name', 'manufacturer', 'model_number'} & update_data.keys():
+        bom_cache.clear()
     return res.data[0]
 
 @router.delete("/templates/{template_id}", status_code=204)
@@ -184,6 +188,8 @@ async def admin_update_panel_template(template_id: uuid.UUID, template_data: Pan
     res = admin_client.table('panel_equipment_templates').update(update_data).eq('id', str(template_id)).execute()
     if not res.data:
         raise HTTPException(status_code=404, detail="Template not found")
+    if {'name', 'manufacturer', 'model_number'} & update_data.keys():
+        bom_cache.clear()
     return res.data[0]
 
 @router.delete("/admin/templates/{template_id}", status_code=204, tags=["Admin"])
@@ -204,18 +210,8 @@ async def get_panel_instances(panel_instance_id: uuid.UUID, user = Depends(get_u
     if not all_instances:
         return []
     
-    # 2. Build hierarchy
-    instance_map = {item['id']: {**item, 'children': []} for item in all_instances}
-    top_level = []
-    
-    for item in all_instances:
-        parent_id = item.get('parent_instance_id')
-        if parent_id and str(parent_id) in instance_map:
-            instance_map[str(parent_id)]['children'].append(instance_map[item['id']])
-        else:
-            top_level.append(instance_map[item['id']])
-            
-    return top_level
+    # 2. Build hierarchy (instances whose parent is missing stay visible at the top level)
+    return build_panel_tree(all_instances, orphans_as_roots=True)
 
 @router.post("/instances", response_model=PanelEquipmentInstance)
 async def create_panel_instance(instance_data: PanelEquipmentInstanceCreate, user = Depends(get_user), supabase: Client = Depends(get_supabase_client)):
@@ -223,6 +219,8 @@ async def create_panel_instance(instance_data: PanelEquipmentInstanceCreate, use
     res = supabase.table('panel_equipment_instances').insert(insert_data).execute()
     if not res.data:
         raise HTTPException(status_code=500, detail="Failed to create instance")
+    # Panel instances don't carry their show, so every cached BOM is dropped
+    bom_cache.clear()
     
     # Re-fetch with template
     final_res = supabase.table('panel_equipment_instances').select('*, template:panel_equipment_templates(*)').eq('id', res.data[0]['id']).single().execute()
@@ -234,6 +232,8 @@ async def update_panel_instance(instance_id: uuid.UUID, instance_data: PanelEqui
     res = supabase.table('panel_equipment_instances').update(update_data).eq('id', str(instance_id)).execute()
     if not res.data:
         raise HTTPException(status_code=404, detail="Instance not found or access denied")
+    if {'template_id', 'panel_instance_id'} & update_data.keys():
+        bom_cache.clear()
     
     final_res = supabase.table('panel_equipment_instances').select('*, template:panel_equipment_templates(*)').eq('id', str(instance_id)).single().execute()
     return final_res.data
@@ -242,6 +242,7 @@ async def update_panel_instance(instance_id: uuid.UUID, instance_data: PanelEqui
 async def delete_panel_instance(instance_id: uuid.UUID, user = Depends(get_user), supabase: Client = Depends(get_supabase_client)):
     # Deleting an instance will trigger CASCADE delete for children in the DB
     supabase.table('panel_equipment_instances').delete().eq('id', str(instance_id)).execute()
+    bom_cache.clear()
     return
 
 @router.get("/shows/{show_id}/panel-instances", response_model=List[PanelEquipmentInstance])
@@ -268,6 +269,7 @@ async def get_all_panel_instances_for_show(show_id: int, user = Depends(get_user
 @router.get("/shows/{show_id}/export", tags=["Panel Builder"])
 async def export_panels_for_show(
     show_id: int, 
+    optimize: bool = False,
     user = Depends(get_user), 
     show_branding: bool = Depends(get_branding_visibility),
     supabase: Client = Depends(get_supabase_client)
@@ -293,28 +295,23 @@ async def export_panels_for_show(
     if not panels:
         raise HTTPException(status_code=404, detail="No patch panels found in this show's racks.")
 
-    # 5. For each panel, fetch its mounted components (recursive)
-    export_payload = []
-    
-    for panel in panels:
-        pe_res = supabase.table('panel_equipment_instances').select('*, template:panel_equipment_templates(*)').eq('panel_instance_id', panel['id']).execute()
-        all_pe = pe_res.data or []
-        
-        mounted_top_level = [i for i in all_pe if not i.get('parent_instance_id')]
-        for item in mounted_top_level:
-            item['children'] = get_panel_children_recursive(item['id'], all_pe)
-            
-        export_payload.append({
-            "panel": panel,
-            "mounted_instances": mounted_top_level
-        })
+    # 5. Fetch the mounted components of every panel in one query and nest them
+    panel_trees = fetch_panel_trees(supabase, [panel['id'] for panel in panels])
+    export_payload = [
+        {"panel": panel, "mounted_instances": panel_trees.get(str(panel['id']), [])}
+        for panel in panels
+    ]
 
     # 6. Generate PDF
     pdf_buffer = generate_panel_export_pdf(show_name, export_payload, show_branding)
     
     filename = f"{show_name.replace(' ', '_')}_Panels.pdf"
+    headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+    pdf_bytes = pdf_buffer.getvalue()
+    if optimize:
+        pdf_bytes = await optimize_export(pdf_bytes, headers)
     return Response(
-        content=pdf_buffer.getvalue(),
+        content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
+        headers=headers
     )
\ No newline at end of file
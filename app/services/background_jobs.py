@@ -0,0 +1,61 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+Job = TypeVar("Job")
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+
+class BackgroundJobManager(Generic[Job]):
+    """
+    A bounded worker pool plus the in-memory registry of its jobs.
+
+    Jobs need ``id``, ``user_id``, ``status`` (queued -> running -> done | failed),
+    ``created_at`` and ``finished_at``. Finished jobs are kept ``ttl_seconds`` so
+    their owner can poll the result, then purged.
+    """
+
+    queue_full = JobQueueFull
+    job_label = "background"
+
+    def __init__(self, workers: int, max_pending: int, ttl_seconds: int, thread_name_prefix: str):
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _enqueue(self, job: Job, run: Callable, *args) -> Job:
+        """Registers ``job`` and runs ``run(job, *args)`` on the pool, unless too many jobs are pending."""
+        self.purge_expired()
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status in ("queued", "running"))
+            if pending >= self.max_pending:
+                raise self.queue_full(f"{pending} {self.job_label} jobs are already pending.")
+            self._jobs[job.id] = job
+
+        self._executor.submit(run, job, *args)
+        return job
+
+    def get(self, job_id: str, user_id) -> Optional[Job]:
+        """Returns the job if it exists, has not expired and belongs to ``user_id``."""
+        self.purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if not job or job.user_id != str(user_id):
+            return None
+        return job
+
+    def purge_expired(self) -> None:
+        now = time.time()
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.status in ("done", "failed") and self._expired(j, now)]:
+                del self._jobs[job_id]
+
+    def _expired(self, job: Job, now: float) -> bool:
+        reference = job.finished_at or job.created_at
+        return now - reference > self.ttl_seconds
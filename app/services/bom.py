@@ -0,0 +1,92 @@
+import csv
+import io
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.services.show_cache import ShowCache
+
+# --- Configuration ---
+# Equipment endpoints invalidate a show's BOM directly; the TTL bounds how stale edits made through other workers can get.
+BOM_TTL_SECONDS = int(os.environ.get("BOM_TTL_SECONDS", 300))
+BOM_MAX_SHOWS = int(os.environ.get("BOM_MAX_SHOWS", 256))
+
+BOM_SOURCES = ("rack", "panel")
+SOURCE_LABELS = {"rack": "Rack Equipment", "panel": "Panel Component"}
+
+
+class ShowBom:
+    """
+    Grouped equipment counts for one show as returned by the ``get_show_bom``
+    RPC: one row per rack, source and manufacturer/model, so totals for the
+    whole show or for a subset of its racks are a cheap sum over the rows.
+    """
+
+    def __init__(self, show_id: int, rack_ids: Iterable, items: Iterable[dict]):
+        self.show_id = show_id
+        self.loaded_at = time.time()
+        self.rack_ids: Set[str] = {str(r) for r in rack_ids}
+        self.items = list(items)
+
+    def rows(self, rack_ids: Optional[Iterable] = None, sources: Iterable[str] = BOM_SOURCES) -> List[dict]:
+        """Quantities summed per source and manufacturer/model, ordered like the equipment list."""
+        selected = {str(r) for r in rack_ids} if rack_ids is not None else None
+        sources = set(sources)
+        counts: Dict[tuple, int] = {}
+        for item in self.items:
+            if item["source"] not in sources or (selected is not None and str(item["rack_id"]) not in selected):
+                continue
+            key = (item["source"], item.get("manufacturer") or "N/A", item.get("model_number") or "N/A")
+            counts[key] = counts.get(key, 0) + item["quantity"]
+
+        ordered = sorted(counts.items(), key=lambda kv: (BOM_SOURCES.index(kv[0][0]), kv[0][1], kv[0][2]))
+        return [{"source": source, "manufacturer": manufacturer, "model_number": model, "quantity": qty}
+                for (source, manufacturer, model), qty in ordered]
+
+
+class BomCache(ShowCache[ShowBom]):
+    """Process-wide LRU of show BOMs, each loaded with a single RPC call."""
+
+    def __init__(self, ttl_seconds: int = BOM_TTL_SECONDS, max_shows: int = BOM_MAX_SHOWS):
+        super().__init__(ttl_seconds, max_shows)
+
+    def _load(self, supabase, show_id: int) -> ShowBom:
+        res = supabase.rpc('get_show_bom', {'p_show_id': show_id}).execute()
+        data = res.data or {}
+        return ShowBom(show_id, data.get('rack_ids') or [], data.get('items') or [])
+
+    def rows(self, supabase, show_id: int, rack_ids: Optional[Iterable] = None,
+             sources: Iterable[str] = BOM_SOURCES) -> Optional[List[dict]]:
+        """
+        :meth:`ShowBom.rows` for a show, loading its BOM on first use. With ``rack_ids``,
+        None when the BOM can't account for every rack (see :meth:`get_for_racks`).
+        """
+        if rack_ids is None:
+            return self.get(supabase, show_id).rows(sources=sources)
+        bom = self.get_for_racks(supabase, show_id, rack_ids)
+        return bom.rows(rack_ids, sources) if bom is not None else None
+
+    def clear(self) -> None:
+        """Drops every cached BOM, for changes that can't be traced to one show (template renames, panel edits)."""
+        super().clear()
+
+
+def bom_table(rows: List[dict], with_source: bool = True) -> List[List[str]]:
+    """BOM rows as the header-first string table ``generate_equipment_list_pdf`` expects."""
+    if with_source:
+        table = [["Manufacturer", "Model Name", "Type", "Qty"]]
+        table.extend([r["manufacturer"], r["model_number"], SOURCE_LABELS[r["source"]], str(r["quantity"])] for r in rows)
+    else:
+        table = [["Manufacturer", "Model Name", "Qty"]]
+        table.extend([r["manufacturer"], r["model_number"], str(r["quantity"])] for r in rows)
+    return table
+
+
+def bom_csv(rows: List[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(bom_table(rows))
+    return buffer.getvalue()
+
+
+bom_cache = BomCache()
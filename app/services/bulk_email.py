@@ -0,0 +1,145 @@
+import os
+import time
+import uuid
+import smtplib
+import traceback
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app.services.background_jobs import BackgroundJobManager, JobQueueFull
+
+# --- Configuration ---
+BULK_EMAIL_WORKERS = int(os.environ.get("BULK_EMAIL_WORKERS", 2))
+BULK_EMAIL_MAX_PENDING = int(os.environ.get("BULK_EMAIL_MAX_PENDING", 16))
+BULK_EMAIL_TTL_SECONDS = int(os.environ.get("BULK_EMAIL_TTL_SECONDS", 3600))
+# SMTP sessions a single job keeps open at once; most providers throttle accounts past a handful.
+BULK_EMAIL_CONNECTIONS = int(os.environ.get("BULK_EMAIL_CONNECTIONS", 3))
+# Messages sent over one session before it is closed and the next batch logs in again.
+BULK_EMAIL_BATCH_SIZE = int(os.environ.get("BULK_EMAIL_BATCH_SIZE", 50))
+
+
+class BulkEmailQueueFull(JobQueueFull):
+    """Raised when too many bulk email jobs are already queued or running."""
+
+
+@dataclass
+class BulkEmailResult:
+    recipient_id: Optional[str]
+    email: Optional[str]
+    status: str = "pending"  # pending -> sent | failed, or skipped when there is no address
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkEmailJob:
+    id: str
+    user_id: str
+    results: List[BulkEmailResult]
+    status: str = "queued"  # queued -> running -> done | failed
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+
+class BulkEmailManager(BackgroundJobManager[BulkEmailJob]):
+    """
+    Sends bulk emails in the background and keeps per-recipient results in
+    memory until the job expires.
+
+    A job's messages are split into batches of ``batch_size``. Each batch is
+    sent over one authenticated session from ``connect()``, and at most
+    ``connections`` batches of a job are in flight at once. A session the
+    server drops mid-batch is reopened once before the batch gives up.
+    """
+
+    queue_full = BulkEmailQueueFull
+    job_label = "bulk email"
+
+    def __init__(self, workers: int = BULK_EMAIL_WORKERS, max_pending: int = BULK_EMAIL_MAX_PENDING,
+                 connections: int = BULK_EMAIL_CONNECTIONS, batch_size: int = BULK_EMAIL_BATCH_SIZE):
+        super().__init__(workers, max_pending, BULK_EMAIL_TTL_SECONDS, thread_name_prefix="bulk-email")
+        self.connections = connections
+        self.batch_size = batch_size
+
+    def submit(self, user_id, connect: Callable[[], smtplib.SMTP], recipients: List[dict]) -> BulkEmailJob:
+        """
+        Queues a send. ``recipients`` are dicts with ``recipient_id``, ``email`` and
+        ``message`` (an email Message, or None to record the recipient as skipped).
+        """
+        results, messages = [], []
+        for recipient in recipients:
+            result = BulkEmailResult(recipient_id=recipient.get('recipient_id'), email=recipient.get('email'))
+            if recipient.get('message') is None:
+                result.status, result.error = "skipped", "No email address."
+            else:
+                messages.append((result, recipient['message']))
+            results.append(result)
+
+        job = BulkEmailJob(id=str(uuid.uuid4()), user_id=str(user_id), results=results)
+        return self._enqueue(job, self._run, connect, messages)
+
+    def _run(self, job: BulkEmailJob, connect: Callable[[], smtplib.SMTP], messages: List) -> None:
+        job.status = "running"
+        try:
+            batches = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+            if batches:
+                with ThreadPoolExecutor(max_workers=min(self.connections, len(batches)),
+                                        thread_name_prefix=f"bulk-email-{job.id[:8]}") as pool:
+                    list(pool.map(lambda batch: self._send_batch(connect, batch), batches))
+            job.status = "done" if job.count("sent") or not messages else "failed"
+            if job.status == "failed":
+                job.error = next((r.error for r in job.results if r.status == "failed"), None)
+        except Exception as e:
+            print(f"Bulk email job {job.id} failed: {e}")
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _send_batch(self, connect: Callable[[], smtplib.SMTP], batch: List) -> None:
+        server = None
+        reconnected = False
+        try:
+            for result, message in batch:
+                while True:
+                    if server is None:
+                        server = connect()
+                    try:
+                        server.send_message(message)
+                        result.status = "sent"
+                        break
+                    except smtplib.SMTPServerDisconnected as e:
+                        lost = e
+                    except smtplib.SMTPException as e:
+                        # A refused recipient or message; the session is still usable
+                        result.status, result.error = "failed", str(e)
+                        break
+                    except OSError as e:
+                        # A timeout or broken pipe leaves the session unusable, like a hang-up
+                        lost = e
+                    # The connection is gone: retry this message once on a new session
+                    server.close()
+                    server = None
+                    if reconnected:
+                        raise lost
+                    reconnected = True
+        except Exception as e:
+            # The session could not be (re)opened, so nothing else in the batch can go out
+            print(f"Bulk email batch stopped: {e}")
+            for result, _message in batch:
+                if result.status == "pending":
+                    result.status, result.error = "failed", f"SMTP error: {e}"
+        finally:
+            if server is not None:
+                try:
+                    server.quit()
+                except (smtplib.SMTPException, OSError):
+                    server.close()
+
+
+bulk_emails = BulkEmailManager()
@@ -0,0 +1,95 @@
+import os
+import time
+import uuid
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from fastapi import HTTPException
+from app.services.background_jobs import BackgroundJobManager, JobQueueFull
+from app.services.pdf_optimize import optimize_pdf
+
+# --- Configuration ---
+EXPORT_JOB_WORKERS = int(os.environ.get("EXPORT_JOB_WORKERS", 2))
+EXPORT_JOB_MAX_PENDING = int(os.environ.get("EXPORT_JOB_MAX_PENDING", 32))
+EXPORT_JOB_TTL_SECONDS = int(os.environ.get("EXPORT_JOB_TTL_SECONDS", 3600))
+
+
+class ExportQueueFull(JobQueueFull):
+    """Raised when too many export jobs are already queued or running."""
+
+
+@dataclass
+class ExportJob:
+    id: str
+    kind: str
+    user_id: str
+    filename: str
+    media_type: str = "application/pdf"
+    status: str = "queued"  # queued -> running -> done | failed
+    pages_done: int = 0
+    pages_total: int = 0
+    error: Optional[str] = None
+    optimize: bool = False
+    bytes_saved: Optional[int] = None
+    result: Optional[bytes] = field(default=None, repr=False)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def report_progress(self, done: int, total: int) -> None:
+        self.pages_done, self.pages_total = done, total
+
+
+class ExportJobManager(BackgroundJobManager[ExportJob]):
+    """
+    Runs export generators in a bounded worker pool and keeps their results
+    in memory until they expire.
+
+    Generators are called with an extra ``progress(done, total)`` keyword
+    argument so the status endpoint can report pages done out of total.
+    Jobs submitted with ``optimize=True`` pass their PDF through
+    :func:`optimize_pdf` and report the bytes saved.
+    """
+
+    queue_full = ExportQueueFull
+    job_label = "export"
+
+    def __init__(self, workers: int = EXPORT_JOB_WORKERS, max_pending: int = EXPORT_JOB_MAX_PENDING):
+        super().__init__(workers, max_pending, EXPORT_JOB_TTL_SECONDS, thread_name_prefix="export-job")
+
+    def submit(self, kind: str, user_id, filename: str, fn: Callable, *args, media_type: str = "application/pdf",
+               optimize: bool = False, **kwargs) -> ExportJob:
+        job = ExportJob(id=str(uuid.uuid4()), kind=kind, user_id=str(user_id), filename=filename, media_type=media_type,
+                        optimize=optimize)
+        return self._enqueue(job, self._run, fn, args, kwargs)
+
+    def _run(self, job: ExportJob, fn: Callable, args, kwargs) -> None:
+        job.status = "running"
+        try:
+            result = fn(*args, progress=job.report_progress, **kwargs)
+            if hasattr(result, "getvalue"):
+                result = result.getvalue()
+            if job.optimize:
+                result, report = optimize_pdf(result)
+                job.bytes_saved = report.bytes_saved
+            job.result = result
+            job.pages_done = job.pages_total = max(job.pages_total, job.pages_done)
+            job.status = "done"
+        except Exception as e:
+            print(f"Export job {job.id} ({job.kind}) failed: {e}")
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+
+export_jobs = ExportJobManager()
+
+
+def start_export_job(kind: str, user_id, filename: str, fn: Callable, *args, **kwargs) -> dict:
+    """Queues ``fn`` as a background export and returns the body for a 202 response."""
+    try:
+        job = export_jobs.submit(kind, user_id, filename, fn, *args, **kwargs)
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Export queue is full, try again shortly. ({e})")
+    return {"job_id": job.id, "status": job.status}
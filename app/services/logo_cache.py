@@ -0,0 +1,149 @@
+import io
+import os
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from reportlab.lib.utils import ImageReader
+
+# --- Configuration ---
+LOGO_BUCKET = "logos"
+LOGO_CACHE_MAX_BYTES = int(os.environ.get("LOGO_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+# How long a user's own download vouches for their access to a cached logo; bounds how
+# long a collaborator removed through another worker can keep reading it.
+LOGO_ACCESS_TTL_SECONDS = int(os.environ.get("LOGO_ACCESS_TTL_SECONDS", 300))
+DECODED_IMAGE_CACHE_SIZE = int(os.environ.get("DECODED_IMAGE_CACHE_SIZE", 64))
+
+
+class CachedLogo:
+    """Raw logo bytes plus the encodings derived from them, each computed at most once."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._b64: Optional[str] = None
+        self.readers: Dict[str, float] = {}  # user id -> when their client last downloaded it
+
+    @property
+    def b64(self) -> str:
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.data).decode('utf-8')
+        return self._b64
+
+    @property
+    def image_reader(self) -> ImageReader:
+        return decoded_image(self.data)
+
+
+class LogoCache:
+    """
+    Process-wide LRU of logos from the storage bucket, keyed by storage path and version.
+
+    Uploaded logos get a fresh uuid path, so entries rarely go stale; ``invalidate``
+    bumps the path's version for the cases where a file is replaced in place.
+
+    The bucket's policies decide who may read a logo, so a cached logo is only served
+    to users whose own client downloaded it within ``access_ttl_seconds``. Anyone else
+    downloads it again, and a refused download propagates as on a miss.
+    """
+
+    def __init__(self, max_bytes: int = LOGO_CACHE_MAX_BYTES, access_ttl_seconds: int = LOGO_ACCESS_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.access_ttl_seconds = access_ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, int], CachedLogo]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _key(self, path: str) -> Tuple[str, int]:
+        return (path, self._versions.get(path, 0))
+
+    def get(self, path: str) -> Optional[CachedLogo]:
+        with self._lock:
+            key = self._key(path)
+            logo = self._entries.get(key)
+            if logo is not None:
+                self._entries.move_to_end(key)
+            return logo
+
+    def put(self, path: str, data: bytes) -> CachedLogo:
+        logo = CachedLogo(data)
+        if len(data) > self.max_bytes:
+            return logo
+        with self._lock:
+            key = self._key(path)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.data)
+            self._entries[key] = logo
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.data)
+        return logo
+
+    def fetch(self, supabase, path: str, user_id) -> CachedLogo:
+        """
+        Returns the cached logo if ``user_id`` has recently proven they can read it, and
+        otherwise downloads it with their client. Download errors propagate to the caller.
+        """
+        user_id = str(user_id)
+        logo = self.get(path)
+        if logo is not None:
+            with self._lock:
+                proven_at = logo.readers.get(user_id)
+            if proven_at is not None and time.time() - proven_at <= self.access_ttl_seconds:
+                return logo
+
+        data = supabase.storage.from_(LOGO_BUCKET).download(path)
+        if logo is None or logo.data != data:
+            logo = self.put(path, data)
+        with self._lock:
+            logo.readers[user_id] = time.time()
+        return logo
+
+    def download(self, supabase, path: str, user_id) -> bytes:
+        """Drop-in for ``supabase.storage.from_('logos').download(path)`` on behalf of ``user_id``."""
+        return self.fetch(supabase, path, user_id).data
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == path]
+            for key in stale:
+                self._size -= len(self._entries.pop(key).data)
+            self._versions[path] = self._versions.get(path, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+logo_cache = LogoCache()
+
+
+# --- Decoded images ---
+# Rendering runs in worker processes that only see bytes, so decoded readers are keyed by content.
+_decoded: "OrderedDict[str, ImageReader]" = OrderedDict()
+_decoded_lock = threading.Lock()
+
+
+def decoded_image(data: bytes) -> ImageReader:
+    """Returns a shared ImageReader for ``data`` so repeated draws decode the image only once."""
+    digest = hashlib.sha1(data).hexdigest()
+    with _decoded_lock:
+        reader = _decoded.get(digest)
+        if reader is not None:
+            _decoded.move_to_end(digest)
+            return reader
+    reader = ImageReader(io.BytesIO(data))
+    with _decoded_lock:
+        _decoded[digest] = reader
+        while len(_decoded) > DECODED_IMAGE_CACHE_SIZE:
+            _decoded.popitem(last=False)
+    return reader
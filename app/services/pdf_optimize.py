@@ -0,0 +1,261 @@
+import io
+import os
+import math
+import zlib
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, Optional, Tuple
+
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, ContentStream, DictionaryObject, IndirectObject, NameObject, NumberObject, StreamObject
+
+from app.services.render_executor import render_pdf
+
+# --- Configuration ---
+PDF_OPTIMIZE_IMAGE_DPI = int(os.environ.get("PDF_OPTIMIZE_IMAGE_DPI", 150))
+PDF_OPTIMIZE_JPEG_QUALITY = int(os.environ.get("PDF_OPTIMIZE_JPEG_QUALITY", 85))
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+# Only downsample when it saves a meaningful number of pixels.
+DOWNSAMPLE_THRESHOLD = 1.2
+# Filters the optimizer can decode and re-encode as plain Flate.
+REENCODABLE_FILTERS = {"/FlateDecode", "/ASCII85Decode", "/ASCIIHexDecode", "/LZWDecode", "/RunLengthDecode"}
+IMAGE_MODES = {"/DeviceRGB": ("RGB", 3), "/DeviceGray": ("L", 1)}
+
+
+@dataclass
+class OptimizeReport:
+    """What :func:`optimize_pdf` did to one export."""
+    original_bytes: int
+    optimized_bytes: int
+    streams_recompressed: int = 0
+    images_downsampled: int = 0
+    duplicate_objects_removed: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "bytes_saved": self.bytes_saved}
+
+    def headers(self) -> Dict[str, str]:
+        return {"X-PDF-Original-Bytes": str(self.original_bytes), "X-PDF-Bytes-Saved": str(self.bytes_saved)}
+
+
+def _multiply(m, n):
+    """Concatenates affine matrices: ``m`` applied first, then ``n``."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + b * c2, a * b2 + b * d2, c * a2 + d * c2, c * b2 + d * d2, e * a2 + f * c2 + e2, e * b2 + f * d2 + f2)
+
+
+class _PlacementScanner:
+    """
+    Walks page content (and the form XObjects it draws) tracking the CTM, and
+    records the largest size in points each image is drawn at.
+    """
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+        self.sizes: Dict[int, Tuple[float, float]] = {}
+        self._form_ops: Dict[int, list] = {}
+
+    def scan_page(self, page) -> None:
+        resources = page.get("/Resources")
+        if resources is None or not self._has_xobjects(resources.get_object()):
+            return
+        contents = page.get_contents()
+        if contents is not None:
+            self._scan(contents.operations, resources.get_object(), IDENTITY, depth=0)
+
+    @staticmethod
+    def _has_xobjects(resources) -> bool:
+        return bool(resources.get("/XObject"))
+
+    def _scan(self, operations, resources, ctm, depth: int) -> None:
+        xobjects = resources.get("/XObject")
+        xobjects = xobjects.get_object() if xobjects is not None else {}
+        stack = []
+        for operands, operator in operations:
+            if operator == b"q":
+                stack.append(ctm)
+            elif operator == b"Q":
+                ctm = stack.pop() if stack else IDENTITY
+            elif operator == b"cm":
+                ctm = _multiply(tuple(float(v) for v in operands), ctm)
+            elif operator == b"Do" and operands[0] in xobjects:
+                ref = xobjects.raw_get(operands[0])
+                xobj = ref.get_object()
+                subtype = xobj.get("/Subtype")
+                if subtype == "/Image" and hasattr(ref, "idnum"):
+                    # Images occupy the unit square, so the CTM's column lengths are the drawn size.
+                    width, height = math.hypot(ctm[0], ctm[1]), math.hypot(ctm[2], ctm[3])
+                    prev_w, prev_h = self.sizes.get(ref.idnum, (0.0, 0.0))
+                    self.sizes[ref.idnum] = (max(prev_w, width), max(prev_h, height))
+                elif subtype == "/Form" and depth < 8 and hasattr(ref, "idnum"):
+                    form_resources = xobj.get("/Resources")
+                    form_resources = form_resources.get_object() if form_resources is not None else resources
+                    if not self._has_xobjects(form_resources):
+                        continue
+                    if ref.idnum not in self._form_ops:
+                        self._form_ops[ref.idnum] = ContentStream(xobj, self.pdf).operations
+                    matrix = tuple(float(v) for v in xobj.get("/Matrix", IDENTITY))
+                    self._scan(self._form_ops[ref.idnum], form_resources, _multiply(matrix, ctm), depth + 1)
+
+
+def _filters(stream) -> list:
+    filters = stream.get("/Filter")
+    if filters is None:
+        return []
+    filters = filters.get_object()
+    return list(filters) if isinstance(filters, ArrayObject) else [filters]
+
+
+def _encoded_data(stream: StreamObject) -> bytes:
+    """The stream's bytes as stored in the file (the subclasses' ``get_data`` decodes them)."""
+    return StreamObject.get_data(stream)
+
+
+def _set_stream(stream: StreamObject, data: bytes, filter_name: str) -> None:
+    """Replaces a stream's encoded bytes and filter."""
+    for key in ("/Filter", "/DecodeParms"):
+        if key in stream:
+            del stream[key]
+    stream[NameObject("/Filter")] = NameObject(filter_name)
+    # The base set_data stores the bytes as given; EncodedStreamObject's would re-encode them
+    StreamObject.set_data(stream, data)
+    stream.decoded_self = None
+
+
+def _indirect_objects(writer: PdfWriter) -> Iterator:
+    """Yields every indirect object reachable from the document catalog, once each."""
+    seen = set()
+    pending = [writer.root_object]
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, IndirectObject):
+            if obj.idnum in seen:
+                continue
+            seen.add(obj.idnum)
+            obj = obj.get_object()
+            yield obj
+        if isinstance(obj, DictionaryObject):
+            pending.extend(obj.raw_get(key) for key in obj)
+        elif isinstance(obj, ArrayObject):
+            pending.extend(obj)
+
+
+def _recompress(stream: StreamObject) -> bool:
+    """Re-encodes a stream as level 9 Flate, dropping ASCII wrappers. Returns whether it got smaller."""
+    filters = _filters(stream)
+    if any(f not in REENCODABLE_FILTERS for f in filters) or stream.get("/DecodeParms") is not None:
+        return False
+    encoded = zlib.compress(stream.get_data(), 9)
+    if len(encoded) >= len(_encoded_data(stream)):
+        return False
+    _set_stream(stream, encoded, "/FlateDecode")
+    return True
+
+
+def _decode_image(xobj) -> Optional[Image.Image]:
+    """Decodes the 8-bit RGB/gray and JPEG images ReportLab and cairo embed; anything else is left alone."""
+    if xobj.get("/BitsPerComponent") != 8 or xobj.get("/ImageMask") or xobj.get("/Decode") is not None:
+        return None
+    filters = _filters(xobj)
+    if filters and filters[-1] == "/DCTDecode":
+        if any(f != "/DCTDecode" for f in filters[:-1]):
+            return None
+        img = Image.open(io.BytesIO(xobj.get_data()))
+        return img if img.mode in ("RGB", "L") else None
+    colorspace = xobj.get("/ColorSpace")
+    colorspace = colorspace.get_object() if colorspace is not None else None
+    if colorspace not in IMAGE_MODES or any(f not in REENCODABLE_FILTERS for f in filters) or xobj.get("/DecodeParms") is not None:
+        return None
+    mode, channels = IMAGE_MODES[colorspace]
+    size = (int(xobj["/Width"]), int(xobj["/Height"]))
+    data = xobj.get_data()
+    if len(data) != size[0] * size[1] * channels:
+        return None
+    return Image.frombytes(mode, size, data)
+
+
+def _write_image(xobj: StreamObject, img: Image.Image, as_jpeg: bool) -> None:
+    xobj[NameObject("/Width")] = NumberObject(img.width)
+    xobj[NameObject("/Height")] = NumberObject(img.height)
+    xobj[NameObject("/ColorSpace")] = NameObject("/DeviceRGB" if img.mode == "RGB" else "/DeviceGray")
+    if as_jpeg:
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=PDF_OPTIMIZE_JPEG_QUALITY, optimize=True)
+        _set_stream(xobj, buf.getvalue(), "/DCTDecode")
+    else:
+        _set_stream(xobj, zlib.compress(img.tobytes(), 9), "/FlateDecode")
+
+
+def _downsample(xobj: StreamObject, placed: Tuple[float, float], dpi: int) -> bool:
+    """Resamples an image (and its soft mask) to ``dpi`` at the largest size it is drawn. Returns whether it changed."""
+    width, height = int(xobj["/Width"]), int(xobj["/Height"])
+    target_w = max(1, math.ceil(placed[0] / 72 * dpi))
+    target_h = max(1, math.ceil(placed[1] / 72 * dpi))
+    if width * height < target_w * target_h * DOWNSAMPLE_THRESHOLD ** 2 or target_w > width or target_h > height:
+        return False
+
+    img = _decode_image(xobj)
+    smask = xobj.get("/SMask")
+    smask = smask.get_object() if smask is not None else None
+    mask_img = _decode_image(smask) if smask is not None else None
+    if img is None or (smask is not None and (mask_img is None or mask_img.mode != "L")):
+        return False
+
+    as_jpeg = _filters(xobj)[-1:] == ["/DCTDecode"]
+    _write_image(xobj, img.resize((target_w, target_h), Image.LANCZOS), as_jpeg)
+    if mask_img is not None:
+        _write_image(smask, mask_img.resize((target_w, target_h), Image.LANCZOS), as_jpeg=False)
+    return True
+
+
+def optimize_pdf(pdf_bytes: bytes, image_dpi: int = PDF_OPTIMIZE_IMAGE_DPI) -> Tuple[bytes, OptimizeReport]:
+    """
+    Shrinks a finished export: downsamples raster images to ``image_dpi`` at the
+    size they are drawn, re-encodes uncompressed and ASCII-wrapped streams as
+    level 9 Flate, and merges identical objects (fonts, forms and logos repeated
+    across merged sections).
+
+    Embedded TrueType fonts are already subset by ReportLab and cairo, so they
+    pass through as-is. Returns the optimized bytes and a report; if the result
+    would not be smaller, the original bytes are returned unchanged.
+    """
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    writer = PdfWriter(clone_from=reader)
+    report = OptimizeReport(original_bytes=len(pdf_bytes), optimized_bytes=len(pdf_bytes))
+
+    scanner = _PlacementScanner(writer)
+    for page in writer.pages:
+        scanner.scan_page(page)
+    for idnum, placed in scanner.sizes.items():
+        xobj = writer.get_object(idnum)
+        if isinstance(xobj, StreamObject) and _downsample(xobj, placed, image_dpi):
+            report.images_downsampled += 1
+
+    objects_before = sum(1 for _ in _indirect_objects(writer))
+    writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+    report.duplicate_objects_removed = objects_before - sum(1 for _ in _indirect_objects(writer))
+
+    for obj in _indirect_objects(writer):
+        if isinstance(obj, StreamObject) and _recompress(obj):
+            report.streams_recompressed += 1
+
+    out = io.BytesIO()
+    writer.write(out)
+    optimized = out.getvalue()
+    if len(optimized) >= len(pdf_bytes):
+        return pdf_bytes, OptimizeReport(original_bytes=len(pdf_bytes), optimized_bytes=len(pdf_bytes))
+    report.optimized_bytes = len(optimized)
+    return optimized, report
+
+
+async def optimize_export(pdf_bytes: bytes, headers: Dict[str, str]) -> bytes:
+    """Runs :func:`optimize_pdf` on the render pool for an inline export and adds its report to the response ``headers``."""
+    optimized, report = await render_pdf(optimize_pdf, pdf_bytes)
+    headers.update(report.headers())
+    return optimized
@@ -0,0 +1,181 @@
+import io
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+
+PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+# Per-document bookkeeping objects that are replaced by the combined catalog and page tree.
+SKIPPED_TYPES = {"/Catalog", "/Pages", "/Outlines", "/ObjStm", "/XRef"}
+
+CATALOG_ID = 1
+PAGES_ID = 2
+
+
+class _Remap:
+    def __init__(self, ids: Dict[int, int]):
+        self.ids = ids
+
+    def write(self, obj, out: io.BytesIO) -> None:
+        if isinstance(obj, IndirectObject):
+            new_id = self.ids.get(obj.idnum)
+            out.write(f"{new_id} 0 R".encode() if new_id else b"null")
+        elif isinstance(obj, DictionaryObject):
+            out.write(b"<<")
+            for key, value in obj.items():
+                if isinstance(obj, StreamObject) and key == "/Length":
+                    continue
+                out.write(b"\n")
+                NameObject(key).write_to_stream(out)
+                out.write(b" ")
+                self.write(value, out)
+            if isinstance(obj, StreamObject):
+                data = obj._data
+                out.write(f"\n/Length {len(data)}\n>>\nstream\n".encode())
+                out.write(data)
+                out.write(b"\nendstream")
+            else:
+                out.write(b"\n>>")
+        elif isinstance(obj, ArrayObject):
+            out.write(b"[")
+            for i, item in enumerate(obj):
+                if i:
+                    out.write(b" ")
+                self.write(item, out)
+            out.write(b"]")
+        else:
+            obj.write_to_stream(out)
+
+
+def concat_pdf_stream(documents: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Concatenates whole PDF documents into one, yielding output as each input is consumed.
+
+    Only one input document is held in memory at a time; what is kept across
+    documents is the object offset table, the list of page references and the
+    digests of shared streams, so memory stays flat however many documents
+    (pages) are streamed.
+    Inputs are expected to be simple documents such as ReportLab output:
+    pages with their resources, no outlines, forms fields or named destinations.
+    """
+    offsets: Dict[int, int] = {}
+    page_ids: List[int] = []
+    # Self-contained streams (embedded images, font files) repeated across documents are written once.
+    written_streams: Dict[bytes, int] = {}
+    next_id = PAGES_ID + 1
+    position = 0
+
+    def emit(chunk: bytes) -> bytes:
+        nonlocal position
+        position += len(chunk)
+        return chunk
+
+    yield emit(PDF_HEADER)
+
+    for document in documents:
+        reader = PdfReader(io.BytesIO(document))
+        info = reader.trailer.get("/Info")
+        info_id = info.idnum if isinstance(info, IndirectObject) else None
+
+        objects = {}
+        for idnum in range(1, int(reader.trailer["/Size"])):
+            if idnum == info_id:
+                continue
+            try:
+                obj = reader.get_object(idnum)
+            except Exception:
+                continue
+            if obj is None:
+                continue
+            if isinstance(obj, DictionaryObject) and obj.get("/Type") in SKIPPED_TYPES:
+                continue
+            objects[idnum] = obj
+
+        ids = {}
+        shared = set()
+        for idnum, obj in objects.items():
+            digest = _shared_digest(obj)
+            if digest is not None and digest in written_streams:
+                ids[idnum] = written_streams[digest]
+                shared.add(idnum)
+                continue
+            ids[idnum] = next_id
+            if digest is not None:
+                written_streams[digest] = next_id
+            next_id += 1
+        remap = _Remap(ids)
+
+        page_refs = {page.indirect_reference.idnum for page in reader.pages}
+        page_ids.extend(ids[page.indirect_reference.idnum] for page in reader.pages)
+
+        for idnum, obj in objects.items():
+            if idnum in shared:
+                continue
+            out = io.BytesIO()
+            new_id = ids[idnum]
+            out.write(f"{new_id} 0 obj\n".encode())
+            if idnum in page_refs:
+                _write_page(obj, out, remap)
+            else:
+                remap.write(obj, out)
+            out.write(b"\nendobj\n")
+            offsets[new_id] = position
+            yield emit(out.getvalue())
+        # Parsed objects refer back to their reader; drop them before the next document is produced.
+        objects.clear()
+        reader.resolved_objects.clear()
+        del reader, objects, remap
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    offsets[PAGES_ID] = position
+    yield emit(f"{PAGES_ID} 0 obj\n<< /Type /Pages /Count {len(page_ids)} /Kids [{kids}] >>\nendobj\n".encode())
+    offsets[CATALOG_ID] = position
+    yield emit(f"{CATALOG_ID} 0 obj\n<< /Type /Catalog /Pages {PAGES_ID} 0 R >>\nendobj\n".encode())
+
+    xref_position = position
+    xref = [f"xref\n0 {next_id}\n", "0000000000 65535 f \n"]
+    for object_id in range(1, next_id):
+        xref.append(f"{offsets.get(object_id, 0):010d} 00000 n \n")
+    xref.append(f"trailer\n<< /Size {next_id} /Root {CATALOG_ID} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n")
+    yield emit("".join(xref).encode())
+
+
+def _shared_digest(obj) -> Optional[bytes]:
+    """Content digest for streams that reference no other objects, so identical copies can be shared."""
+    if not isinstance(obj, StreamObject):
+        return None
+    if not any(key in obj for key in ("/Type", "/Subtype", "/Length1")):
+        # Page content streams are unique to their page; hashing them would only cost time.
+        return None
+    if _has_reference(obj.values()):
+        return None
+    header = io.BytesIO()
+    _Remap({}).write(DictionaryObject({k: v for k, v in obj.items() if k != "/Length"}), header)
+    return hashlib.sha1(header.getvalue() + b"\0" + obj._data).digest()
+
+
+def _has_reference(values) -> bool:
+    """True if any value, including those nested in dictionaries and arrays, points at another object."""
+    for value in values:
+        if isinstance(value, IndirectObject):
+            return True
+        if isinstance(value, DictionaryObject) and _has_reference(value.values()):
+            return True
+        if isinstance(value, ArrayObject) and _has_reference(value):
+            return True
+    return False
+
+
+def _write_page(page: DictionaryObject, out: io.BytesIO, remap: _Remap) -> None:
+    """Writes a page dictionary re-parented onto the combined page tree."""
+    out.write(b"<<")
+    for key, value in page.items():
+        out.write(b"\n")
+        NameObject(key).write_to_stream(out)
+        out.write(b" ")
+        if key == "/Parent":
+            out.write(f"{PAGES_ID} 0 R".encode())
+        else:
+            remap.write(value, out)
+    out.write(b"\n>>")
@@ -0,0 +1,191 @@
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from app.services.show_cache import ShowCache
+
+# --- Configuration ---
+POWER_FACTOR = 0.7
+UPS_CAPACITY_VA = 1500
+# Budgets are patched in place by this process; edits made through other workers show up once the entry expires.
+POWER_BUDGET_TTL_SECONDS = int(os.environ.get("POWER_BUDGET_TTL_SECONDS", 300))
+POWER_BUDGET_MAX_SHOWS = int(os.environ.get("POWER_BUDGET_MAX_SHOWS", 256))
+POWER_BUDGET_PAGE_SIZE = int(os.environ.get("POWER_BUDGET_PAGE_SIZE", 1000))
+
+UNRACKED_RACK_NAME = "[Unracked]"
+
+
+def power_summary(rack_watts: Iterable[Tuple[Optional[str], str, int]], voltage: int) -> dict:
+    """
+    Turns ``(rack_id, rack_name, watts)`` rows into the per-rack and show totals
+    shown in the UI and the power report: watts, amps at ``voltage``, VA at
+    POWER_FACTOR and the number of UPS_CAPACITY_VA units the show needs.
+    """
+    racks = []
+    total_watts = 0
+    for rack_id, rack_name, watts in rack_watts:
+        racks.append({"rack_id": rack_id, "rack_name": rack_name, "watts": watts,
+                      "amps": watts / voltage, "va": watts / POWER_FACTOR})
+        total_watts += watts
+
+    total_va = total_watts / POWER_FACTOR
+    return {
+        "voltage": voltage,
+        "power_factor": POWER_FACTOR,
+        "ups_capacity_va": UPS_CAPACITY_VA,
+        "total_watts": total_watts,
+        "total_amps": total_watts / voltage,
+        "total_va": total_va,
+        "suggested_ups": int(total_va / UPS_CAPACITY_VA) + (1 if total_va % UPS_CAPACITY_VA > 0 else 0),
+        "racks": racks,
+    }
+
+
+class ShowPowerBudget:
+    """
+    Running watt totals for the racks of one show.
+
+    Every equipment instance is tracked with its rack, template and parent, so an
+    add, a removal (including the modules that cascade with it) or a template
+    wattage change adjusts the affected rack totals without re-reading the show.
+    """
+
+    def __init__(self, show_id: int, racks: Dict[str, str]):
+        self.show_id = show_id
+        self.loaded_at = time.time()
+        self.rack_names: Dict[str, str] = dict(racks)
+        self.rack_watts: Dict[str, int] = {rack_id: 0 for rack_id in racks}
+        self.template_watts: Dict[str, int] = {}
+        self._instances: Dict[str, Tuple[str, Optional[str]]] = {}  # instance id -> (rack id, template id)
+        self._children: Dict[str, Set[str]] = defaultdict(set)
+        self._parents: Dict[str, str] = {}
+
+    def add(self, instance_id, rack_id, template_id=None, watts: Optional[int] = None, parent_id=None) -> None:
+        instance_id, rack_id = str(instance_id), str(rack_id)
+        if rack_id not in self.rack_watts or instance_id in self._instances:
+            return
+        template_id = str(template_id) if template_id else None
+        if template_id in self.template_watts:
+            self.set_template_watts(template_id, watts)
+        elif template_id is not None:
+            self.template_watts[template_id] = watts or 0
+        self._instances[instance_id] = (rack_id, template_id)
+        self.rack_watts[rack_id] += self._watts(template_id)
+        if parent_id:
+            self._parents[instance_id] = str(parent_id)
+            self._children[str(parent_id)].add(instance_id)
+
+    def remove(self, instance_id) -> None:
+        """Removes an instance and its nested modules, which the database deletes with it."""
+        pending = [str(instance_id)]
+        while pending:
+            current = pending.pop()
+            pending.extend(self._children.pop(current, ()))
+            entry = self._instances.pop(current, None)
+            if entry is not None:
+                rack_id, template_id = entry
+                self.rack_watts[rack_id] -= self._watts(template_id)
+            parent = self._parents.pop(current, None)
+            if parent is not None and parent in self._children:
+                self._children[parent].discard(current)
+
+    def set_template_watts(self, template_id, watts: Optional[int]) -> None:
+        template_id = str(template_id)
+        if template_id not in self.template_watts:
+            return
+        delta = (watts or 0) - self.template_watts[template_id]
+        self.template_watts[template_id] = watts or 0
+        if delta:
+            for rack_id, instance_template in self._instances.values():
+                if instance_template == template_id:
+                    self.rack_watts[rack_id] += delta
+
+    def contains(self, instance_id) -> bool:
+        return str(instance_id) in self._instances
+
+    @property
+    def rack_ids(self) -> Iterable[str]:
+        return self.rack_names.keys()
+
+    def _watts(self, template_id: Optional[str]) -> int:
+        return self.template_watts.get(template_id, 0) if template_id else 0
+
+    def summary(self, voltage: int, rack_ids: Optional[Iterable] = None) -> dict:
+        """Totals for every rack ordered by name, or for ``rack_ids`` in the order given."""
+        if rack_ids is None:
+            selected = sorted(self.rack_watts, key=lambda r: self.rack_names[r])
+        else:
+            selected = [str(r) for r in rack_ids if str(r) in self.rack_watts]
+        return {"show_id": self.show_id, **power_summary(((r, self.rack_names[r], self.rack_watts[r]) for r in selected), voltage)}
+
+
+class PowerBudgets(ShowCache[ShowPowerBudget]):
+    """
+    Process-wide LRU of show power budgets. A show is read once (its racks, then
+    its instances a page at a time) the first time it is asked for; after that the
+    equipment endpoints keep it current.
+    """
+
+    def __init__(self, ttl_seconds: int = POWER_BUDGET_TTL_SECONDS, max_shows: int = POWER_BUDGET_MAX_SHOWS):
+        super().__init__(ttl_seconds, max_shows)
+
+    def summary(self, supabase, show_id: int, voltage: int, rack_ids: Optional[Iterable] = None) -> Optional[dict]:
+        """
+        :meth:`ShowPowerBudget.summary` for a show, loading its budget on first use.
+        With ``rack_ids``, None when the budget can't account for every rack (see :meth:`get_for_racks`).
+        """
+        if rack_ids is None:
+            budget = self.get(supabase, show_id)
+        else:
+            rack_ids = list(rack_ids)
+            budget = self.get_for_racks(supabase, show_id, rack_ids)
+            if budget is None:
+                return None
+        with self._lock:
+            return budget.summary(voltage, rack_ids)
+
+    def _load(self, supabase, show_id: int) -> ShowPowerBudget:
+        racks_res = supabase.table('racks').select('id, rack_name').eq('show_id', show_id).execute()
+        racks = {str(r['id']): r['rack_name'] for r in racks_res.data or [] if r['rack_name'] != UNRACKED_RACK_NAME}
+        budget = ShowPowerBudget(show_id, racks)
+        last_id = None
+        while racks:
+            # Keyset pages on id, read until one comes back empty, so the server's row cap can't cut the show short
+            query = supabase.table('rack_equipment_instances') \
+                .select('id, rack_id, template_id, parent_equipment_instance_id, equipment_templates(power_consumption_watts)') \
+                .in_('rack_id', list(racks))
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = query.order('id').limit(POWER_BUDGET_PAGE_SIZE).execute().data or []
+            if not page:
+                break
+            for item in page:
+                template = item.get('equipment_templates') or {}
+                budget.add(item['id'], item['rack_id'], item.get('template_id'), template.get('power_consumption_watts'),
+                           item.get('parent_equipment_instance_id'))
+            last_id = page[-1]['id']
+        return budget
+
+    # --- Change hooks called by the equipment and rack endpoints ---
+
+    def equipment_added(self, rack_id, instance_id, template_id, watts: Optional[int], parent_id=None) -> None:
+        with self._lock:
+            show_id = self._rack_shows.get(str(rack_id))
+            if show_id is not None:
+                self._entries[show_id].add(instance_id, rack_id, template_id, watts, parent_id)
+
+    def equipment_removed(self, instance_id) -> None:
+        with self._lock:
+            for budget in self._entries.values():
+                if budget.contains(instance_id):
+                    budget.remove(instance_id)
+                    return
+
+    def template_updated(self, template_id, watts: Optional[int]) -> None:
+        with self._lock:
+            for budget in self._entries.values():
+                budget.set_template_watts(template_id, watts)
+
+
+power_budgets = PowerBudgets()
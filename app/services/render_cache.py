@@ -0,0 +1,135 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Any
+
+# --- Configuration ---
+# In-memory budget for cached exports. Entries evicted from memory are written to
+# RENDER_CACHE_DIR when it is set, and served from there until the disk budget runs out.
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RENDER_CACHE_DIR = os.environ.get("RENDER_CACHE_DIR")
+RENDER_CACHE_MAX_DISK_BYTES = int(os.environ.get("RENDER_CACHE_MAX_DISK_BYTES", 512 * 1024 * 1024))
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Returns a SHA-256 over the canonical JSON form of ``parts``.
+    Pydantic models are dumped in JSON mode so equal content always hashes equally.
+    """
+    normalized = [p.model_dump(mode="json") if hasattr(p, "model_dump") else p for p in parts]
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Size-bounded LRU of finished export bytes keyed by content hash,
+    with an optional spill directory for entries evicted from memory.
+    """
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES, spill_dir: Optional[str] = RENDER_CACHE_DIR,
+                 max_disk_bytes: int = RENDER_CACHE_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+
+        data = self._read_spilled(key)
+        if data is not None:
+            self.put(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            self._spill(key, data)
+            return
+
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                old_key, old_data = self._entries.popitem(last=False)
+                self._size -= len(old_data)
+                evicted.append((old_key, old_data))
+
+        for old_key, old_data in evicted:
+            self._spill(old_key, old_data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Disk spill ---
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.bin")
+
+    def _spill(self, key: str, data: bytes) -> None:
+        if not self.spill_dir or len(data) > self.max_disk_bytes:
+            return
+        try:
+            tmp_path = self._spill_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._spill_path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Render cache spill failed: {e}")
+
+    def _read_spilled(self, key: str) -> Optional[bytes]:
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _prune_disk(self) -> None:
+        files = []
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.spill_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+# Shared cache for rendered wire diagram PDFs.
+wire_pdf_cache = RenderCache()
@@ -0,0 +1,201 @@
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+# --- Configuration ---
+# RENDER_POOL_WORKERS=0 renders in the request's thread instead of a worker process.
+RENDER_POOL_WORKERS = int(os.environ.get("RENDER_POOL_WORKERS", os.cpu_count() or 2))
+RENDER_POOL_MAX_QUEUE = int(os.environ.get("RENDER_POOL_MAX_QUEUE", max(RENDER_POOL_WORKERS, 1) * 4))
+RENDER_JOB_TIMEOUT_SECONDS = float(os.environ.get("RENDER_JOB_TIMEOUT_SECONDS", 120))
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render pool already has RENDER_POOL_MAX_QUEUE jobs in flight."""
+
+
+def _render_to_bytes(fn: Callable, args, kwargs) -> bytes:
+    """Runs in the worker process. Buffers are converted to bytes before crossing back."""
+    result = fn(*args, **kwargs)
+    if hasattr(result, "getvalue"):
+        result = result.getvalue()
+    return result
+
+
+class RenderExecutor:
+    """
+    Process pool shared by the PDF endpoints.
+
+    Submissions beyond ``max_queue`` in-flight jobs are rejected instead of
+    piling up. A job that exceeds its timeout is reported to the caller, but
+    keeps its slot until the worker actually finishes, so the bound stays honest.
+    """
+
+    def __init__(self, workers: int = RENDER_POOL_WORKERS, max_queue: int = RENDER_POOL_MAX_QUEUE,
+                 timeout: float = RENDER_JOB_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "rejected": 0}
+        self._render_seconds = 0.0
+        self._max_render_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # "spawn" keeps workers independent of the server's threads and open sockets.
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queues ``fn(*args, **kwargs)`` and returns a future resolving to the rendered bytes."""
+        with self._lock:
+            if self._in_flight >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise RenderQueueFull(f"{self._in_flight} render jobs are already in flight.")
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+            try:
+                try:
+                    future = self._get_pool().submit(_render_to_bytes, fn, args, kwargs)
+                except BrokenProcessPool:
+                    # A worker died (e.g. OOM); start a fresh pool for this and later jobs.
+                    self._pool = None
+                    future = self._get_pool().submit(_render_to_bytes, fn, args, kwargs)
+            except Exception:
+                self._in_flight -= 1
+                raise
+
+        started = time.perf_counter()
+        future.add_done_callback(lambda f: self._record(f, time.perf_counter() - started))
+        return future
+
+    def _record(self, future: Future, elapsed: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+            self._render_seconds += elapsed
+            self._max_render_seconds = max(self._max_render_seconds, elapsed)
+
+    def _timed_out(self) -> None:
+        with self._lock:
+            self._stats["timed_out"] += 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> bytes:
+        """Renders on the pool without blocking the event loop."""
+        if self.workers <= 0:
+            return await run_in_threadpool(_render_to_bytes, fn, args, kwargs)
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self._timed_out()
+            raise
+
+    def run_sync(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> bytes:
+        """Blocking variant for sync (threadpool) endpoints."""
+        if self.workers <= 0:
+            return _render_to_bytes(fn, args, kwargs)
+        return self._result(self.submit(fn, *args, **kwargs), timeout)
+
+    def map_ordered(self, fn: Callable, calls: Iterable[Tuple[tuple, Dict]], timeout: Optional[float] = None) -> Iterator[bytes]:
+        """
+        Renders ``fn(*args, **kwargs)`` for each ``(args, kwargs)`` in ``calls`` and yields
+        the results in call order, keeping at most one job per worker in flight.
+
+        Used for sharded jobs: later shards render while earlier ones are consumed. When the
+        shared queue is full the oldest of our own shards is awaited first; only a job that
+        cannot get a single slot is rejected.
+        """
+        if self.workers <= 0:
+            for args, kwargs in calls:
+                yield _render_to_bytes(fn, args, kwargs)
+            return
+        window = max(1, min(self.workers, self.max_queue))
+        pending: "deque[Future]" = deque()
+        try:
+            for args, kwargs in calls:
+                while True:
+                    try:
+                        pending.append(self.submit(fn, *args, **kwargs))
+                        break
+                    except RenderQueueFull:
+                        if not pending:
+                            raise
+                        yield self._result(pending.popleft(), timeout)
+                if len(pending) >= window:
+                    yield self._result(pending.popleft(), timeout)
+            while pending:
+                yield self._result(pending.popleft(), timeout)
+        finally:
+            # The consumer stopped early (client disconnect or a failed shard); drop queued shards.
+            for future in pending:
+                future.cancel()
+
+    def _result(self, future: Future, timeout: Optional[float]) -> bytes:
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            self._timed_out()
+            raise
+
+    def metrics(self) -> dict:
+        with self._lock:
+            finished = self._stats["completed"] + self._stats["failed"]
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "in_flight": self._in_flight,
+                **self._stats,
+                "avg_render_seconds": round(self._render_seconds / finished, 4) if finished else 0.0,
+                "max_render_seconds": round(self._max_render_seconds, 4),
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+render_executor = RenderExecutor()
+
+
+async def render_pdf(fn: Callable, *args, **kwargs) -> bytes:
+    """Renders ``fn`` on the shared pool, mapping a full queue to 503 and a timeout to 504."""
+    try:
+        return await render_executor.run(fn, *args, **kwargs)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"PDF renderer is busy, try again shortly. ({e})")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="PDF rendering timed out.")
+
+
+@contextmanager
+def render_errors():
+    """Maps pool errors from blocking render calls to 503 (queue full) and 504 (timeout)."""
+    try:
+        yield
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"PDF renderer is busy, try again shortly. ({e})")
+    except FutureTimeoutError:
+        raise HTTPException(status_code=504, detail="PDF rendering timed out.")
+
+
+def render_pdf_sync(fn: Callable, *args, **kwargs) -> bytes:
+    """Same as :func:`render_pdf` for endpoints that run in the threadpool."""
+    with render_errors():
+        return render_executor.run_sync(fn, *args, **kwargs)
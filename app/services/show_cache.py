@@ -0,0 +1,84 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Generic, Iterable, Optional, TypeVar
+
+Entry = TypeVar("Entry")
+
+
+class ShowCache(Generic[Entry]):
+    """
+    Process-wide LRU of one entry per show, expiring ``ttl_seconds`` after it was loaded.
+
+    Subclasses implement :meth:`_load`. Entries need a ``loaded_at`` timestamp and a
+    ``rack_ids`` collection; the rack ids index the entry so a rack change can drop
+    its show. Loads run outside the lock, so a slow read never blocks other shows.
+    """
+
+    def __init__(self, ttl_seconds: int, max_shows: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_shows = max_shows
+        self._entries: "OrderedDict[int, Entry]" = OrderedDict()
+        self._rack_shows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, supabase, show_id: int) -> Entry:
+        raise NotImplementedError
+
+    def get(self, supabase, show_id: int) -> Entry:
+        entry = self._fresh(show_id)
+        if entry is None:
+            entry = self._load(supabase, show_id)
+            self._store(show_id, entry)
+        return entry
+
+    def get_for_racks(self, supabase, show_id: int, rack_ids: Iterable) -> Optional[Entry]:
+        """
+        The show's entry if it knows every one of ``rack_ids``. An entry missing a rack
+        (created through another worker) is reloaded once; None if it is still missing.
+        """
+        wanted = {str(r) for r in rack_ids}
+        entry = self.get(supabase, show_id)
+        if not wanted <= set(entry.rack_ids):
+            self.invalidate(show_id=show_id)
+            entry = self.get(supabase, show_id)
+            if not wanted <= set(entry.rack_ids):
+                return None
+        return entry
+
+    def invalidate(self, show_id: Optional[int] = None, rack_id=None) -> None:
+        """Drops one show's entry, by show or by one of its racks."""
+        with self._lock:
+            if rack_id is not None:
+                show_id = self._rack_shows.get(str(rack_id))
+            if show_id is not None:
+                self._drop(show_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rack_shows.clear()
+
+    def _fresh(self, show_id: int) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(show_id)
+            if entry is None or time.time() - entry.loaded_at > self.ttl_seconds:
+                return None
+            self._entries.move_to_end(show_id)
+            return entry
+
+    def _store(self, show_id: int, entry: Entry) -> None:
+        with self._lock:
+            self._drop(show_id)
+            self._entries[show_id] = entry
+            for rack_id in entry.rack_ids:
+                self._rack_shows[str(rack_id)] = show_id
+            while len(self._entries) > self.max_shows:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, show_id: int) -> None:
+        entry = self._entries.pop(show_id, None)
+        if entry is not None:
+            for rack_id in entry.rack_ids:
+                if self._rack_shows.get(str(rack_id)) == show_id:
+                    del self._rack_shows[str(rack_id)]
@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Optional, Set
+
+from app.services.show_cache import ShowCache
+
+# --- Configuration ---
+# update_show and remove_collaborator invalidate entries directly; the TTL bounds how stale
+# edits and access changes made through other workers can get.
+SHOW_INFO_TTL_SECONDS = int(os.environ.get("SHOW_INFO_TTL_SECONDS", 300))
+SHOW_INFO_MAX_SHOWS = int(os.environ.get("SHOW_INFO_MAX_SHOWS", 512))
+
+
+class ShowInfo:
+    """A show's name and ``data.info`` block: OT rules, pay period, logo and PM details."""
+
+    def __init__(self, show_id: int, name: str, info: Optional[dict]):
+        self.show_id = show_id
+        self.name = name
+        self.info = info or {}
+        self.loaded_at = time.time()
+        self.users: Set[str] = set()
+        self.rack_ids = ()
+
+    @property
+    def logo_path(self) -> Optional[str]:
+        return self.info.get('logo_path')
+
+    @property
+    def ot_rules(self) -> dict:
+        return {
+            "daily_threshold": self.info.get('ot_daily_threshold', 10),
+            "weekly_threshold": self.info.get('ot_weekly_threshold', 40),
+            "start_day": self.info.get('pay_period_start_day', 0),
+        }
+
+
+class ShowInfoCache(ShowCache[ShowInfo]):
+    """
+    Process-wide LRU of show info for the timesheet endpoints.
+
+    An entry is only served to users whose own client has read the show since
+    it was loaded, so the cache never lets a user see a show that row-level
+    security hides. Access isn't carried over when an entry expires: a
+    collaborator removed through another worker is refused within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: int = SHOW_INFO_TTL_SECONDS, max_shows: int = SHOW_INFO_MAX_SHOWS):
+        super().__init__(ttl_seconds, max_shows)
+
+    def get(self, supabase, show_id: int, user_id) -> Optional[ShowInfo]:
+        """Returns the show's info, or None when the show doesn't exist or the user can't read it."""
+        user_id = str(user_id)
+        show = self._fresh(show_id)
+        if show is not None and user_id in show.users:
+            return show
+
+        loaded = self._load(supabase, show_id)
+        if loaded is None:
+            return None
+        with self._lock:
+            if show is not None and self._entries.get(show_id) is show:
+                # Join the current entry rather than replace it, so every user's check expires with it
+                show.users.add(user_id)
+                return show
+        loaded.users.add(user_id)
+        self._store(show_id, loaded)
+        return loaded
+
+    def _load(self, supabase, show_id: int) -> Optional[ShowInfo]:
+        res = supabase.table('shows').select('id, name, data').eq('id', show_id).execute()
+        if not res.data:
+            return None
+        row = res.data[0]
+        return ShowInfo(show_id, row['name'], (row.get('data') or {}).get('info'))
+
+
+show_info_cache = ShowInfoCache()
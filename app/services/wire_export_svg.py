@@ -1,8 +1,17 @@
 import io
+import os
+import cairocffi
 import cairosvg
 import re
+from cairosvg.parser import Tree
+from cairosvg.surface import PDFSurface
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
 from pypdf import PdfWriter, PdfReader
-from typing import List, Tuple, Dict
+from reportlab.pdfbase.ttfonts import TTFontFace
+from typing import List, Tuple, Dict, Optional, Callable
 from xml.sax.saxutils import escape
 from datetime import datetime
 from collections import defaultdict
@@ -25,6 +34,10 @@ PAGE_SIZES = {
 }
 MARGIN_MM = 6.35
 
+# Number of processes used to convert pages from SVG to PDF. 1 (the default) draws every
+# page onto a single cairo PDF surface; more than 1 renders pages in parallel and merges them.
+RENDER_WORKERS = int(os.environ.get("WIRE_EXPORT_WORKERS", 1))
+
 # --- Template-based constants ---
 SCALE_FACTOR = 0.65
 DEV_W_PX = 260 * SCALE_FACTOR
@@ -52,16 +65,50 @@ def _compute_label_clamp_px(print_w_px: float) -> float:
     remaining = max(0.0, col_w - base) / 2.0
     return max(MIN_LABEL_CLAMP_PX, min(remaining, MAX_LABEL_CLAMP_PX))
 
-def _truncate_to_px(text: str, font_size: float, max_px: float) -> str:
+# --- text metrics (Space Mono advance widths, font sizes are in pt like the SVG styles) ---
+FONTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fonts")
+FONT_FILES = {
+    "regular": "SpaceMono-Regular.ttf",
+    "bold": "SpaceMono-Bold.ttf",
+}
+TEXT_PADDING_PX = 4
+ELLIPSIS = "…"
+
+@lru_cache(maxsize=None)
+def _font_face(weight: str) -> TTFontFace:
+    return TTFontFace(os.path.join(FONTS_DIR, FONT_FILES[weight]))
+
+@lru_cache(maxsize=64)
+def _advance_table(weight: str, font_size: float) -> Tuple[Dict[str, float], float]:
+    """
+    Per-font, per-size table of glyph advance widths in px, plus the width used
+    for characters the font does not cover.
+    """
+    face = _font_face(weight)
+    scale = font_size * (DPI / 72) / 1000
+    table = {chr(code): width * scale for code, width in face.charWidths.items()}
+    return table, face.defaultWidth * scale
+
+def _char_advances(text: str, font_size: float, weight: str) -> List[float]:
+    table, default = _advance_table(weight, font_size)
+    return [table.get(ch, default) for ch in text]
+
+def _measure_text_width(text: str, font_size: float, weight: str = "regular") -> float:
+    return sum(_char_advances(text, font_size, weight)) + TEXT_PADDING_PX
+
+def _truncate_to_px(text: str, font_size: float, max_px: float, weight: str = "bold") -> str:
     if not text:
         return ""
-    if _estimate_text_width(text, font_size) <= max_px:
+    advances = _char_advances(text, font_size, weight)
+    if sum(advances) + TEXT_PADDING_PX <= max_px:
         return text
-    ell = "…"
-    s = text
-    while s and _estimate_text_width(s + ell, font_size) > max_px:
-        s = s[:-1]
-    return (s + ell) if s else ell
+
+    # Longest prefix that still fits with the ellipsis appended, found by binary
+    # search over the running widths instead of re-measuring after every character.
+    prefix_widths = [0.0] + list(accumulate(advances))
+    budget = max_px - TEXT_PADDING_PX - sum(_char_advances(ELLIPSIS, font_size, weight))
+    keep = bisect_right(prefix_widths, budget) - 1
+    return (text[:keep] + ELLIPSIS) if keep > 0 else ELLIPSIS
 
 # Colors
 SHOWREADY_AMBER = "#f59e0b"
@@ -143,9 +190,6 @@ def _get_connection_label(edge: Edge, is_for_source: bool, graph: Graph) -> str:
 
     return f"{escape(remote_node.deviceNomenclature)}:{escape(port_name)}"
 
-def _estimate_text_width(text: str, font_size: float) -> float:
-    return len(text) * font_size * 0.6 + 4
-
 def _generate_rounded_header_path(x, y, w, h, r):
     return f"M {x},{y+h} L {x},{y+r} Q {x},{y} {x+r},{y} L {x+w-r},{y} Q {x+w},{y} {x+w},{y+r} L {x+w},{y+h} L {x},{y+h} Z"
 
@@ -221,7 +265,7 @@ def _generate_device_svg(node: Node, graph: Graph, x_offset: float, y_offset: fl
 
     for i, port_info in enumerate(input_ports):
         y_pos = ports_y_start + (i * PORT_LINE_HEIGHT)
-        current_adpt_w = (_estimate_text_width(port_info['adapter'], ADAPTER_FONT_SIZE) + 8) if port_info.get('adapter') else 0
+        current_adpt_w = (_measure_text_width(port_info['adapter'], ADAPTER_FONT_SIZE, "bold") + 8) if port_info.get('adapter') else 0
         port_meta[port_info['in']] = {'y': y_pos, 'adpt_w': current_adpt_w}
 
         p1, p2, p3 = f"{x_offset},{y_pos - tri_h}", f"{x_offset + tri_w},{y_pos}", f"{x_offset},{y_pos + tri_h}"
@@ -236,7 +280,7 @@ def _generate_device_svg(node: Node, graph: Graph, x_offset: float, y_offset: fl
 
     for i, port_info in enumerate(output_ports):
         y_pos = ports_y_start + (i * PORT_LINE_HEIGHT)
-        current_adpt_w = (_estimate_text_width(port_info['adapter'], ADAPTER_FONT_SIZE) + 8) if port_info.get('adapter') else 0
+        current_adpt_w = (_measure_text_width(port_info['adapter'], ADAPTER_FONT_SIZE, "bold") + 8) if port_info.get('adapter') else 0
         port_meta[port_info['out']] = {'y': y_pos, 'adpt_w': current_adpt_w}
 
         cx = x_offset + DEV_W_PX
@@ -256,7 +300,7 @@ def _generate_device_svg(node: Node, graph: Graph, x_offset: float, y_offset: fl
         port_meta[port_info['in']] = {'y': y_pos, 'adpt_w': 0}
         port_meta[port_info['out']] = {'y': y_pos, 'adpt_w': 0}
 
-        gap_w = _estimate_text_width(port_info["name"] or "", PORT_FONT_SIZE) + 10
+        gap_w = _measure_text_width(port_info["name"] or "", PORT_FONT_SIZE) + 10
         svg += f'<line class="port-line" x1="{x_offset + 10}" y1="{y_pos}" x2="{dev_cx - gap_w/2}" y2="{y_pos}"/>'
         svg += f'<line class="port-line" x1="{dev_cx + gap_w/2}" y1="{y_pos}" x2="{x_offset + DEV_W_PX - 10}" y2="{y_pos}"/>'
         svg += f'<circle class="port-shape io" cx="{x_offset}" cy="{y_pos}" r="3"/><circle class="port-shape io" cx="{x_offset + DEV_W_PX}" cy="{y_pos}" r="3"/>'
@@ -376,11 +420,11 @@ def _get_node_specs(graph: Graph, label_clamp_px: float) -> List[Dict]:
         left_labels = [_get_connection_label(e, False, graph) for e in graph.edges if e.target == node.id]
         right_labels = [_get_connection_label(e, True, graph) for e in graph.edges if e.source == node.id]
 
-        max_l_label = min(max([_estimate_text_width(l, PORT_FONT_SIZE) for l in left_labels] or [0]), label_clamp_px)
-        max_r_label = min(max([_estimate_text_width(l, PORT_FONT_SIZE) for l in right_labels] or [0]), label_clamp_px)
+        max_l_label = min(max([_measure_text_width(l, PORT_FONT_SIZE-1, "bold") for l in left_labels] or [0]), label_clamp_px)
+        max_r_label = min(max([_measure_text_width(l, PORT_FONT_SIZE-1, "bold") for l in right_labels] or [0]), label_clamp_px)
 
-        max_l_adpt = max([(_estimate_text_width(p['adapter'], ADAPTER_FONT_SIZE) + 8) for p in input_ports if p.get('adapter')] or [0])
-        max_r_adpt = max([(_estimate_text_width(p['adapter'], ADAPTER_FONT_SIZE) + 8) for p in output_ports if p.get('adapter')] or [0])
+        max_l_adpt = max([(_measure_text_width(p['adapter'], ADAPTER_FONT_SIZE, "bold") + 8) for p in input_ports if p.get('adapter')] or [0])
+        max_r_adpt = max([(_measure_text_width(p['adapter'], ADAPTER_FONT_SIZE, "bold") + 8) for p in output_ports if p.get('adapter')] or [0])
 
         total_width = (
             max_l_label + GAP_PX + LINE_LEN_PX + max_l_adpt +
@@ -421,9 +465,73 @@ def _group_by_nomenclature(node_specs: List[Dict]) -> List[Tuple[str, List[Dict]
         result.append((key, sorted(groups[key], key=lambda s: s['node'].deviceNomenclature or "")))
     return result
 
-def build_pdf_bytes(graph: Graph, page_size: str = "Letter", title_block_data: TitleBlock = None) -> bytes:
+class _SharedPDFSurface(PDFSurface):
+    """
+    A cairosvg surface that draws onto an existing multi-page cairo PDF surface
+    (passed in as ``output``) instead of creating a new document per SVG.
+    """
+    def _create_surface(self, width, height):
+        self.output.set_size(width, height)
+        return self.output, width, height
+
+    def finish(self):
+        self.context.show_page()
+
+def _render_document(page_svgs: List[str], progress: Optional[Callable[[int, int], None]] = None) -> bytes:
+    """
+    Draws every page onto one cairo PDF surface. Fonts are embedded and subset
+    once for the whole document and no per-page parse/merge is needed.
+    """
+    output = io.BytesIO()
+    pdf_surface = cairocffi.PDFSurface(output, 1, 1)
+    for i, svg in enumerate(page_svgs):
+        tree = Tree(bytestring=svg.encode('utf-8'))
+        _SharedPDFSurface(tree, pdf_surface, DPI).finish()
+        if progress:
+            progress(i + 1, len(page_svgs))
+    pdf_surface.finish()
+    return output.getvalue()
+
+def _svg_page_to_pdf(full_svg: str) -> bytes:
+    return cairosvg.svg2pdf(bytestring=full_svg.encode('utf-8'))
+
+def _render_pages(page_svgs: List[str], workers: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None) -> List[bytes]:
+    """
+    Converts each page SVG to a single-page PDF. Pages are spread over a process pool
+    when there is more than one page and more than one worker; results always come
+    back in page order so the merged document is identical to a serial render.
+    """
+    workers = RENDER_WORKERS if workers is None else workers
+    workers = max(1, min(workers, len(page_svgs)))
+    if workers == 1:
+        page_pdfs = map(_svg_page_to_pdf, page_svgs)
+        return _collect_pages(page_pdfs, len(page_svgs), progress)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _collect_pages(executor.map(_svg_page_to_pdf, page_svgs), len(page_svgs), progress)
+
+def _collect_pages(page_pdfs, total: int, progress: Optional[Callable[[int, int], None]]) -> List[bytes]:
+    results = []
+    for page_pdf in page_pdfs:
+        results.append(page_pdf)
+        if progress:
+            progress(len(results), total)
+    return results
+
+def _merge_page_pdfs(page_pdfs: List[bytes]) -> bytes:
+    pdf_writer = PdfWriter()
+    for pdf_page_bytes in page_pdfs:
+        pdf_reader = PdfReader(io.BytesIO(pdf_page_bytes))
+        pdf_writer.add_page(pdf_reader.pages[0])
+
+    with io.BytesIO() as pdf_buffer:
+        pdf_writer.write(pdf_buffer)
+        pdf_writer.close()
+        return pdf_buffer.getvalue()
+
+def _build_page_svgs(graph: Graph, page_size: str = "Letter", title_block_data: TitleBlock = None) -> List[str]:
     if not graph.nodes:
-        return b""
+        return []
 
     page_dims = PAGE_SIZES.get(page_size, PAGE_SIZES["Letter"])
     page_w_px = mm_to_px(page_dims["w"])
@@ -485,16 +593,21 @@ def build_pdf_bytes(graph: Graph, page_size: str = "Letter", title_block_data: T
 
     save_page()
 
-    pdf_writer = PdfWriter()
     total_pages = len(pages_content)
+    page_svgs = []
     for i, svg_content in enumerate(pages_content):
         title_block_svg = _generate_title_block_svg(title_block_data, i + 1, total_pages, print_w_px)
-        full_svg = _generate_svg_page(svg_content, page_w_px, page_h_px, title_block_svg)
-        pdf_page_bytes = cairosvg.svg2pdf(bytestring=full_svg.encode('utf-8'))
-        pdf_reader = PdfReader(io.BytesIO(pdf_page_bytes))
-        pdf_writer.add_page(pdf_reader.pages[0])
+        page_svgs.append(_generate_svg_page(svg_content, page_w_px, page_h_px, title_block_svg))
 
-    with io.BytesIO() as pdf_buffer:
-        pdf_writer.write(pdf_buffer)
-        pdf_writer.close()
-        return pdf_buffer.getvalue()
\ No newline at end of file
+    return page_svgs
+
+def build_pdf_bytes(graph: Graph, page_size: str = "Letter", title_block_data: TitleBlock = None, workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> bytes:
+    page_svgs = _build_page_svgs(graph, page_size, title_block_data)
+    if not page_svgs:
+        return b""
+
+    workers = RENDER_WORKERS if workers is None else workers
+    if workers > 1 and len(page_svgs) > 1:
+        return _merge_page_pdfs(_render_pages(page_svgs, workers, progress))
+    return _render_document(page_svgs, progress)
\ No newline at end of file
@@ -18,38 +18,56 @@ class SMTPSettings(BaseModel):
     smtp_username: str
     encrypted_smtp_password: str # This comes from the DB
 
-def send_email_with_user_smtp(
+def build_user_email(
     smtp_settings: SMTPSettings,
     recipient_emails: List[str],
     subject: str,
     html_body: str,
     attachment_blob: bytes = None,
     attachment_filename: str = "report.pdf"
-):
-    """Connects to a user's SMTP server and sends an email."""
-    try:
-        password = decrypt_password(smtp_settings.encrypted_smtp_password)
+) -> MIMEMultipart:
+    """Builds an HTML message from the user's configured sender."""
+    msg = MIMEMultipart()
+    msg["From"] = f"{smtp_settings.from_name} <{smtp_settings.from_email}>"
+    msg["To"] = ", ".join(recipient_emails)
+    msg["Subject"] = subject
+    msg.attach(MIMEText(html_body, "html"))
 
-        msg = MIMEMultipart()
-        msg["From"] = f"{smtp_settings.from_name} <{smtp_settings.from_email}>"
-        msg["To"] = ", ".join(recipient_emails)
-        msg["Subject"] = subject
-        msg.attach(MIMEText(html_body, "html"))
+    if attachment_blob:
+        part = MIMEApplication(attachment_blob, Name=attachment_filename)
+        part["Content-Disposition"] = f'attachment; filename="{attachment_filename}"'
+        msg.attach(part)
+    return msg
 
-        if attachment_blob:
-            part = MIMEApplication(attachment_blob, Name=attachment_filename)
-            part["Content-Disposition"] = f'attachment; filename="{attachment_filename}"'
-            msg.attach(part)
+def open_user_smtp(smtp_settings: SMTPSettings) -> smtplib.SMTP:
+    """Opens an authenticated connection to a user's SMTP server. The caller closes it."""
+    password = decrypt_password(smtp_settings.encrypted_smtp_password)
 
-        server = None
-        if smtp_settings.smtp_port == 465:
-            server = smtplib.SMTP_SSL(smtp_settings.smtp_server, smtp_settings.smtp_port, timeout=15)
-        else:
-            server = smtplib.SMTP(smtp_settings.smtp_server, smtp_settings.smtp_port, timeout=15)
+    if smtp_settings.smtp_port == 465:
+        server = smtplib.SMTP_SSL(smtp_settings.smtp_server, smtp_settings.smtp_port, timeout=15)
+    else:
+        server = smtplib.SMTP(smtp_settings.smtp_server, smtp_settings.smtp_port, timeout=15)
+    try:
+        if smtp_settings.smtp_port != 465:
             server.starttls()
+        server.login(smtp_settings.smtp_username, password)
+    except Exception:
+        server.close()
+        raise
+    return server
 
-        with server:
-            server.login(smtp_settings.smtp_username, password)
+def send_email_with_user_smtp(
+    smtp_settings: SMTPSettings,
+    recipient_emails: List[str],
+    subject: str,
+    html_body: str,
+    attachment_blob: bytes = None,
+    attachment_filename: str = "report.pdf"
+):
+    """Connects to a user's SMTP server and sends an email."""
+    try:
+        msg = build_user_email(smtp_settings, recipient_emails, subject, html_body, attachment_blob, attachment_filename)
+        with open_user_smtp(smtp_settings) as server:
             server.send_message(msg)
             
     except smtplib.SMTPException as e:
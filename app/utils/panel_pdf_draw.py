@@ -218,22 +218,50 @@ def _draw_connector_type_tag(c, tag_text, cx, y, max_width, compact: bool = Fals
     c.drawCentredString(cx, text_y, printable_tag)
 
 
+# Connector faces are drawn in a 260 x 310 artwork box and printed 0.51" wide.
+FACE_ART_W = 260.0
+FACE_ART_H = 310.0
+FACE_SCALE = (0.51 * inch) / FACE_ART_W
+FACE_DRAWN_W = FACE_ART_W * FACE_SCALE
+FACE_DRAWN_H = FACE_ART_H * FACE_SCALE
+
+# Styles that share artwork; anything unrecognised is drawn as a bare flange.
+FACE_STYLE_ALIASES = {"true1_in": "true1", "powercon_white": "powercon_blue"}
+FACE_STYLES = {
+    "empty", "ethercon", "xlr_f", "xlr_m", "bnc", "opticalcon_duo", "opticalcon_quad", "mtp12", "mtp24", "mtp48",
+    "true1", "true1_out", "powercon_blue", "speakon", "hdmi", "usb",
+}
+
+
+def _face_form_name(visual_style) -> str:
+    style = FACE_STYLE_ALIASES.get(visual_style, visual_style)
+    return f"ConnectorFace_{style if style in FACE_STYLES else 'flange'}"
+
+
 def draw_svg_face(c, cx, cy, visual_style):
     """
     Draws a connector face at physical scale coordinates in a line-art/wireframe style.
-    """
-    c.saveState()
 
-    target_w = 260.0
-    target_h = 310.0
+    Each distinct face is drawn once per document as a form XObject and stamped
+    at every connector that uses it.
+    """
+    name = _face_form_name(visual_style)
+    if not c.hasForm(name):
+        # The bounding box leaves room for the outline stroke, which straddles the artwork edge.
+        c.beginForm(name, lowerx=-1, lowery=-1, upperx=FACE_DRAWN_W + 1, uppery=FACE_DRAWN_H + 1)
+        c.translate(0, FACE_DRAWN_H)
+        c.scale(FACE_SCALE, -FACE_SCALE)
+        _draw_face_art(c, visual_style)
+        c.endForm()
 
-    scale = (0.51 * inch) / target_w
-    drawn_w = target_w * scale
-    drawn_h = target_h * scale
+    c.saveState()
+    c.translate(cx - (FACE_DRAWN_W / 2), cy - (FACE_DRAWN_H / 2))
+    c.doForm(name)
+    c.restoreState()
 
-    c.translate(cx - (drawn_w / 2), cy - (drawn_h / 2) + drawn_h)
-    c.scale(scale, -scale)
 
+def _draw_face_art(c, visual_style):
+    """Draws a connector face in artwork units, y pointing down."""
     def draw_flange():
         c.setLineWidth(2)
         c.setFillColor(colors.white)
@@ -479,8 +507,6 @@ def draw_svg_face(c, cx, cy, visual_style):
     else:
         draw_flange()
 
-    c.restoreState()
-
 
 def _draw_pe_recursive(c, x, y, w, h, instance, connector_label_mode: str = "normal"):
     template = instance.get("template")
@@ -1,10 +1,54 @@
-from typing import List, Dict, Optional
+import os
+from collections import defaultdict
+from typing import List, Dict
 
-def get_panel_children_recursive(parent_id, all_pe_instances):
+# --- Configuration ---
+PANEL_EQUIPMENT_PAGE_SIZE = int(os.environ.get("PANEL_EQUIPMENT_PAGE_SIZE", 1000))
+
+
+def build_panel_tree(pe_instances: List[Dict], orphans_as_roots: bool = False) -> List[Dict]:
+    """
+    Nests mounted panel equipment instances under their parents in a single pass.
+
+    Every instance gets a ``children`` list, in the order the instances were given.
+    Instances whose parent is not in the list are dropped unless ``orphans_as_roots``
+    is set, in which case they are returned alongside the top-level instances.
+    """
+    by_id = {str(item['id']): item for item in pe_instances}
+    for item in pe_instances:
+        item['children'] = []
+
+    roots = []
+    for item in pe_instances:
+        parent_id = item.get('parent_instance_id')
+        if not parent_id:
+            roots.append(item)
+        elif str(parent_id) in by_id:
+            by_id[str(parent_id)]['children'].append(item)
+        elif orphans_as_roots:
+            roots.append(item)
+    return roots
+
+
+def fetch_panel_trees(supabase, panel_ids: List[str]) -> Dict[str, List[Dict]]:
     """
-    Recursively builds a tree of mounted panel equipment instances.
+    Fetches the mounted equipment of several panels in one batched read and returns each
+    panel's tree by panel id. The read is keyset-paged on id until a page comes back empty,
+    so the server's row cap can't silently drop components.
     """
-    children = [i for i in all_pe_instances if i.get('parent_instance_id') == parent_id]
-    for child in children:
-        child['children'] = get_panel_children_recursive(child['id'], all_pe_instances)
-    return children
+    if not panel_ids:
+        return {}
+    by_panel = defaultdict(list)
+    last_id = None
+    while True:
+        query = supabase.table('panel_equipment_instances').select('*, template:panel_equipment_templates(*)') \
+            .in_('panel_instance_id', [str(p) for p in panel_ids])
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        page = query.order('id').limit(PANEL_EQUIPMENT_PAGE_SIZE).execute().data or []
+        if not page:
+            break
+        for item in page:
+            by_panel[str(item['panel_instance_id'])].append(item)
+        last_id = page[-1]['id']
+    return {str(panel_id): build_panel_tree(by_panel.get(str(panel_id), [])) for panel_id in panel_ids}
@@ -0,0 +1,91 @@
+import os
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# --- Configuration ---
+TIMESHEET_SAVE_CHUNK_SIZE = int(os.environ.get("TIMESHEET_SAVE_CHUNK_SIZE", 500))
+# Deletes name their row ids in the query string, so they go in smaller batches to keep URLs short
+TIMESHEET_DELETE_CHUNK_SIZE = int(os.environ.get("TIMESHEET_DELETE_CHUNK_SIZE", 100))
+# PostgREST caps the rows in one response (max-rows), so audit entries are read in pages of this size.
+AUDIT_PAGE_SIZE = int(os.environ.get("AUDIT_PAGE_SIZE", 1000))
+
+Cell = Tuple[str, str]  # (show_crew_id, ISO date)
+
+
+def chunked(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def timesheet_version(rows: Iterable[Dict]) -> str:
+    """Order-independent fingerprint of saved ``timesheet_entries`` rows (crew, date and hours)."""
+    cells = sorted(f"{row['show_crew_id']}|{row['date']}|{float(row['hours']):.2f}" for row in rows)
+    return hashlib.sha1("\n".join(cells).encode()).hexdigest()
+
+
+def diff_timesheet_cells(saved_rows: List[Dict], submitted: Dict[Cell, float]) -> Tuple[List[Dict], List[str]]:
+    """
+    Compares submitted hours with the saved rows for the same cells.
+
+    Returns the rows to upsert (new or changed hours) and the ids of saved rows to
+    delete (cells cleared to 0). Cells left out of ``submitted`` are not touched.
+    """
+    saved = {(str(row['show_crew_id']), row['date']): row for row in saved_rows}
+    upserts, delete_ids = [], []
+    for (crew_id, day), hours in submitted.items():
+        row = saved.get((crew_id, day))
+        if not hours:
+            if row is not None:
+                delete_ids.append(row['id'])
+        elif row is None or round(float(row['hours']), 2) != round(hours, 2):
+            upserts.append({"show_crew_id": crew_id, "date": day, "hours": hours})
+    return upserts, delete_ids
+
+
+def fetch_saved_cells(supabase, crew_ids: List[str], first_day: str, last_day: str, days: int) -> List[Dict]:
+    """
+    Saved entries of the crew between two dates. Crew are read in groups small enough
+    that a full group (``days`` rows each) stays under TIMESHEET_SAVE_CHUNK_SIZE rows.
+    """
+    rows = []
+    for group in chunked(crew_ids, max(1, TIMESHEET_SAVE_CHUNK_SIZE // max(1, days))):
+        res = supabase.table('timesheet_entries').select('id, show_crew_id, date, hours') \
+            .in_('show_crew_id', group) \
+            .gte('date', first_day) \
+            .lte('date', last_day) \
+            .execute()
+        rows.extend(res.data or [])
+    return rows
+
+
+def save_timesheet_diff(supabase, upserts: List[Dict], delete_ids: List[str]) -> None:
+    """Writes a diff from :func:`diff_timesheet_cells` in chunks of bounded size."""
+    for chunk in chunked(upserts, TIMESHEET_SAVE_CHUNK_SIZE):
+        supabase.table('timesheet_entries').upsert(chunk, on_conflict='show_crew_id,date').execute()
+    for chunk in chunked(delete_ids, TIMESHEET_DELETE_CHUNK_SIZE):
+        supabase.table('timesheet_entries').delete().in_('id', chunk).execute()
+
+
+def fetch_audit_entries(supabase, show_crew_ids: List[str], start_date: Optional[date], end_date: Optional[date]) -> List[Dict]:
+    """
+    Every timesheet entry of the crew in the date range, ordered by (date, id).
+
+    Pages are keyset-paginated on (date, id) and read until one comes back empty, so a
+    server row cap smaller than AUDIT_PAGE_SIZE shortens pages instead of dropping rows.
+    """
+    entries = []
+    last = None
+    while True:
+        query = supabase.table('timesheet_entries').select('id, show_crew_id, date, hours').in_('show_crew_id', show_crew_ids)
+        if start_date:
+            query = query.gte('date', str(start_date))
+        if end_date:
+            query = query.lte('date', str(end_date))
+        if last is not None:
+            query = query.or_(f"date.gt.{last['date']},and(date.eq.{last['date']},id.gt.{last['id']})")
+        page = query.order('date').order('id').limit(AUDIT_PAGE_SIZE).execute().data or []
+        if not page:
+            return entries
+        entries.extend(page)
+        last = page[-1]
@@ -0,0 +1,73 @@
+"""
+Times Label Engine rendering for a mixed template (text, colored shapes,
+lines, a per-row barcode and QR code, a show-wide QR code and a logo) over many data rows.
+
+Run from the repository root:
+    python -m benchmarks.bench_label_engine --rows 5000
+"""
+import argparse
+import io
+import time
+import uuid
+
+from PIL import Image
+
+from app.LE_pdf_utils import render_template_to_buffer
+from app.models import LabelElement, LabelStock, LabelTemplate
+
+
+def make_job(num_rows: int, codes: bool = True):
+    stock = LabelStock(id=uuid.uuid4(), name="Avery 5163", page_width=8.5, page_height=11, top_margin=0.5,
+                       left_margin=0.16, row_spacing=0, col_spacing=0.19, rows_per_page=5, cols_per_page=2,
+                       corner_radius=0.1)
+    elements = [
+        LabelElement(id="frame", type="shape", x=0.05, y=0.05, width=3.9, height=1.9, z_index=0,
+                     fill_color="transparent", stroke_color="#333333"),
+        LabelElement(id="band", type="shape", x=0.05, y=0.05, width=0.25, height=1.9, z_index=1,
+                     fill_color="#000000", fill_color_variable="color"),
+        LabelElement(id="logo", type="image", x=2.9, y=0.1, width=1.0, height=0.5, z_index=2, text_content="Show Logo"),
+        LabelElement(id="title", type="text", x=0.4, y=0.1, width=2.4, height=0.4, z_index=3, font_size=16,
+                     font_weight="bold", text_content="{case_name}"),
+        LabelElement(id="body", type="text", x=0.4, y=0.55, width=2.4, height=0.6, z_index=3, font_size=9,
+                     text_content="Send to: {send_to}\nContents: {contents}", text_color_variable="text_color"),
+        LabelElement(id="rule", type="line", x=0.4, y=1.2, width=3.4, height=0.01, z_index=4),
+        LabelElement(id="barcode", type="barcode", x=0.4, y=1.3, width=2.2, height=0.5, z_index=5, text_content="{asset}"),
+        LabelElement(id="qr", type="qrcode", x=3.1, y=1.0, width=0.8, height=0.8, z_index=5, qr_content="showready:{asset}"),
+        LabelElement(id="show_qr", type="qrcode", x=2.9, y=0.6, width=0.4, height=0.4, z_index=5,
+                     qr_content="https://showready.k-p.video/shows/{show_id}"),
+    ]
+    if not codes:
+        elements = [e for e in elements if e.type not in ("barcode", "qrcode")]
+    template = LabelTemplate(id=uuid.uuid4(), stock_id=stock.id, name="Case", category="bench", is_public=False,
+                             elements=elements)
+    palette = ["red", "#1E90FF", "green", "orange", "purple"]
+    rows = [{
+        "case_name": f"CASE {i:05d}",
+        "send_to": ["FOH", "Stage Left", "Video World", "Monitor World"][i % 4],
+        "contents": f"SDI snake {i % 7}, power {i % 3}",
+        "asset": f"SR{i:06d}",
+        "color": palette[i % len(palette)],
+        "text_color": "#222222" if i % 2 else "black",
+        "show_id": 42,
+    } for i in range(num_rows)]
+
+    logo = io.BytesIO()
+    Image.effect_mandelbrot((400, 200), (-2, -1, 1, 1), 40).convert("RGB").save(logo, "PNG")
+    return template, stock, rows, {"__SHOW_LOGO__": logo.getvalue()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--no-codes", action="store_true", help="Leave out the barcode and QR elements.")
+    args = parser.parse_args()
+
+    template, stock, rows, images = make_job(args.rows, codes=not args.no_codes)
+    start = time.perf_counter()
+    pdf_bytes = render_template_to_buffer(template, stock, rows, images=images).getvalue()
+    elapsed = time.perf_counter() - start
+    print(f"rows={args.rows}  {elapsed:7.2f}s  ({elapsed / args.rows * 1000:.3f}ms/row)  bytes={len(pdf_bytes):,}")
+
+
+if __name__ == "__main__":
+    main()
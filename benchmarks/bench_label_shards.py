@@ -0,0 +1,54 @@
+"""
+Times sharded Label Engine rendering: one in-process render against page-aligned
+shards rendered on a process pool at each worker count.
+
+Run from the repository root:
+    python -m benchmarks.bench_label_shards --rows 4000 --sheets 10
+"""
+import argparse
+import os
+import time
+
+from app.LE_pdf_utils import render_labels_sharded, render_template_to_buffer
+from app.services.render_executor import RenderExecutor
+from benchmarks.bench_label_engine import make_job
+
+
+def _warm(executor: RenderExecutor, template, stock, rows) -> None:
+    # Spawned workers import ReportLab and register fonts on first use; keep that out of the timings.
+    for _ in executor.map_ordered(render_template_to_buffer, [((template, stock, rows[:1]), {})] * executor.workers):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4000)
+    parser.add_argument("--sheets", type=int, default=10, help="sheets per shard")
+    parser.add_argument("--workers", type=str, default=None, help="comma-separated worker counts (default 1..cpu_count)")
+    parser.add_argument("--no-codes", action="store_true", help="omit barcode and QR elements")
+    args = parser.parse_args()
+
+    template, stock, rows, images = make_job(args.rows, codes=not args.no_codes)
+    cpus = os.cpu_count() or 1
+    counts = [int(n) for n in args.workers.split(",")] if args.workers else sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+
+    start = time.perf_counter()
+    single = render_template_to_buffer(template, stock, rows, images=images).getvalue()
+    baseline = time.perf_counter() - start
+    print(f"single canvas      {baseline:8.2f}s  bytes={len(single):,}")
+
+    for workers in counts:
+        executor = RenderExecutor(workers=workers, max_queue=workers * 4, timeout=3600)
+        try:
+            _warm(executor, template, stock, rows)
+            start = time.perf_counter()
+            pdf_bytes = render_labels_sharded(template, stock, rows, images=images, sheets_per_shard=args.sheets, executor=executor)
+            elapsed = time.perf_counter() - start
+        finally:
+            executor.shutdown()
+        print(f"sharded, {workers:2d} worker{'s' if workers > 1 else ' '} {elapsed:8.2f}s  "
+              f"speedup={baseline / elapsed:5.2f}x  bytes={len(pdf_bytes):,}")
+
+
+if __name__ == "__main__":
+    main()
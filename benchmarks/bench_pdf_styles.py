@@ -0,0 +1,104 @@
+"""
+Times the per-loom style setup of the loom build sheet: fresh ReportLab styles
+built for every loom and cable versus the shared style registry in app.pdf_styles.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_styles --looms 100
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+from app.models import Cable, CableLocation, LoomBuilderPDFPayload, LoomWithCables
+from app.pdf_styles import parse_color, loom_styles, cable_end_style, LOOM_TABLE_STYLE
+from app.pdf_utils import generate_loom_builder_pdf
+
+CABLE_COLORS = ["red", "blue", "green", "#FFA500", "#333", "white", "purple", "teal"]
+
+
+def make_looms(num_looms: int, cables_per_loom: int = 24) -> LoomBuilderPDFPayload:
+    looms = []
+    for n in range(num_looms):
+        loom_id = uuid.uuid4()
+        cables = [
+            Cable(
+                id=uuid.uuid4(), loom_id=loom_id, created_at=datetime.now(),
+                label_content=f"L{n}-C{c}" if c % 5 else f"LONG-LABEL-{n}-CABLE-{c}",
+                cable_type="SDI" if c % 2 else "CAT6",
+                length_ft=25 + c,
+                origin=CableLocation(type="rack", value=f"Rack {n % 6}", end=f"Port {c + 1}"),
+                destination=CableLocation(type="rack", value=f"FOH {n % 3}", end=f"Port {c + 1}"),
+                origin_color=CABLE_COLORS[c % len(CABLE_COLORS)],
+                destination_color=CABLE_COLORS[(c + 3) % len(CABLE_COLORS)],
+            )
+            for c in range(cables_per_loom)
+        ]
+        looms.append(LoomWithCables(
+            id=loom_id, user_id=uuid.uuid4(), created_at=datetime.now(),
+            name=f"Loom {n}", show_id=1, cables=cables,
+        ))
+    return LoomBuilderPDFPayload(looms=looms, show_name="Benchmark Show")
+
+
+def legacy_loom_styles(loom):
+    """The style objects the loom build sheet used to construct for every loom."""
+    styles = getSampleStyleSheet()
+    ParagraphStyle(name='HeaderStyle', parent=styles['Normal'], alignment=TA_CENTER, fontName='SpaceMono-Bold',
+                   fontSize=9, textColor=colors.whitesmoke, leading=11)
+    base = ParagraphStyle(name='BaseDataStyle', parent=styles['Normal'], fontName='SpaceMono', fontSize=8, alignment=TA_CENTER)
+    for cable in loom.cables:
+        for color_string in (cable.origin_color, cable.destination_color):
+            color = parse_color.__wrapped__(color_string)
+            ParagraphStyle(name='EndStyle', backColor=color, alignment=TA_CENTER, fontName='SpaceMono', fontSize=8,
+                           textColor=colors.white if (color.red + color.green + color.blue) < 1.5 else colors.black)
+        ParagraphStyle(name='LabelStyle', parent=base, fontSize=7 if len(cable.label_content) > 16 else 8)
+    TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.grey), ('ALIGN', (0, 0), (-1, -1), 'CENTER')])
+
+
+def registry_loom_styles(loom):
+    styles = loom_styles()
+    styles['LoomHeader'], styles['LoomCell']
+    for cable in loom.cables:
+        cable_end_style(cable.origin_color)
+        cable_end_style(cable.destination_color)
+        styles['LoomLabelSmall'] if len(cable.label_content) > 16 else styles['LoomCell']
+    LOOM_TABLE_STYLE
+
+
+def _time(fn, payload, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for loom in payload.looms:
+            fn(loom)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--looms", type=int, default=100)
+    parser.add_argument("--cables", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_looms(args.looms, args.cables)
+
+    legacy = _time(legacy_loom_styles, payload, args.repeat)
+    registry = _time(registry_loom_styles, payload, args.repeat)
+    per_loom = lambda seconds: seconds / args.looms * 1000
+    print(f"style setup, legacy   {legacy * 1000:8.2f}ms  ({per_loom(legacy):.3f}ms/loom)")
+    print(f"style setup, registry {registry * 1000:8.2f}ms  ({per_loom(registry):.3f}ms/loom)")
+
+    start = time.perf_counter()
+    pdf_bytes = generate_loom_builder_pdf(payload).getvalue()
+    elapsed = time.perf_counter() - start
+    print(f"loom build sheet      {elapsed * 1000:8.2f}ms  pages={args.looms}  bytes={len(pdf_bytes):,}")
+
+
+if __name__ == "__main__":
+    main()
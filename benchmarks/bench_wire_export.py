@@ -0,0 +1,69 @@
+"""
+Times the wire export render paths: the single-surface document render and the
+per-page render at each worker count.
+
+Run from the repository root:
+    python -m benchmarks.bench_wire_export --nodes 600
+"""
+import argparse
+import os
+import time
+
+from app.schemas.wire_export import Graph, Node, Edge, PortDef
+from app.services.wire_export_svg import _build_page_svgs, _merge_page_pdfs, _render_document, _render_pages
+
+
+def make_graph(num_nodes: int, ports_per_node: int = 8) -> Graph:
+    nodes = []
+    edges = []
+    for n in range(num_nodes):
+        ports = {}
+        for p in range(ports_per_node):
+            ports[f"p{p}-in"] = PortDef(name=f"SDI In {p + 1}")
+            ports[f"p{p}-out"] = PortDef(name=f"SDI Out {p + 1}")
+        nodes.append(Node(
+            id=f"n{n}",
+            deviceNomenclature=f"DEV{n % 12}-{n}",
+            modelNumber=f"MODEL-{n % 7}",
+            rackName=f"R{n // 20}",
+            deviceRu=(n % 40) + 1,
+            ipAddress=f"10.0.{n // 250}.{n % 250}",
+            ports=ports,
+        ))
+    for n in range(num_nodes - 1):
+        for p in range(ports_per_node // 2):
+            edges.append(Edge(source=f"n{n}", sourceHandle=f"p{p}-out", target=f"n{n + 1}", targetHandle=f"p{p}-in"))
+    return Graph(nodes=nodes, edges=edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=600)
+    args = parser.parse_args()
+
+    graph = make_graph(args.nodes)
+    page_svgs = _build_page_svgs(graph)
+    print(f"{len(page_svgs)} pages")
+
+    start = time.perf_counter()
+    single = _render_document(page_svgs)
+    single_elapsed = time.perf_counter() - start
+    print(f"single surface {single_elapsed:7.2f}s  bytes={len(single):,}")
+
+    cpu = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpu} & set(range(1, cpu + 1)))
+
+    serial = None
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        pdf_bytes = _merge_page_pdfs(_render_pages(page_svgs, workers))
+        elapsed = time.perf_counter() - start
+
+        if serial is None:
+            serial, baseline = pdf_bytes, elapsed
+        identical = "yes" if pdf_bytes == serial else "NO"
+        print(f"per-page workers={workers:<3} {elapsed:7.2f}s  speedup={baseline / elapsed:5.2f}x  bytes={len(pdf_bytes):,}  identical={identical}")
+
+if __name__ == "__main__":
+    main()
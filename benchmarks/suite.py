@@ -0,0 +1,175 @@
+"""
+Runs every PDF generator against seeded synthetic shows and checks wall time,
+peak RSS and output size against the stored baselines in benchmarks/baselines.json.
+
+Each case runs in a fresh interpreter so peak RSS belongs to that case alone.
+Exits with status 1 when a case is slower, larger or hungrier than its baseline
+by more than the tolerance.
+
+Run from the repository root:
+    python -m benchmarks.suite --size small
+    python -m benchmarks.suite --size large --case rack_export --case labels
+    python -m benchmarks.suite --size small --update-baseline
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks import synthetic
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def _rack_export(size):
+    from app.pdf_utils import generate_combined_rack_pdf
+    payload = synthetic.rack_show(size["racks"])
+    return lambda: generate_combined_rack_pdf(payload)
+
+
+def _loom_builder(size):
+    from app.pdf_utils import generate_loom_builder_pdf
+    payload = synthetic.looms(size["cables"])
+    return lambda: generate_loom_builder_pdf(payload)
+
+
+def _labels(size):
+    from app.LE_pdf_utils import render_template_to_buffer
+    template, stock, rows, images = synthetic.label_job(size["labels"])
+    return lambda: render_template_to_buffer(template, stock, rows, images=images)
+
+
+def _wire_export(size):
+    from app.services.wire_export_svg import build_pdf_bytes
+    graph = synthetic.wire_graph(size["wire_nodes"])
+    return lambda: build_pdf_bytes(graph, workers=1)
+
+
+def _hours(size):
+    from app.pdf_utils import generate_hours_pdf
+    user, show, data = synthetic.timesheet(size["crew"])
+    return lambda: generate_hours_pdf(user, show, data, None, None)
+
+
+def _crew_audit(size):
+    from app.pdf_utils import generate_crew_audit_pdf
+    user, show, data = synthetic.crew_audit(size["crew"], size["weeks"])
+    return lambda: generate_crew_audit_pdf(user, show, data, None)
+
+
+def _panel_export(size):
+    from app.pdf_utils import generate_panel_export_pdf
+    export_data = synthetic.panels(size["panels"])
+    return lambda: generate_panel_export_pdf("Benchmark Show", export_data)
+
+
+CASES = {
+    "rack_export": _rack_export,
+    "loom_builder": _loom_builder,
+    "labels": _labels,
+    "wire_export": _wire_export,
+    "hours": _hours,
+    "crew_audit": _crew_audit,
+    "panel_export": _panel_export,
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(name: str, size_name: str) -> dict:
+    """Builds the case's inputs, then times one render. Meant to run in its own process."""
+    from reportlab import rl_config
+    rl_config.invariant = 1  # no timestamps or random ids, so output size is stable between runs
+
+    try:
+        render = CASES[name](synthetic.SIZES[size_name])
+    except (ImportError, OSError) as e:
+        # The wire export needs the cairo libraries, which not every machine has.
+        return {"skipped": str(e).splitlines()[0][:120]}
+    start = time.perf_counter()
+    result = render()
+    seconds = time.perf_counter() - start
+    output = result.getvalue() if hasattr(result, "getvalue") else result
+    return {"seconds": round(seconds, 3), "peak_rss_mb": round(_peak_rss_mb(), 1), "bytes": len(output)}
+
+
+def _spawn(name: str, size_name: str) -> dict:
+    proc = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--run-case", name, "--size", size_name],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["exited with status %d" % proc.returncode])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(result: dict, baseline: dict, tolerance: float, bytes_tolerance: float) -> list:
+    """Returns a description of every metric that exceeds its baseline by more than the allowed fraction."""
+    regressions = []
+    for metric, allowed in (("seconds", tolerance), ("peak_rss_mb", tolerance), ("bytes", bytes_tolerance)):
+        if metric in baseline and result[metric] > baseline[metric] * (1 + allowed):
+            regressions.append(f"{metric} {result[metric]:,} > {baseline[metric]:,} (+{allowed:.0%})")
+    return regressions
+
+
+def _load_baselines() -> dict:
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(synthetic.SIZES), default="small")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only these cases (repeatable)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional increase in time and peak RSS")
+    parser.add_argument("--bytes-tolerance", type=float, default=0.02, help="allowed fractional increase in output size")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline for --size")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.size)))
+        return
+
+    baselines = _load_baselines()
+    stored = baselines.get(args.size, {})
+    failed = False
+    for name in args.case or list(CASES):
+        result = _spawn(name, args.size)
+        if "error" in result or "skipped" in result:
+            failed = failed or "error" in result
+            print(f"{name:<14} {'ERROR' if 'error' in result else 'skipped'}: {result.get('error') or result['skipped']}")
+            continue
+
+        line = f"{name:<14} {result['seconds']:8.2f}s  rss={result['peak_rss_mb']:7.1f}MB  bytes={result['bytes']:>12,}"
+        if args.update_baseline:
+            stored[name] = result
+        elif name in stored:
+            regressions = compare(result, stored[name], args.tolerance, args.bytes_tolerance)
+            base = stored[name]
+            line += f"  (baseline {base['seconds']:.2f}s / {base['peak_rss_mb']:.1f}MB / {base['bytes']:,})"
+            if regressions:
+                failed = True
+                line += "  REGRESSION: " + "; ".join(regressions)
+        else:
+            line += "  (no baseline)"
+        print(line)
+
+    if args.update_baseline:
+        baselines[args.size] = stored
+        with open(BASELINES_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline for '{args.size}' written to {BASELINES_PATH}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
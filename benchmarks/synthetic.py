@@ -0,0 +1,229 @@
+"""
+Seeded synthetic show data for the benchmarks. The same size and seed always
+produce the same inputs, so timings and output sizes are comparable run to run.
+"""
+import io
+import random
+import uuid
+from datetime import date, datetime, timedelta
+
+from PIL import Image
+
+from app.models import (
+    Cable, CableLocation, EquipmentTemplate, LabelElement, LabelStock, LabelTemplate, LoomBuilderPDFPayload,
+    LoomWithCables, Rack, RackEquipmentInstanceWithTemplate, RackPDFPayload,
+)
+
+CREATED_AT = datetime(2026, 1, 5, 9, 0)
+SEASON_START = date(2026, 1, 5)  # a Monday
+
+SIZES = {
+    "small": {"racks": 10, "cables": 500, "labels": 100, "wire_nodes": 200, "crew": 20, "weeks": 4, "panels": 4},
+    "medium": {"racks": 40, "cables": 2000, "labels": 1000, "wire_nodes": 1000, "crew": 80, "weeks": 26, "panels": 16},
+    "large": {"racks": 100, "cables": 5000, "labels": 2000, "wire_nodes": 3000, "crew": 200, "weeks": 52, "panels": 40},
+}
+
+MANUFACTURERS = ["Blackmagic", "AJA", "Ross", "Riedel", "Cisco", "Barco", "Panasonic", "Yamaha"]
+CABLE_TYPES = ["SDI", "CAT6", "Fiber", "XLR", "powerCON", "HDMI"]
+CABLE_COLORS = ["red", "blue", "green", "#FFA500", "#333", "white", "purple", "teal"]
+CONNECTOR_STYLES = ["xlr_f", "xlr_m", "ethercon", "bnc", "opticalcon_duo", "true1", "speakon", "hdmi"]
+
+
+def _uuid(rnd: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rnd.getrandbits(128), version=4)
+
+
+def _logo(seed: int) -> bytes:
+    buf = io.BytesIO()
+    Image.effect_mandelbrot((400, 200), (-2 + seed % 3 * 0.1, -1, 1, 1), 40).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def rack_show(num_racks: int, seed: int = 1, **flags) -> RackPDFPayload:
+    """42U racks filled with a mix of full, half and third width devices from a shared template library."""
+    rnd = random.Random(seed)
+    templates = [
+        EquipmentTemplate(id=_uuid(rnd), model_number=f"{MANUFACTURERS[i % len(MANUFACTURERS)][:3].upper()}-{100 + i}",
+                          manufacturer=MANUFACTURERS[i % len(MANUFACTURERS)], ru_height=rnd.choice([1, 1, 1, 2, 2, 3, 4]),
+                          width=rnd.choice(["full", "full", "full", "half", "third"]), depth=rnd.choice([8.0, 12.0, 18.0, 22.0]),
+                          power_consumption_watts=rnd.randrange(20, 900, 10))
+        for i in range(40)
+    ]
+    racks = []
+    for r in range(num_racks):
+        rack_id = _uuid(rnd)
+        equipment = []
+        for side in ("front", "rear"):
+            ru = 1
+            while ru < 42:
+                template = rnd.choice(templates)
+                if ru + template.ru_height > 43:
+                    break
+                slots = {"half": ["-left", "-right"], "third": ["-left", "-middle", "-right"]}.get(template.width, [""])
+                for suffix in slots:
+                    equipment.append(RackEquipmentInstanceWithTemplate(
+                        id=_uuid(rnd), rack_id=rack_id, template_id=template.id, ru_position=ru,
+                        instance_name=f"{template.model_number}-{r:03d}-{ru:02d}{suffix}", rack_side=side + suffix,
+                        ip_address=f"10.{r // 250}.{r % 250}.{ru}", equipment_templates=template,
+                    ))
+                ru += template.ru_height + rnd.choice([0, 0, 1])
+        racks.append(Rack(id=rack_id, user_id=_uuid(rnd), show_id=1, rack_name=f"Rack {r + 1:03d}", ru_height=42, equipment=equipment))
+    options = {"include_equipment_list": True, "include_power_report": True, **flags}
+    return RackPDFPayload(racks=racks, show_name="Benchmark Show", **options)
+
+
+def looms(num_cables: int, seed: int = 1, cables_per_loom: int = 24) -> LoomBuilderPDFPayload:
+    rnd = random.Random(seed)
+    result = []
+    for n in range(-(-num_cables // cables_per_loom)):
+        loom_id = _uuid(rnd)
+        count = min(cables_per_loom, num_cables - n * cables_per_loom)
+        cables = [
+            Cable(
+                id=_uuid(rnd), loom_id=loom_id, created_at=CREATED_AT,
+                label_content=f"L{n}-C{c}" if c % 5 else f"LONG-LABEL-{n}-CABLE-{c}",
+                cable_type=rnd.choice(CABLE_TYPES), length_ft=rnd.choice([3, 6, 10, 25, 50, 100, 150]),
+                origin=CableLocation(type="rack", value=f"Rack {n % 12}", end=f"Port {c + 1}"),
+                destination=CableLocation(type="rack", value=f"FOH {n % 4}", end=f"Port {c + 1}"),
+                origin_color=rnd.choice(CABLE_COLORS), destination_color=rnd.choice(CABLE_COLORS),
+                is_rcvd=rnd.random() < 0.5, is_complete=rnd.random() < 0.3,
+            )
+            for c in range(count)
+        ]
+        result.append(LoomWithCables(id=loom_id, user_id=_uuid(rnd), created_at=CREATED_AT, name=f"Loom {n + 1:04d}",
+                                     show_id=1, cables=cables))
+    return LoomBuilderPDFPayload(looms=result, show_name="Benchmark Show")
+
+
+def label_job(num_rows: int, seed: int = 1):
+    """Avery 5163 case labels with text, a colour band, a logo, a barcode and a QR code. Returns (template, stock, rows, images)."""
+    rnd = random.Random(seed)
+    stock = LabelStock(id=_uuid(rnd), name="Avery 5163", page_width=8.5, page_height=11, top_margin=0.5,
+                       left_margin=0.16, row_spacing=0, col_spacing=0.19, rows_per_page=5, cols_per_page=2,
+                       corner_radius=0.1)
+    elements = [
+        LabelElement(id="frame", type="shape", x=0.05, y=0.05, width=3.9, height=1.9, z_index=0,
+                     fill_color="transparent", stroke_color="#333333"),
+        LabelElement(id="band", type="shape", x=0.05, y=0.05, width=0.25, height=1.9, z_index=1,
+                     fill_color="#000000", fill_color_variable="color"),
+        LabelElement(id="logo", type="image", x=2.9, y=0.1, width=1.0, height=0.5, z_index=2, text_content="Show Logo"),
+        LabelElement(id="title", type="text", x=0.4, y=0.1, width=2.4, height=0.4, z_index=3, font_size=16,
+                     font_weight="bold", text_content="{case_name}"),
+        LabelElement(id="body", type="text", x=0.4, y=0.55, width=2.4, height=0.6, z_index=3, font_size=9,
+                     text_content="Send to: {send_to}\nContents: {contents}"),
+        LabelElement(id="barcode", type="barcode", x=0.4, y=1.3, width=2.2, height=0.5, z_index=5, text_content="{asset}"),
+        LabelElement(id="qr", type="qrcode", x=3.1, y=1.0, width=0.8, height=0.8, z_index=5, qr_content="showready:{asset}"),
+    ]
+    template = LabelTemplate(id=_uuid(rnd), stock_id=stock.id, name="Case", category="bench", is_public=False, elements=elements)
+    rows = [{
+        "case_name": f"CASE {i:05d}",
+        "send_to": rnd.choice(["FOH", "Stage Left", "Video World", "Monitor World"]),
+        "contents": f"SDI snake {rnd.randrange(8)}, power {rnd.randrange(4)}",
+        "asset": f"SR{i:06d}",
+        "color": rnd.choice(["red", "#1E90FF", "green", "orange", "purple"]),
+    } for i in range(num_rows)]
+    return template, stock, rows, {"__SHOW_LOGO__": _logo(seed)}
+
+
+def wire_graph(num_nodes: int, seed: int = 1, ports_per_node: int = 8):
+    """Wire diagram nodes chained rack to rack, with a few random cross links."""
+    from app.schemas.wire_export import Edge, Graph, Node, PortDef
+
+    rnd = random.Random(seed)
+    nodes = []
+    for n in range(num_nodes):
+        ports = {}
+        for p in range(ports_per_node):
+            ports[f"p{p}-in"] = PortDef(name=f"SDI In {p + 1}")
+            ports[f"p{p}-out"] = PortDef(name=f"SDI Out {p + 1}")
+        nodes.append(Node(id=f"n{n}", deviceNomenclature=f"DEV{n % 12}-{n}", modelNumber=f"MODEL-{n % 7}",
+                          rackName=f"R{n // 20}", deviceRu=(n % 40) + 1, ipAddress=f"10.0.{n // 250}.{n % 250}", ports=ports))
+    edges = []
+    for n in range(num_nodes - 1):
+        for p in range(ports_per_node // 2):
+            edges.append(Edge(source=f"n{n}", sourceHandle=f"p{p}-out", target=f"n{n + 1}", targetHandle=f"p{p}-in"))
+        if rnd.random() < 0.1:
+            target = rnd.randrange(num_nodes)
+            edges.append(Edge(source=f"n{n}", sourceHandle=f"p{ports_per_node - 1}-out", target=f"n{target}",
+                              targetHandle=f"p{ports_per_node - 1}-in"))
+    return Graph(nodes=nodes, edges=edges)
+
+
+def _crew(rnd: random.Random, num_crew: int):
+    positions = ["A1", "A2", "V1", "LD", "Stagehand", "Rigger", "Camera Op", "TD"]
+    crew = []
+    for i in range(num_crew):
+        daily = rnd.random() < 0.25
+        crew.append({
+            "id": str(_uuid(rnd)), "roster_id": str(_uuid(rnd)),
+            "first_name": f"Crew{i:03d}", "last_name": rnd.choice(["Smith", "Lee", "Garcia", "Khan", "Novak"]),
+            "position": rnd.choice(positions),
+            "rate_type": "daily" if daily else "hourly",
+            "hourly_rate": 0 if daily else rnd.choice([28, 35, 42, 55, 65]),
+            "daily_rate": rnd.choice([450, 600, 750]) if daily else 0,
+        })
+    return crew
+
+
+def _hours(rnd: random.Random) -> float:
+    return rnd.choice([0, 0, 8, 10, 10, 12, 14])
+
+
+def timesheet(num_crew: int, seed: int = 1):
+    """One week of hours for ``num_crew`` crew. Returns (user, show, timesheet_data)."""
+    rnd = random.Random(seed)
+    days = [SEASON_START + timedelta(days=i) for i in range(7)]
+    crew_hours = []
+    for member in _crew(rnd, num_crew):
+        member["hours_by_date"] = {str(d): _hours(rnd) for d in days}
+        crew_hours.append(member)
+    data = {"week_start_date": days[0], "week_end_date": days[-1], "crew_hours": crew_hours,
+            "ot_daily_threshold": 10, "ot_weekly_threshold": 40}
+    return {"first_name": "Bench", "last_name": "User"}, {"name": "Benchmark Show"}, data
+
+
+def crew_audit(num_crew: int, weeks: int, seed: int = 1):
+    """A season of daily time entries for the crew audit. Returns (user, show, audit_data)."""
+    rnd = random.Random(seed)
+    crew = []
+    entries = []
+    for member in _crew(rnd, num_crew):
+        crew.append({
+            "id": member["id"], "position": member["position"], "rate_type": member["rate_type"],
+            "hourly_rate": member["hourly_rate"], "daily_rate": member["daily_rate"],
+            "roster": {"first_name": member["first_name"], "last_name": member["last_name"]},
+        })
+        for offset in range(weeks * 7):
+            hours = _hours(rnd)
+            if hours:
+                entries.append({"show_crew_id": member["id"], "date": str(SEASON_START + timedelta(days=offset)), "hours": hours})
+    data = {"ot_rules": {"daily_threshold": 10, "weekly_threshold": 40, "start_day": 0}, "crew": crew, "entries": entries}
+    return {"first_name": "Bench", "last_name": "User"}, {"name": "Benchmark Show"}, data
+
+
+def panels(num_panels: int, seed: int = 1, slots: int = 16, connectors_per_plate: int = 6):
+    """2U D-hole panels with steck plates of mixed connectors, as fed to generate_panel_export_pdf."""
+    rnd = random.Random(seed)
+    export_data = []
+    for p in range(num_panels):
+        infra = [{"id": f"p{p}-s{i}", "name": f"D{i + 1}", "accepted_module_type": "d-hole"} for i in range(slots)]
+        mounted = []
+        for i in range(slots):
+            if rnd.random() < 0.15:
+                continue
+            sub_slots = [{"id": f"p{p}-s{i}-{k}", "name": f"D{k + 1}", "accepted_module_type": "d-hole"}
+                         for k in range(connectors_per_plate)]
+            children = [{
+                "slot_id": f"p{p}-s{i}-{k}", "label": f"IN {i * connectors_per_plate + k + 1}", "children": [],
+                "template": {"visual_style": rnd.choice(CONNECTOR_STYLES), "model_number": "NC3FD-L-1", "manufacturer": "Neutrik"},
+            } for k in range(connectors_per_plate) if rnd.random() < 0.9]
+            mounted.append({
+                "slot_id": f"p{p}-s{i}", "label": f"Plate {i + 1}", "children": children,
+                "template": {"model_number": f"STECK{connectors_per_plate}", "manufacturer": "Acme", "slot_type": "module",
+                             "panel_slots": sub_slots},
+            })
+        export_data.append({
+            "panel": {"instance_name": f"Stage Box {p + 1}", "equipment_templates": {"ru_height": 2, "slots": infra}},
+            "mounted_instances": mounted,
+        })
+    return export_data
@@ -1024,6 +1024,44 @@ $$;
 
 ALTER FUNCTION public.get_my_roles() OWNER TO postgres;
 
+--
+-- Name: get_show_bom(bigint); Type: FUNCTION; Schema: public; Owner: postgres
+--
+
+CREATE FUNCTION public.get_show_bom(p_show_id bigint) RETURNS json
+    LANGUAGE sql STABLE
+    AS $$
+    WITH show_racks AS (
+        SELECT r.id FROM public.racks r WHERE r.show_id = p_show_id
+    ),
+    rack_items AS (
+        -- Nested modules are rack_equipment_instances on the same rack as their chassis
+        SELECT rei.rack_id, 'rack' as source, et.manufacturer, et.model_number, count(*) as quantity
+        FROM show_racks sr
+        JOIN public.rack_equipment_instances rei ON rei.rack_id = sr.id
+        JOIN public.equipment_templates et ON rei.template_id = et.id
+        GROUP BY rei.rack_id, et.manufacturer, et.model_number
+    ),
+    panel_items AS (
+        SELECT rei.rack_id, 'panel' as source, pet.manufacturer, COALESCE(pet.model_number, pet.name) as model_number, count(*) as quantity
+        FROM show_racks sr
+        JOIN public.rack_equipment_instances rei ON rei.rack_id = sr.id
+        JOIN public.panel_equipment_instances pei ON pei.panel_instance_id = rei.id
+        JOIN public.panel_equipment_templates pet ON pei.template_id = pet.id
+        GROUP BY rei.rack_id, pet.manufacturer, COALESCE(pet.model_number, pet.name)
+    )
+    SELECT json_build_object(
+        'rack_ids', COALESCE((SELECT json_agg(sr.id) FROM show_racks sr), '[]'::json),
+        'items', COALESCE((
+            SELECT json_agg(i)
+            FROM (SELECT * FROM rack_items UNION ALL SELECT * FROM panel_items) i
+        ), '[]'::json)
+    );
+$$;
+
+
+ALTER FUNCTION public.get_show_bom(p_show_id bigint) OWNER TO postgres;
+
 --
 -- Name: handle_new_show(); Type: FUNCTION; Schema: public; Owner: postgres
 --
@@ -8279,6 +8317,15 @@ GRANT ALL ON FUNCTION public.get_my_roles() TO authenticated;
 GRANT ALL ON FUNCTION public.get_my_roles() TO service_role;
 
 
+--
+-- Name: FUNCTION get_show_bom(p_show_id bigint); Type: ACL; Schema: public; Owner: postgres
+--
+
+GRANT ALL ON FUNCTION public.get_show_bom(p_show_id bigint) TO anon;
+GRANT ALL ON FUNCTION public.get_show_bom(p_show_id bigint) TO authenticated;
+GRANT ALL ON FUNCTION public.get_show_bom(p_show_id bigint) TO service_role;
+
+
 --
 -- Name: FUNCTION handle_new_show(); Type: ACL; Schema: public; Owner: postgres
 --
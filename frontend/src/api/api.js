@@ -556,6 +556,8 @@ export const api = {
         body: JSON.stringify(payload), 
     }).then(handleResponse),
 
+    getCommunicationJob: async (jobId) => fetch(`/api/communications/jobs/${jobId}`, { headers: await getAuthHeader() }).then(handleResponse),
+
     // --- Admin RBAC ---
     getAllFeatureRestrictions: async () => fetch('/api/admin/feature_restrictions', { headers: await getAuthHeader() }).then(handleResponse),
     
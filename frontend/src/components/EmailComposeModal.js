@@ -169,7 +169,21 @@ const EmailComposeModal = ({ isOpen, onClose, recipients, category, showId, week
                     subject: finalSubject,
                     body: finalBody
                 };
-                await api.sendCommunication(payload);
+                let job = await api.sendCommunication(payload);
+                while (job.status === 'queued' || job.status === 'running') {
+                    toast.loading(`Sending emails... ${job.sent || 0} of ${job.total}`, { id: toastId });
+                    await new Promise(resolve => setTimeout(resolve, 1000));
+                    job = await api.getCommunicationJob(job.job_id);
+                }
+                if (job.status === 'failed') {
+                    throw new Error(job.error || 'No emails could be sent.');
+                }
+                if (job.failed || job.skipped) {
+                    const problems = job.results.filter(r => r.status === 'failed' || r.status === 'skipped');
+                    toast.error(`Sent ${job.sent} of ${job.total}. Not sent: ${problems.map(r => r.email || r.recipient_id).join(', ')}`, { id: toastId, duration: 8000 });
+                    onClose();
+                    return;
+                }
             }
             
             toast.success("Emails sent successfully!", { id: toastId });
@@ -95,7 +95,11 @@ const HoursTrackingView = () => {
                 })
             };
 
-            await api.updateWeeklyTimesheet(showId, cleanTimesheet);
+            // The save returns the week's new version; keep it so the next save isn't seen as stale
+            const result = await api.updateWeeklyTimesheet(showId, cleanTimesheet);
+            if (result.version) {
+                setTimesheet(prev => ({ ...prev, version: result.version }));
+            }
             toast.success('Timesheet saved successfully.');
         } catch (error) { 
             console.error("Failed to save timesheet:", error); 
@@ -0,0 +1,168 @@
+import re
+
+import pytest
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """
+    One ``supabase.table(...)`` or ``supabase.rpc(...)`` call chain.
+
+    Filters and ordering are applied when the query executes, like PostgREST:
+    filters first, then ``order``, ``limit`` and finally the client's row cap.
+    Writes (``upsert``, ``insert``, ``update``, ``delete``) are recorded but not applied.
+    """
+
+    def __init__(self, client, table, op="select", payload=None):
+        self.client = client
+        self.table = table
+        self.op = op
+        self.payload = payload
+        self.filters = []  # (method, column, value) in call order
+        self._orders = []
+        self._limit = None
+
+    def select(self, columns="*"):
+        self.columns = columns
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op, self.payload = "upsert", rows
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def update(self, values):
+        self.op, self.payload = "update", values
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def in_(self, column, values):
+        return self._filter("in_", column, values)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def or_(self, expression):
+        return self._filter("or_", None, expression)
+
+    def order(self, column, desc=False):
+        self._orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def execute(self):
+        self.client.queries.append(self)
+        if self.op == "rpc":
+            data = self.client.rpcs[self.table]
+            return FakeResponse(data(self.payload) if callable(data) else data)
+        if self.op != "select":
+            return FakeResponse(self.payload if self.op in ("upsert", "insert") else [])
+
+        rows = [r for r in self.client.tables.get(self.table, []) if all(_matches(r, f) for f in self.filters)]
+        for column, desc in reversed(self._orders):
+            rows.sort(key=lambda r: r[column], reverse=desc)
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        if self.client.max_rows is not None:
+            rows = rows[:self.client.max_rows]
+        return FakeResponse(rows)
+
+    def _filter(self, method, column, value):
+        self.filters.append((method, column, value))
+        return self
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for a Supabase client: ``tables`` maps table names to row
+    dicts and ``rpcs`` maps function names to a result or a ``params -> result``
+    callable. ``max_rows`` caps every select like PostgREST's db-max-rows setting.
+    Every executed query is kept in ``queries``.
+    """
+
+    def __init__(self, tables=None, rpcs=None, max_rows=None):
+        self.tables = tables or {}
+        self.rpcs = rpcs or {}
+        self.max_rows = max_rows
+        self.queries = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeQuery(self, name, op="rpc", payload=params)
+
+    @property
+    def tables_read(self):
+        return [q.table for q in self.queries]
+
+
+_COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _matches(row, condition) -> bool:
+    method, column, value = condition
+    if method == "in_":
+        return row[column] in value
+    if method == "or_":
+        return any(_matches_term(row, term) for term in _split_terms(value))
+    return _COMPARISONS[method](row[column], value)
+
+
+def _matches_term(row, term: str) -> bool:
+    """One term of a PostgREST ``or=(...)`` expression: ``col.op.value`` or ``and(term,term)``."""
+    nested = re.fullmatch(r"(and|or)\((.*)\)", term)
+    if nested:
+        results = [_matches_term(row, t) for t in _split_terms(nested.group(2))]
+        return all(results) if nested.group(1) == "and" else any(results)
+    column, op, value = term.split(".", 2)
+    current = row[column]
+    return _COMPARISONS[op](current, type(current)(value))
+
+
+def _split_terms(expression: str):
+    terms, depth, start = [], 0, 0
+    for i, char in enumerate(expression):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            terms.append(expression[start:i])
+            start = i + 1
+    terms.append(expression[start:])
+    return terms
+
+
+@pytest.fixture
+def fake_supabase():
+    """The :class:`FakeSupabase` class, for tests that build clients over their own rows."""
+    return FakeSupabase
@@ -0,0 +1,79 @@
+import csv
+import io
+
+from app.services.bom import BomCache, bom_csv, bom_table
+
+
+def _item(rack, source, manufacturer, model, quantity):
+    return {"rack_id": rack, "source": source, "manufacturer": manufacturer, "model_number": model, "quantity": quantity}
+
+
+_BOMS = {
+    7: {"rack_ids": ["r1", "r2", "r3"], "items": [
+        _item("r1", "rack", "Yamaha", "Rio3224", 1), _item("r2", "rack", "Yamaha", "Rio3224", 2),
+        _item("r1", "rack", "Shure", "ULXD4Q", 2), _item("r2", "rack", None, "Blank", 3),
+        _item("r1", "panel", "Neutrik", "NC3FD-LX", 16), _item("r2", "panel", "Neutrik", "NC3FD-LX", 8),
+    ]},
+    8: {"rack_ids": [], "items": []},
+}
+
+
+def _shows(fake_supabase):
+    return fake_supabase(rpcs={"get_show_bom": lambda params: _BOMS[params["p_show_id"]]})
+
+
+def test_rows_are_summed_across_racks_and_ordered_like_the_equipment_list(fake_supabase):
+    rows = BomCache().rows(_shows(fake_supabase), 7)
+    assert [(r["source"], r["manufacturer"], r["model_number"], r["quantity"]) for r in rows] == [
+        ("rack", "N/A", "Blank", 3),
+        ("rack", "Shure", "ULXD4Q", 2),
+        ("rack", "Yamaha", "Rio3224", 3),
+        ("panel", "Neutrik", "NC3FD-LX", 24),
+    ]
+
+
+def test_rows_can_be_limited_to_racks_and_sources(fake_supabase):
+    rows = BomCache().rows(_shows(fake_supabase), 7, rack_ids=["r1"], sources=("rack",))
+    assert bom_table(rows, with_source=False) == [
+        ["Manufacturer", "Model Name", "Qty"], ["Shure", "ULXD4Q", "2"], ["Yamaha", "Rio3224", "1"],
+    ]
+
+
+def test_csv_has_one_line_per_row(fake_supabase):
+    rows = BomCache().rows(_shows(fake_supabase), 7)
+    lines = list(csv.reader(io.StringIO(bom_csv(rows))))
+    assert lines[0] == ["Manufacturer", "Model Name", "Type", "Qty"]
+    assert lines[-1] == ["Neutrik", "NC3FD-LX", "Panel Component", "24"]
+
+
+def test_show_is_cached_until_one_of_its_racks_changes(fake_supabase):
+    supabase = _shows(fake_supabase)
+    cache = BomCache()
+    cache.rows(supabase, 7)
+    cache.rows(supabase, 8)
+    cache.rows(supabase, 7)
+    assert [q.payload["p_show_id"] for q in supabase.queries] == [7, 8]
+
+    cache.invalidate(rack_id="r3")
+    cache.rows(supabase, 7)
+    cache.rows(supabase, 8)
+    assert [q.payload["p_show_id"] for q in supabase.queries] == [7, 8, 7]
+
+    cache.clear()
+    cache.rows(supabase, 8)
+    assert [q.payload["p_show_id"] for q in supabase.queries] == [7, 8, 7, 8]
+
+
+def test_racks_the_bom_does_not_know_reload_it_once(fake_supabase):
+    boms = {7: {"rack_ids": ["r1"], "items": [_item("r1", "rack", "Shure", "ULXD4Q", 2)]}}
+    supabase = fake_supabase(rpcs={"get_show_bom": lambda params: boms[params["p_show_id"]]})
+    cache = BomCache()
+    cache.rows(supabase, 7)
+
+    # A rack added through another worker shows up after one reload
+    boms[7] = {"rack_ids": ["r1", "r2"], "items": boms[7]["items"] + [_item("r2", "rack", "Shure", "ULXD4Q", 1)]}
+    assert [r["quantity"] for r in cache.rows(supabase, 7, rack_ids=["r1", "r2"])] == [3]
+
+    # A rack it still doesn't know means the caller has to fall back to its own data
+    assert cache.rows(supabase, 7, rack_ids=["r1", "gone"]) is None
+    assert len(supabase.queries) == 3
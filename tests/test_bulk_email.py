@@ -0,0 +1,170 @@
+import smtplib
+import socketserver
+import threading
+import time
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.services.bulk_email import BulkEmailManager
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, RSET and QUIT."""
+
+    def handle(self):
+        stub = self.server
+        with stub.lock:
+            stub.connections += 1
+        self._reply("220 stub ready")
+        sent_here = 0
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub", "250 AUTH PLAIN")
+            elif verb == "AUTH":
+                with stub.lock:
+                    stub.logins += 1
+                self._reply("235 ok")
+            elif verb == "RCPT":
+                address = line.split("<", 1)[1].rstrip(">")
+                self._reply("550 no such user" if address in stub.rejected else "250 ok")
+            elif verb == "DATA":
+                if stub.drop_after and sent_here >= stub.drop_after:
+                    return  # hang up mid-session
+                self._reply("354 go ahead")
+                while self.rfile.readline().rstrip(b"\r\n") != b".":
+                    pass
+                sent_here += 1
+                with stub.lock:
+                    stub.delivered += 1
+                self._reply("250 queued")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:  # MAIL, RSET, NOOP
+                self._reply("250 ok")
+
+    def _reply(self, *lines):
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+
+class _StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rejected=(), drop_after=0):
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.rejected = set(rejected)
+        self.drop_after = drop_after
+        self.connections = self.logins = self.delivered = 0
+
+
+@pytest.fixture
+def stub_smtp():
+    servers = []
+
+    def start(**kwargs):
+        server = _StubSMTPServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        def connect():
+            client = smtplib.SMTP("127.0.0.1", server.server_address[1], timeout=5)
+            client.login("user", "secret")
+            return client
+        return server, connect
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _recipients(count, missing=()):
+    recipients = []
+    for i in range(count):
+        email = None if i in missing else f"crew{i}@example.com"
+        message = None
+        if email:
+            message = MIMEText(f"Hi crew {i}", "html")
+            message["From"], message["To"], message["Subject"] = "PM <pm@example.com>", email, "Call times"
+        recipients.append({"recipient_id": f"r{i}", "email": email, "message": message})
+    return recipients
+
+
+def _wait(manager, job):
+    deadline = time.time() + 10
+    while job.status in ("queued", "running"):
+        assert time.time() < deadline, "bulk email job did not finish"
+        time.sleep(0.01)
+    return manager.get(job.id, "owner")
+
+
+def test_each_batch_reuses_one_login(stub_smtp):
+    server, connect = stub_smtp()
+    manager = BulkEmailManager(workers=1, connections=3, batch_size=50)
+    job = _wait(manager, manager.submit("owner", connect, _recipients(150, missing={7})))
+
+    assert job.status == "done"
+    assert (job.count("sent"), job.count("skipped"), job.count("failed")) == (149, 1, 0)
+    assert (server.connections, server.logins, server.delivered) == (3, 3, 149)
+    assert job.results[7].recipient_id == "r7" and job.results[7].status == "skipped"
+    assert manager.get(job.id, "someone-else") is None
+
+
+def test_refused_recipients_are_reported_without_dropping_the_session(stub_smtp):
+    server, connect = stub_smtp(rejected={"crew2@example.com"})
+    manager = BulkEmailManager(workers=1, connections=2, batch_size=10)
+    job = _wait(manager, manager.submit("owner", connect, _recipients(5)))
+
+    assert [r.status for r in job.results] == ["sent", "sent", "failed", "sent", "sent"]
+    assert "no such user" in job.results[2].error
+    assert server.logins == 1
+
+
+def test_a_dropped_session_is_reopened_once(stub_smtp):
+    server, connect = stub_smtp(drop_after=3)
+    manager = BulkEmailManager(workers=1, connections=1, batch_size=10)
+    job = _wait(manager, manager.submit("owner", connect, _recipients(8)))
+
+    # 3 go out, the server hangs up, 3 more go out on the second session, then the batch gives up
+    assert [r.status for r in job.results] == ["sent"] * 6 + ["failed"] * 2
+    assert server.logins == 2 and server.delivered == 6
+    assert job.status == "done"
+
+
+class _FlakySession:
+    """A session whose socket times out on the given message numbers (counted across sessions)."""
+
+    def __init__(self, log, timeouts):
+        self.log = log
+        self.timeouts = timeouts
+        self.closed = False
+        log.append("connect")
+
+    def send_message(self, message):
+        assert not self.closed
+        self.log.append(message["To"])
+        if len([e for e in self.log if e != "connect"]) in self.timeouts:
+            raise TimeoutError("timed out")
+
+    def close(self):
+        self.closed = True
+
+    def quit(self):
+        self.closed = True
+
+
+def test_a_socket_error_reconnects_instead_of_failing_the_recipient():
+    log = []
+    manager = BulkEmailManager(workers=1, connections=1, batch_size=10)
+    job = _wait(manager, manager.submit("owner", lambda: _FlakySession(log, timeouts={2}), _recipients(3)))
+
+    assert [r.status for r in job.results] == ["sent"] * 3
+    assert log == ["connect", "crew0@example.com", "crew1@example.com",
+                   "connect", "crew1@example.com", "crew2@example.com"]
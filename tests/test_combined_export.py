@@ -0,0 +1,58 @@
+import io
+import uuid
+
+from pypdf import PdfReader
+
+from app.models import EquipmentTemplate, Rack, RackEquipmentInstanceWithTemplate, RackPDFPayload
+from app.pdf_utils import combined_rack_sections, generate_combined_rack_pdf, generate_equipment_list_pdf, generate_power_report_pdf, generate_racks_pdf
+from app.services.render_executor import RenderExecutor
+
+
+def _payload(num_racks=2, **flags):
+    templates = [EquipmentTemplate(model_number=f"M{i}", manufacturer="Acme", ru_height=1 + i % 2, power_consumption_watts=150)
+                 for i in range(3)]
+    racks = []
+    for r in range(num_racks):
+        rack_id = uuid.uuid4()
+        equipment = [
+            RackEquipmentInstanceWithTemplate(id=uuid.uuid4(), rack_id=rack_id, template_id=t.id, ru_position=1 + 3 * i,
+                                              instance_name=f"{t.model_number}-{r}", rack_side="front", equipment_templates=t)
+            for i, t in enumerate(templates)
+        ]
+        racks.append(Rack(id=rack_id, user_id=uuid.uuid4(), rack_name=f"Rack {r}", ru_height=12, equipment=equipment))
+    return RackPDFPayload(racks=racks, show_name="Test Show", **flags)
+
+
+def _page_texts(pdf_bytes):
+    return [page.extract_text() for page in PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+def test_sections_are_listed_in_document_order():
+    payload = _payload(include_equipment_list=True, include_power_report=True)
+    assert [fn for fn, _args in combined_rack_sections(payload)] == [generate_racks_pdf, generate_equipment_list_pdf, generate_power_report_pdf]
+
+
+def test_parallel_sections_match_sequential_render():
+    payload = _payload(include_equipment_list=True, include_power_report=True)
+    sequential = generate_combined_rack_pdf(payload).getvalue()
+    executor = RenderExecutor(workers=2, max_queue=4, timeout=60)
+    try:
+        parallel = generate_combined_rack_pdf(payload, executor=executor).getvalue()
+    finally:
+        executor.shutdown()
+    assert _page_texts(parallel) == _page_texts(sequential)
+    assert "Manufacturer" in _page_texts(sequential)[-2]
+
+
+def test_empty_selection_renders_placeholder_page():
+    payload = _payload(include_front_rear=False, include_side_view=False)
+    assert "No data selected" in _page_texts(generate_combined_rack_pdf(payload).getvalue())[0]
+
+
+def test_rack_frames_and_equipment_faces_are_stamped_from_shared_forms():
+    small = generate_racks_pdf(_payload(num_racks=2)).getvalue()
+    large = generate_racks_pdf(_payload(num_racks=8)).getvalue()
+    assert small.count(b"/Subtype /Form") > 0
+    # Same rack heights and templates: more racks stamp the same forms instead of adding new ones.
+    assert large.count(b"/Subtype /Form") == small.count(b"/Subtype /Form")
+    assert len(PdfReader(io.BytesIO(large)).pages) == 16
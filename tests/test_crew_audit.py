@@ -0,0 +1,52 @@
+from datetime import date
+
+from app.pdf_utils import crew_audit_weeks
+from app.utils import timesheet_utils
+from app.utils.timesheet_utils import fetch_audit_entries
+
+
+def _entries(*days):
+    return [{"date": d, "hours": h} for d, h in days]
+
+
+def test_hourly_days_over_the_daily_threshold_and_weeks_over_the_weekly_threshold():
+    # Mon-Fri of one week at 12h, then a Monday in the next week
+    entries = _entries(*[(f"2026-01-{d:02d}", 12) for d in range(5, 10)], ("2026-01-12", 4))
+    weeks = crew_audit_weeks(list(reversed(entries)), "hourly", 20, 0, 10, 40, start_day=0)
+    assert weeks == [
+        # 50 daily-regular hours, 10 of them over the weekly threshold; those are topped up to 1.5x
+        (date(2026, 1, 5), 40, 20, 50 * 20 + 10 * 30 + 10 * 10),
+        (date(2026, 1, 12), 4, 0, 80),
+    ]
+
+
+def test_daily_rate_ot_uses_the_implied_hourly_rate():
+    weeks = crew_audit_weeks(_entries(("2026-01-07", 12)), "daily", 0, 500, 10, 40, start_day=0)
+    assert weeks == [(date(2026, 1, 5), 10, 2, 500 + 2 * 50 * 1.5)]
+
+
+def test_pay_weeks_start_on_the_configured_day():
+    entries = _entries(("2026-01-06", 8), ("2026-01-07", 8), ("2026-01-08", 8))  # Tue, Wed, Thu
+    weeks = crew_audit_weeks(entries, "hourly", 10, 0, 10, 40, start_day=2)
+    assert [(w, reg) for w, reg, _ot, _cost in weeks] == [(date(2025, 12, 31), 8), (date(2026, 1, 7), 16)]
+    assert crew_audit_weeks([], "hourly", 10, 0, 10, 40, start_day=0) == []
+
+
+def test_audit_entries_are_paged_by_date_and_id(monkeypatch, fake_supabase):
+    monkeypatch.setattr(timesheet_utils, "AUDIT_PAGE_SIZE", 10)
+    # Three crew on every day, so each capped page of 4 rows ends part-way through a date
+    rows = [{"id": f"e{day}{crew}", "show_crew_id": f"c{crew}", "date": f"2026-01-0{day}", "hours": 8}
+            for day in range(1, 8) for crew in range(3)]
+    rows.append({"id": "x1", "show_crew_id": "other", "date": "2026-01-03", "hours": 8})
+    supabase = fake_supabase({"timesheet_entries": list(reversed(rows))}, max_rows=4)
+
+    entries = fetch_audit_entries(supabase, ["c0", "c1", "c2"], date(2026, 1, 2), date(2026, 1, 6))
+
+    expected = [r for r in rows if r["show_crew_id"] != "other" and "2026-01-02" <= r["date"] <= "2026-01-06"]
+    assert [e["id"] for e in entries] == [r["id"] for r in expected]
+    assert len({e["id"] for e in entries}) == len(entries) == 15
+    # 15 rows in pages of at most 4, then the empty page that ends the read
+    assert len(supabase.queries) == 5
+    cursors = [f[2] for q in supabase.queries for f in q.filters if f[0] == "or_"]
+    assert cursors[0] == "date.gt.2026-01-03,and(date.eq.2026-01-03,id.gt.e30)"
+    assert len(cursors) == 4
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from app.services.export_jobs import ExportJobManager, ExportQueueFull
+
+
+def _wait(manager, job_id, user_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id, user_id)
+        if job.status in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("export job did not finish")
+
+
+def _fake_export(pages, progress=None):
+    for page in range(1, pages + 1):
+        if progress:
+            progress(page, pages)
+    return b"%PDF-fake"
+
+
+def test_job_reports_progress_and_result():
+    manager = ExportJobManager(workers=1, max_pending=4)
+    job = manager.submit("test", "user-1", "out.pdf", _fake_export, 3)
+    job = _wait(manager, job.id, "user-1")
+    assert job.status == "done"
+    assert job.result == b"%PDF-fake"
+    assert (job.pages_done, job.pages_total) == (3, 3)
+
+
+def test_job_is_private_to_its_owner():
+    manager = ExportJobManager(workers=1, max_pending=4)
+    job = manager.submit("test", "user-1", "out.pdf", _fake_export, 1)
+    assert manager.get(job.id, "user-2") is None
+
+
+def test_failed_job_records_error():
+    def boom(progress=None):
+        raise RuntimeError("no pages")
+
+    manager = ExportJobManager(workers=1, max_pending=4)
+    job = manager.submit("test", "user-1", "out.pdf", boom)
+    job = _wait(manager, job.id, "user-1")
+    assert job.status == "failed"
+    assert "no pages" in job.error
+
+
+def test_queue_is_bounded():
+    def slow(progress=None):
+        time.sleep(0.2)
+        return b""
+
+    manager = ExportJobManager(workers=1, max_pending=1)
+    manager.submit("test", "user-1", "a.pdf", slow)
+    with pytest.raises(ExportQueueFull):
+        manager.submit("test", "user-1", "b.pdf", slow)
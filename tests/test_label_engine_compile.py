@@ -0,0 +1,46 @@
+import uuid
+
+from app.LE_pdf_utils import CompiledTemplate, compile_placeholders, substitute, render_template_to_buffer
+from app.models import LabelElement, LabelStock, LabelTemplate
+
+
+def test_substitution_plan_matches_placeholders():
+    plan = compile_placeholders("Case {num} of {total} - {num}")
+    assert plan == ["Case ", "num", " of ", "total", " - ", "num", ""]
+    assert substitute(plan, {"num": 3, "total": 9}) == "Case 3 of 9 - 3"
+    assert substitute(plan, {"num": 3}) == "Case 3 of  - 3"
+    assert substitute(compile_placeholders("STATIC"), {"num": 1}) == "STATIC"
+
+
+def test_template_compiles_once_sorted_by_z_index():
+    stock = LabelStock(id=uuid.uuid4(), name="s", page_width=4, page_height=2, top_margin=0, left_margin=0,
+                       row_spacing=0, col_spacing=0, rows_per_page=1, cols_per_page=1, corner_radius=0)
+    template = LabelTemplate(id=uuid.uuid4(), stock_id=stock.id, name="t", category="c", is_public=False, elements=[
+        LabelElement(id="top", type="text", x=0, y=0, width=1, height=1, z_index=2, text_content="{a}", font_weight="bold"),
+        LabelElement(id="bottom", type="shape", x=0, y=0, width=1, height=1, z_index=0),
+        LabelElement(id="static", type="text", x=0, y=0, width=1, height=1, z_index=1, text_content="FRAGILE"),
+    ])
+    compiled = CompiledTemplate(template, stock)
+    assert [e.element.id for e in compiled.elements] == ["bottom", "static", "top"]
+    assert compiled.elements[2].font_name == "SpaceMono-Bold"
+    assert compiled.elements[1].is_static and not compiled.elements[2].is_static
+
+
+def _code_job(element, num_rows=20):
+    stock = LabelStock(id=uuid.uuid4(), name="s", page_width=8.5, page_height=11, top_margin=0.5, left_margin=0.25,
+                       row_spacing=0, col_spacing=0.25, rows_per_page=5, cols_per_page=2, corner_radius=0)
+    template = LabelTemplate(id=uuid.uuid4(), stock_id=stock.id, name="t", category="c", is_public=False, elements=[element])
+    return template, stock, [{"asset": f"SR{i:04d}", "show": "42"} for i in range(num_rows)]
+
+
+def test_repeated_qr_code_is_stamped_from_one_form():
+    qr_element = LabelElement(id="qr", type="qrcode", x=0.1, y=0.1, width=0.8, height=0.8, qr_content="https://example.com/{show}")
+    pdf = render_template_to_buffer(*_code_job(qr_element)).getvalue()
+    assert pdf.count(b"/Subtype /Form") == 1
+
+
+def test_unique_barcodes_are_drawn_inline(capsys):
+    barcode = LabelElement(id="bc", type="barcode", x=0.1, y=0.1, width=2, height=0.5, text_content="{asset}")
+    pdf = render_template_to_buffer(*_code_job(barcode)).getvalue()
+    assert pdf.count(b"/Subtype /Form") == 0
+    assert "Barcode Error" not in capsys.readouterr().out
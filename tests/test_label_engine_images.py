@@ -0,0 +1,41 @@
+import io
+import uuid
+import base64
+
+from PIL import Image
+
+from app.LE_pdf_utils import render_template_to_buffer
+from app.models import LabelElement, LabelStock, LabelTemplate
+
+
+def _png(color="red"):
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _job(num_rows=30):
+    stock = LabelStock(id=uuid.uuid4(), name="2x5", page_width=8.5, page_height=11, top_margin=0.5, left_margin=0.25,
+                       row_spacing=0, col_spacing=0.25, rows_per_page=5, cols_per_page=2, corner_radius=0)
+    template = LabelTemplate(id=uuid.uuid4(), stock_id=stock.id, name="Logo", category="test", is_public=False, elements=[
+        LabelElement(id="logo", type="image", x=0.1, y=0.1, width=1.5, height=0.75, text_content="Show Logo"),
+        LabelElement(id="name", type="text", x=1.8, y=0.1, width=2, height=0.5, text_content="{name}"),
+    ])
+    rows = [{"name": f"Case {i}"} for i in range(num_rows)]
+    return template, stock, rows
+
+
+def test_job_image_is_embedded_once():
+    template, stock, rows = _job()
+    pdf = render_template_to_buffer(template, stock, rows, images={"__SHOW_LOGO__": _png()}).getvalue()
+    assert pdf.count(b"/Subtype /Image") == 1
+    assert pdf.count(b"/Subtype /Form") == 1
+
+
+def test_row_level_base64_images_are_still_drawn():
+    template, stock, rows = _job(4)
+    logo_b64 = base64.b64encode(_png("blue")).decode("utf-8")
+    for row in rows:
+        row["__SHOW_LOGO__"] = logo_b64
+    pdf = render_template_to_buffer(template, stock, rows).getvalue()
+    assert pdf.count(b"/Subtype /Image") == 1
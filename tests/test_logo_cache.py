@@ -0,0 +1,96 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.logo_cache import LogoCache, decoded_image
+
+
+class _FakeBucket:
+    def __init__(self, files):
+        self.files = files
+        self.downloads = 0
+
+    def download(self, path):
+        self.downloads += 1
+        if path not in self.files:
+            raise PermissionError(f"{path} is not readable by this user")  # like the bucket's policies
+        return self.files[path]
+
+
+class _FakeSupabase:
+    def __init__(self, files):
+        self.bucket = _FakeBucket(files)
+        self.storage = self
+
+    def from_(self, name):
+        assert name == "logos"
+        return self.bucket
+
+
+def _png(color="red"):
+    buf = io.BytesIO()
+    Image.new("RGB", (4, 2), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def test_fetch_downloads_once_per_path():
+    supabase = _FakeSupabase({"u/a.png": _png()})
+    cache = LogoCache()
+    first = cache.fetch(supabase, "u/a.png", "owner")
+    second = cache.fetch(supabase, "u/a.png", "owner")
+    assert first is second
+    assert supabase.bucket.downloads == 1
+    assert first.b64 == cache.fetch(supabase, "u/a.png", "owner").b64
+
+
+def test_invalidate_forces_a_fresh_download():
+    supabase = _FakeSupabase({"u/a.png": _png("red")})
+    cache = LogoCache()
+    cache.download(supabase, "u/a.png", "owner")
+    supabase.bucket.files["u/a.png"] = _png("blue")
+    cache.invalidate("u/a.png")
+    assert cache.download(supabase, "u/a.png", "owner") == _png("blue")
+    assert supabase.bucket.downloads == 2
+
+
+def test_cache_is_bounded_by_bytes():
+    logo = _png()
+    supabase = _FakeSupabase({f"u/{i}.png": logo for i in range(3)})
+    cache = LogoCache(max_bytes=len(logo) * 2)
+    for i in range(3):
+        cache.download(supabase, f"u/{i}.png", "owner")
+    assert len(cache) == 2
+    assert cache.get("u/0.png") is None
+
+
+def test_cached_logo_is_not_served_to_users_who_cannot_read_it():
+    cache = LogoCache()
+    cache.fetch(_FakeSupabase({"u/a.png": _png()}), "u/a.png", "owner")
+
+    outsider = _FakeSupabase({})
+    with pytest.raises(PermissionError):
+        cache.fetch(outsider, "u/a.png", "outsider")
+    assert outsider.bucket.downloads == 1
+
+    collaborator = _FakeSupabase({"u/a.png": _png()})
+    cache.fetch(collaborator, "u/a.png", "collaborator")
+    cache.fetch(collaborator, "u/a.png", "collaborator")
+    assert collaborator.bucket.downloads == 1
+
+
+def test_readers_re_prove_access_after_the_access_ttl():
+    cache = LogoCache(access_ttl_seconds=60)
+    cache.fetch(_FakeSupabase({"u/a.png": _png()}), "u/a.png", "collaborator")
+
+    # Access is revoked through another worker; once the proof is stale the bucket is asked again
+    cache.get("u/a.png").readers["collaborator"] -= 61
+    with pytest.raises(PermissionError):
+        cache.fetch(_FakeSupabase({}), "u/a.png", "collaborator")
+
+
+def test_decoded_image_is_shared_by_content():
+    data = _png()
+    reader = decoded_image(data)
+    assert decoded_image(bytes(data)) is reader
+    assert reader.getSize() == (4, 2)
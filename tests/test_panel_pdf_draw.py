@@ -0,0 +1,27 @@
+import io
+
+from reportlab.pdfgen import canvas
+
+from app.utils.panel_pdf_draw import draw_svg_face
+
+
+def _render(styles):
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for i, style in enumerate(styles):
+        draw_svg_face(c, 40 + (i % 10) * 50, 700 - (i // 10) * 60, style)
+    c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_each_connector_face_is_defined_once():
+    pdf = _render(["xlr_f"] * 24 + ["empty"] * 4 + ["ethercon"] * 8)
+    assert pdf.count(b"/Subtype /Form") == 3
+    assert pdf.count(b"/Type /XObject") == 3
+
+
+def test_faces_with_shared_artwork_share_a_form():
+    pdf = _render(["true1", "true1_in", "powercon_blue", "powercon_white", "mystery", "standard"])
+    # true1 / powercon / plain flange
+    assert pdf.count(b"/Subtype /Form") == 3
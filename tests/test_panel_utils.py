@@ -0,0 +1,45 @@
+from app.utils.panel_utils import build_panel_tree, fetch_panel_trees
+
+
+def _pe(id, panel="p1", parent=None):
+    return {"id": id, "panel_instance_id": panel, "parent_instance_id": parent}
+
+
+def test_tree_nests_children_in_order():
+    items = [_pe("b", parent="a"), _pe("a"), _pe("c", parent="b"), _pe("d", parent="a"), _pe("e")]
+    roots = build_panel_tree(items)
+    assert [r["id"] for r in roots] == ["a", "e"]
+    assert [c["id"] for c in roots[0]["children"]] == ["b", "d"]
+    assert [c["id"] for c in roots[0]["children"][0]["children"]] == ["c"]
+    assert roots[1]["children"] == []
+
+
+def test_orphans_are_dropped_unless_requested():
+    assert [r["id"] for r in build_panel_tree([_pe("a"), _pe("x", parent="gone")])] == ["a"]
+    assert [r["id"] for r in build_panel_tree([_pe("a"), _pe("x", parent="gone")], orphans_as_roots=True)] == ["a", "x"]
+
+
+def test_trees_for_all_panels_come_from_one_batched_read(fake_supabase):
+    supabase = fake_supabase({"panel_equipment_instances": [_pe("a", "p1"), _pe("b", "p1", parent="a"), _pe("c", "p2"), _pe("z", "p3")]})
+    trees = fetch_panel_trees(supabase, ["p1", "p2", "p4"])
+    assert [q.filters for q in supabase.queries] == [[("in_", "panel_instance_id", ["p1", "p2", "p4"])],
+                                                      [("in_", "panel_instance_id", ["p1", "p2", "p4"]), ("gt", "id", "c")]]
+    assert [r["id"] for r in trees["p1"]] == ["a"]
+    assert [c["id"] for c in trees["p1"][0]["children"]] == ["b"]
+    assert [r["id"] for r in trees["p2"]] == ["c"]
+    assert trees["p4"] == []
+
+
+def test_a_server_row_cap_does_not_drop_components(fake_supabase):
+    items = [_pe(f"i{n:02d}", f"p{n % 3}", parent=f"i{n - 3:02d}" if n >= 3 else None) for n in range(25)]
+    supabase = fake_supabase({"panel_equipment_instances": items}, max_rows=4)
+    trees = fetch_panel_trees(supabase, ["p0", "p1", "p2"])
+
+    assert len(supabase.queries) == 8  # 7 pages of up to 4 rows, then the empty one
+    for panel in range(3):
+        chain, node = [], trees[f"p{panel}"]
+        while node:
+            assert len(node) == 1
+            chain.append(node[0]["id"])
+            node = node[0]["children"]
+        assert chain == [f"i{n:02d}" for n in range(panel, 25, 3)]
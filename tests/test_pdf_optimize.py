@@ -0,0 +1,82 @@
+import io
+import time
+
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from app.services.export_jobs import ExportJobManager
+from app.services.pdf_optimize import optimize_pdf
+
+
+def _logo(size=(1600, 800)):
+    buf = io.BytesIO()
+    Image.effect_mandelbrot(size, (-2, -1, 1, 1), 40).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _pdf(pages=2, logo_width=100, progress=None):
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    logo = ImageReader(io.BytesIO(_logo()))
+    for page in range(pages):
+        c.drawImage(logo, 72, 700, width=logo_width, height=logo_width / 2)
+        c.drawString(72, 650, f"Page {page + 1}")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_images_are_downsampled_to_their_drawn_size():
+    original = _pdf()
+    optimized, report = optimize_pdf(original, image_dpi=144)
+    assert report.images_downsampled == 1
+    assert report.bytes_saved == len(original) - len(optimized) > 0
+
+    reader = PdfReader(io.BytesIO(optimized))
+    assert [page.extract_text().strip() for page in reader.pages] == ["Page 1", "Page 2"]
+    image = next(iter(reader.pages[0]["/Resources"]["/XObject"].values())).get_object()
+    # 100pt wide at 144 dpi
+    assert (image["/Width"], image["/Height"]) == (200, 100)
+
+
+def test_images_already_at_target_resolution_are_kept():
+    _optimized, report = optimize_pdf(_pdf(logo_width=800), image_dpi=144)
+    assert report.images_downsampled == 0
+
+
+def test_background_job_reports_bytes_saved():
+    manager = ExportJobManager(workers=1, max_pending=4)
+    job = manager.submit("test", "user-1", "out.pdf", _pdf, 2, optimize=True)
+    deadline = time.time() + 30
+    while job.status not in ("done", "failed") and time.time() < deadline:
+        time.sleep(0.05)
+    assert job.status == "done"
+    assert job.bytes_saved > 0
+    assert len(job.result) + job.bytes_saved == len(_pdf(2))
+
+
+def test_repeated_logos_are_merged_and_streams_recompressed():
+    logo = ImageReader(io.BytesIO(_logo((400, 200))))
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pageCompression=0)
+    c.drawImage(logo, 72, 700, width=100, height=50)
+    c.drawString(72, 650, "Rack A " * 40)
+    c.save()
+    section = buf.getvalue()
+
+    merged = PdfWriter()
+    for _ in range(3):
+        merged.append(PdfReader(io.BytesIO(section)))
+    out = io.BytesIO()
+    merged.write(out)
+
+    optimized, report = optimize_pdf(out.getvalue(), image_dpi=1000)
+    assert report.duplicate_objects_removed > 0
+    assert report.streams_recompressed > 0
+    reader = PdfReader(io.BytesIO(optimized))
+    assert [page.extract_text().startswith("Rack A") for page in reader.pages] == [True] * 3
+    images = {page["/Resources"]["/XObject"].raw_get(name).idnum
+              for page in reader.pages for name in page["/Resources"]["/XObject"]}
+    assert len(images) == 1
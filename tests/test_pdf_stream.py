@@ -0,0 +1,100 @@
+import io
+import uuid
+
+from PIL import Image
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+from reportlab.pdfgen import canvas
+
+from app.LE_pdf_utils import iter_label_pdf, label_shards, render_labels_sharded, render_template_to_buffer
+from app.models import LabelElement, LabelStock, LabelTemplate
+from app.services.pdf_stream import _shared_digest, concat_pdf_stream
+from app.services.render_executor import RenderExecutor
+
+
+def _document(*page_texts):
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for text in page_texts:
+        c.drawString(72, 720, text)
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def _png():
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), "green").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _job(num_rows):
+    stock = LabelStock(id=uuid.uuid4(), name="2x5", page_width=8.5, page_height=11, top_margin=0.5, left_margin=0.25,
+                       row_spacing=0, col_spacing=0.25, rows_per_page=5, cols_per_page=2, corner_radius=0)
+    template = LabelTemplate(id=uuid.uuid4(), stock_id=stock.id, name="Case", category="test", is_public=False, elements=[
+        LabelElement(id="logo", type="image", x=0.1, y=0.1, width=1.5, height=0.75, text_content="Show Logo"),
+        LabelElement(id="name", type="text", x=1.8, y=0.1, width=2, height=0.5, text_content="{name}"),
+    ])
+    return template, stock, [{"name": f"Case {i:03d}"} for i in range(num_rows)]
+
+
+def test_concatenated_documents_keep_page_order():
+    documents = [_document("one", "two"), _document("three"), _document("four", "five")]
+    reader = PdfReader(io.BytesIO(b"".join(concat_pdf_stream(documents))), strict=True)
+    assert [page.extract_text().strip() for page in reader.pages] == ["one", "two", "three", "four", "five"]
+
+
+def test_streamed_labels_match_single_buffer_render():
+    template, stock, rows = _job(95)
+    images = {"__SHOW_LOGO__": _png()}
+    streamed = b"".join(iter_label_pdf(template, stock, rows, images=images, sheets_per_shard=3))
+    single = render_template_to_buffer(template, stock, rows, images=images).getvalue()
+
+    streamed_pages = PdfReader(io.BytesIO(streamed)).pages
+    single_pages = PdfReader(io.BytesIO(single)).pages
+    assert len(streamed_pages) == len(single_pages) == 10
+    assert [p.extract_text() for p in streamed_pages] == [p.extract_text() for p in single_pages]
+    # The logo is shared by every chunk, so it is written to the stream only once.
+    assert streamed.count(b"/Subtype /Image") == 1
+
+
+def test_shards_are_page_aligned():
+    _, stock, rows = _job(95)
+    shards = label_shards(stock, rows, sheets_per_shard=4)
+    assert [len(shard) for shard in shards] == [40, 40, 15]
+    assert [row for shard in shards for row in shard] == rows
+
+
+def test_parallel_shards_match_single_buffer_render():
+    template, stock, rows = _job(65)
+    executor = RenderExecutor(workers=2, max_queue=4, timeout=60)
+    try:
+        sharded = render_labels_sharded(template, stock, rows, sheets_per_shard=2, executor=executor)
+    finally:
+        executor.shutdown()
+    single = render_template_to_buffer(template, stock, rows).getvalue()
+    assert [p.extract_text() for p in PdfReader(io.BytesIO(sharded)).pages] == \
+           [p.extract_text() for p in PdfReader(io.BytesIO(single)).pages]
+
+
+def test_sharded_render_reports_page_progress():
+    template, stock, rows = _job(95)
+    reports = []
+    render_labels_sharded(template, stock, rows, sheets_per_shard=4, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(4, 10), (8, 10), (10, 10)]
+
+
+def test_streams_with_nested_references_are_not_shared():
+    form = StreamObject()
+    form._data = b"BT /F1 12 Tf (x) Tj ET"
+    form[NameObject("/Type")] = NameObject("/XObject")
+    form[NameObject("/Subtype")] = NameObject("/Form")
+    assert _shared_digest(form) is not None
+
+    # Font resources differ per chunk, so a form pointing at them must keep its own copy
+    fonts = DictionaryObject({NameObject("/F1"): IndirectObject(5, 0, None)})
+    form[NameObject("/Resources")] = DictionaryObject({NameObject("/Font"): fonts})
+    assert _shared_digest(form) is None
+
+    form[NameObject("/Resources")] = DictionaryObject({NameObject("/ProcSet"): ArrayObject([IndirectObject(6, 0, None)])})
+    assert _shared_digest(form) is None
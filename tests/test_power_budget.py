@@ -0,0 +1,79 @@
+from app.services import power_budget
+from app.services.power_budget import PowerBudgets, power_summary
+
+
+def _instance(id, rack, template, watts, parent=None):
+    return {"id": id, "rack_id": rack, "template_id": template, "parent_equipment_instance_id": parent,
+            "equipment_templates": {"power_consumption_watts": watts}}
+
+
+def _show(fake_supabase):
+    return fake_supabase({
+        "racks": [{"id": "r1", "rack_name": "B Rack", "show_id": 7}, {"id": "r2", "rack_name": "A Rack", "show_id": 7},
+                  {"id": "r3", "rack_name": "[Unracked]", "show_id": 7}],
+        "rack_equipment_instances": [_instance("i1", "r1", "t1", 300), _instance("i2", "r1", "t2", 150),
+                                     _instance("i3", "r2", "t1", 300), _instance("i4", "r3", "t1", 300)],
+    })
+
+
+def test_summary_matches_power_report_math():
+    summary = power_summary([("r1", "Rack 1", 1050), ("r2", "Rack 2", 0)], voltage=120)
+    assert summary["total_watts"] == 1050
+    assert summary["total_amps"] == 1050 / 120
+    assert summary["total_va"] == 1500
+    assert summary["suggested_ups"] == 1
+    assert [r["va"] for r in summary["racks"]] == [1500, 0]
+
+
+def test_show_is_loaded_once_and_patched_in_place(fake_supabase):
+    supabase = _show(fake_supabase)
+    budgets = PowerBudgets()
+    summary = budgets.summary(supabase, 7, 120)
+    assert [(r["rack_name"], r["watts"]) for r in summary["racks"]] == [("A Rack", 300), ("B Rack", 450)]
+    assert summary["total_watts"] == 750
+
+    budgets.equipment_added("r2", "i5", "t3", 200)
+    budgets.equipment_added("r2", "m1", "t4", 25, parent_id="i5")
+    assert budgets.summary(supabase, 7, 120)["total_watts"] == 975
+
+    # Removing a chassis also drops the modules the database cascades with it
+    budgets.equipment_removed("i5")
+    assert budgets.summary(supabase, 7, 120)["total_watts"] == 750
+
+    budgets.template_updated("t1", 400)
+    assert budgets.summary(supabase, 7, 120, rack_ids=["r1"])["total_watts"] == 550
+    assert supabase.tables_read == ["racks", "rack_equipment_instances", "rack_equipment_instances"]
+
+
+def test_invalidated_show_is_reloaded(fake_supabase):
+    supabase = _show(fake_supabase)
+    budgets = PowerBudgets()
+    budgets.summary(supabase, 7, 120)
+    budgets.invalidate(rack_id="r1")
+    budgets.summary(supabase, 7, 120)
+    assert supabase.tables_read == ["racks", "rack_equipment_instances", "rack_equipment_instances"] * 2
+
+
+def test_instances_past_the_server_row_cap_are_counted(monkeypatch, fake_supabase):
+    monkeypatch.setattr(power_budget, "POWER_BUDGET_PAGE_SIZE", 50)
+    instances = [_instance(f"i{i:03d}", "r1", "t1", 10) for i in range(120)]
+    supabase = fake_supabase({"racks": [{"id": "r1", "rack_name": "Rack", "show_id": 7}],
+                              "rack_equipment_instances": instances}, max_rows=30)
+    assert PowerBudgets().summary(supabase, 7, 120)["total_watts"] == 1200
+    # Capped pages of 30 rows, then the empty page that ends the read
+    assert supabase.tables_read.count("rack_equipment_instances") == 5
+
+
+def test_unknown_racks_reload_the_budget_once(fake_supabase):
+    supabase = _show(fake_supabase)
+    budgets = PowerBudgets()
+    budgets.summary(supabase, 7, 120)
+
+    # A rack created through another worker
+    supabase.tables["racks"].append({"id": "r4", "rack_name": "C Rack", "show_id": 7})
+    summary = budgets.summary(supabase, 7, 120, rack_ids=["r4", "r1"])
+    assert [(r["rack_name"], r["watts"]) for r in summary["racks"]] == [("C Rack", 0), ("B Rack", 450)]
+
+    supabase.queries.clear()
+    assert budgets.summary(supabase, 7, 120, rack_ids=["r1", "gone"]) is None
+    assert supabase.tables_read == ["racks", "rack_equipment_instances", "rack_equipment_instances"]
@@ -0,0 +1,46 @@
+from app.services.render_cache import RenderCache, content_hash
+from app.schemas.wire_export import Graph, Node, PortDef
+
+
+def _graph(name="ATEM"):
+    return Graph(
+        nodes=[Node(id="n1", deviceNomenclature=name, modelNumber="M1", rackName="R1", deviceRu=1,
+                    ports={"out-1": PortDef(name="PGM")})],
+        edges=[]
+    )
+
+
+def test_content_hash_is_stable_and_content_sensitive():
+    assert content_hash(_graph(), "Letter") == content_hash(_graph(), "Letter")
+    assert content_hash(_graph(), "Letter") != content_hash(_graph(), "A4")
+    assert content_hash(_graph(), "Letter") != content_hash(_graph("Hyperdeck"), "Letter")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = RenderCache(max_bytes=10, spill_dir=None)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+
+
+def test_evicted_entries_are_served_from_spill_dir(tmp_path):
+    cache = RenderCache(max_bytes=4, spill_dir=str(tmp_path))
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+
+    assert (tmp_path / "a.bin").exists()
+    assert cache.get("a") == b"aaaa"
+
+
+def test_spill_dir_is_bounded(tmp_path):
+    cache = RenderCache(max_bytes=4, spill_dir=str(tmp_path), max_disk_bytes=8)
+    for key in ("a", "b", "c", "d"):
+        cache.put(key, key.encode() * 4)
+
+    spilled = sorted(p.name for p in tmp_path.iterdir())
+    assert sum((tmp_path / name).stat().st_size for name in spilled) <= 8
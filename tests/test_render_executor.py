@@ -0,0 +1,55 @@
+import io
+import time
+import asyncio
+
+import pytest
+
+from app.services.render_executor import RenderExecutor, RenderQueueFull
+
+
+def _fake_pdf(text, pause=0.0):
+    time.sleep(pause)
+    return io.BytesIO(f"%PDF {text}".encode())
+
+
+def test_run_returns_bytes_and_records_metrics():
+    executor = RenderExecutor(workers=1, max_queue=2, timeout=30)
+    try:
+        assert asyncio.run(executor.run(_fake_pdf, "racks")) == b"%PDF racks"
+        metrics = executor.metrics()
+        assert metrics["completed"] == 1
+        assert metrics["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_queue_bound_rejects_excess_jobs():
+    executor = RenderExecutor(workers=1, max_queue=0)
+    with pytest.raises(RenderQueueFull):
+        executor.submit(_fake_pdf, "labels")
+    assert executor.metrics()["rejected"] == 1
+
+
+def test_timeout_is_reported():
+    executor = RenderExecutor(workers=1, max_queue=2)
+    try:
+        with pytest.raises(TimeoutError):
+            executor.run_sync(_fake_pdf, "slow", pause=2, timeout=0.1)
+        assert executor.metrics()["timed_out"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_inline_mode_without_workers():
+    executor = RenderExecutor(workers=0)
+    assert executor.run_sync(_fake_pdf, "inline") == b"%PDF inline"
+
+
+def test_map_ordered_yields_in_call_order():
+    executor = RenderExecutor(workers=2, max_queue=2, timeout=30)
+    try:
+        # Earlier shards finish last; results must still come back in call order.
+        calls = [((f"shard{i}",), {"pause": 0.3 - i * 0.1}) for i in range(3)]
+        assert list(executor.map_ordered(_fake_pdf, calls)) == [b"%PDF shard0", b"%PDF shard1", b"%PDF shard2"]
+    finally:
+        executor.shutdown()
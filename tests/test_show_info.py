@@ -0,0 +1,55 @@
+from app.services.show_info import ShowInfoCache
+
+
+def _client(fake_supabase, *shows):
+    """A user's client: it only sees the shows listed for it, like row-level security."""
+    return fake_supabase({"shows": list(shows)})
+
+
+_SHOW = {"id": 7, "name": "Festival", "data": {"info": {"ot_daily_threshold": 12, "logo_path": "u/logo.png"}}}
+
+
+def test_show_info_is_read_once_per_user(fake_supabase):
+    owner = _client(fake_supabase, _SHOW)
+    cache = ShowInfoCache()
+    show = cache.get(owner, 7, "owner")
+    assert (show.name, show.logo_path) == ("Festival", "u/logo.png")
+    assert show.ot_rules == {"daily_threshold": 12, "weekly_threshold": 40, "start_day": 0}
+    assert cache.get(owner, 7, "owner") is show
+    assert owner.tables_read == ["shows"]
+
+
+def test_cached_show_is_not_served_to_users_who_cannot_read_it(fake_supabase):
+    cache = ShowInfoCache()
+    cache.get(_client(fake_supabase, _SHOW), 7, "owner")
+    outsider = _client(fake_supabase)
+    assert cache.get(outsider, 7, "outsider") is None
+    assert outsider.tables_read == ["shows"]
+
+    collaborator = _client(fake_supabase, _SHOW)
+    cache.get(collaborator, 7, "collaborator")
+    cache.get(collaborator, 7, "collaborator")
+    assert collaborator.tables_read == ["shows"]
+
+
+def test_invalidated_show_is_reloaded(fake_supabase):
+    owner = _client(fake_supabase, _SHOW)
+    cache = ShowInfoCache()
+    cache.get(owner, 7, "owner")
+    cache.invalidate(7)
+    cache.get(owner, 7, "owner")
+    assert owner.tables_read == ["shows", "shows"]
+
+
+def test_readers_re_prove_access_after_the_entry_expires(fake_supabase):
+    cache = ShowInfoCache(ttl_seconds=60)
+    cache.get(_client(fake_supabase, _SHOW), 7, "owner")
+    cache.get(_client(fake_supabase, _SHOW), 7, "collaborator")
+
+    # The collaborator is removed through another worker; once the entry expires they are checked again
+    cache._entries[7].loaded_at -= 61
+    owner = _client(fake_supabase, _SHOW)
+    cache.get(owner, 7, "owner")
+    removed = _client(fake_supabase)
+    assert cache.get(removed, 7, "collaborator") is None
+    assert removed.tables_read == ["shows"]
@@ -0,0 +1,47 @@
+from app.utils import timesheet_utils
+from app.utils.timesheet_utils import diff_timesheet_cells, fetch_saved_cells, save_timesheet_diff, timesheet_version
+
+
+def _row(id, crew, day, hours):
+    return {"id": id, "show_crew_id": crew, "date": day, "hours": hours}
+
+
+def test_only_changed_cells_are_written_and_cleared_cells_deleted():
+    saved = [_row("e1", "c1", "2026-01-05", 10), _row("e2", "c1", "2026-01-06", 8.5), _row("e3", "c2", "2026-01-05", 12)]
+    submitted = {
+        ("c1", "2026-01-05"): 10.0,   # unchanged
+        ("c1", "2026-01-06"): 9.0,    # edited
+        ("c2", "2026-01-05"): 0,      # cleared
+        ("c2", "2026-01-06"): 4.0,    # new
+        ("c2", "2026-01-07"): 0,      # empty and never saved
+    }
+    upserts, delete_ids = diff_timesheet_cells(saved, submitted)
+    assert upserts == [
+        {"show_crew_id": "c1", "date": "2026-01-06", "hours": 9.0},
+        {"show_crew_id": "c2", "date": "2026-01-06", "hours": 4.0},
+    ]
+    assert delete_ids == ["e3"]
+
+
+def test_version_ignores_row_order_and_number_formatting():
+    rows = [_row("e1", "c1", "2026-01-05", 10), _row("e2", "c2", "2026-01-05", 8.5)]
+    same = [_row("x", "c2", "2026-01-05", "8.50"), _row("y", "c1", "2026-01-05", 10.0)]
+    assert timesheet_version(rows) == timesheet_version(same)
+    assert timesheet_version(rows) != timesheet_version(rows[:1])
+
+
+def test_large_saves_are_chunked(monkeypatch, fake_supabase):
+    monkeypatch.setattr(timesheet_utils, "TIMESHEET_SAVE_CHUNK_SIZE", 100)
+    monkeypatch.setattr(timesheet_utils, "TIMESHEET_DELETE_CHUNK_SIZE", 40)
+    supabase = fake_supabase({"timesheet_entries": [_row(f"e{i}", f"c{i}", "2026-01-05", 8) for i in range(60)]})
+
+    # 60 crew over 7 days: 14 crew (98 rows) per read
+    saved = fetch_saved_cells(supabase, [f"c{i}" for i in range(60)], "2026-01-05", "2026-01-11", 7)
+    assert len(saved) == 60
+    assert [(q.op, len(q.filters[0][2])) for q in supabase.queries] == [("select", 14)] * 4 + [("select", 4)]
+
+    supabase.queries.clear()
+    upserts = [{"show_crew_id": f"c{i}", "date": "2026-01-06", "hours": 8} for i in range(250)]
+    save_timesheet_diff(supabase, upserts, [f"e{i}" for i in range(50)])
+    written = [(q.op, len(q.payload) if q.op == "upsert" else len(q.filters[0][2])) for q in supabase.queries]
+    assert written == [("upsert", 100), ("upsert", 100), ("upsert", 50), ("delete", 40), ("delete", 10)]
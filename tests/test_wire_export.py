@@ -82,3 +82,51 @@ def test_build_pdf_with_empty_graph():
     empty_graph = Graph(nodes=[], edges=[])
     pdf_bytes = build_pdf_bytes(empty_graph)
     assert pdf_bytes == b""
+
+
+def test_build_pdf_multi_page_single_surface():
+    """
+    Tests that a graph spanning several pages is rendered onto one document
+    with one PDF page per laid-out SVG page.
+    """
+    import io
+    from pypdf import PdfReader
+    from app.services.wire_export_svg import _build_page_svgs
+
+    sample_graph = Graph(
+        nodes=[
+            Node(
+                id=f"n{i}",
+                deviceNomenclature=f"CAM{i}-{i}",
+                modelNumber="CAM",
+                rackName="R1",
+                deviceRu=i + 1,
+                ports={f"p{p}-out": PortDef(name=f"Out {p}") for p in range(12)}
+            )
+            for i in range(12)
+        ],
+        edges=[]
+    )
+    page_count = len(_build_page_svgs(sample_graph))
+    assert page_count > 1
+
+    pdf_bytes = build_pdf_bytes(sample_graph)
+    assert len(PdfReader(io.BytesIO(pdf_bytes)).pages) == page_count
+
+
+def test_truncate_to_px_uses_font_metrics():
+    """
+    Tests that truncation keeps the longest prefix that fits alongside the
+    ellipsis and leaves short labels untouched.
+    """
+    from app.services.wire_export_svg import _truncate_to_px, _measure_text_width
+
+    label = "Switcher 1:SDI Input 12"
+    full_width = _measure_text_width(label, 5, "bold")
+    assert _truncate_to_px(label, 5, full_width) == label
+
+    shown = _truncate_to_px(label, 5, full_width / 2)
+    assert shown.endswith("…")
+    assert label.startswith(shown[:-1])
+    assert _measure_text_width(shown, 5, "bold") <= full_width / 2
+    assert _measure_text_width(label[:len(shown)] + "…", 5, "bold") > full_width / 2